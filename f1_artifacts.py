@@ -0,0 +1,125 @@
+import hashlib
+import json
+import math
+import os
+import sys
+import tempfile
+
+# =============================================================================
+# Artefakt-Writer für alles, was committet bzw. über Pages ausgeliefert wird
+# (Chart-JSONs, Widgets). Deterministische Serialisierung, Vergleich per
+# Content-Hash mit der bestehenden Datei, Schreiben nur bei Änderung (atomar
+# über temp + rename). Unveränderte Dateien werden nicht angefasst – auch
+# mtime bleibt gleich.
+#
+# Workflows: ARTIFACT_LOG=<pfad> sammelt geänderte Dateien über mehrere
+# Skripte hinweg, danach
+#   python f1_artifacts.py summary    # changed=true|false → GITHUB_OUTPUT
+# und Commit/Push/Deploy nur bei changed == 'true'.
+# =============================================================================
+
+ARTIFACT_LOG = os.getenv("ARTIFACT_LOG")
+
+
+def dump_json(data):
+    """Stabile Key-Reihenfolge, kompakte Separatoren → gleiche Daten, gleiche Bytes."""
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def json_number(value, digits=3):
+    """Gerundete Zahl für Chart-JSONs – NaN/None → null statt ungültigem JSON."""
+    if value is None:
+        return None
+    value = float(value)
+    return None if math.isnan(value) else round(value, digits)
+
+
+def content_hash(raw):
+    return hashlib.sha256(raw).hexdigest()
+
+
+def file_hash(path):
+    try:
+        with open(path, "rb") as f:
+            return content_hash(f.read())
+    except OSError:
+        return None
+
+
+def _log_change(path):
+    if ARTIFACT_LOG:
+        with open(ARTIFACT_LOG, "a", encoding="utf-8") as f:
+            f.write(os.path.relpath(path) + "\n")
+
+
+def write_artifact(path, raw):
+    """
+    Schreibt bytes nach path, wenn sich der Inhalt geändert hat.
+    Rückgabe: True = geändert/neu, False = unverändert.
+    """
+    if content_hash(raw) == file_hash(path):
+        return False
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+        # mkstemp legt 0600 an – Rechte der bestehenden Datei übernehmen, sonst 0644
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    _log_change(path)
+    return True
+
+
+def write_text_artifact(path, text):
+    return write_artifact(path, text.encode("utf-8"))
+
+
+def write_json_artifact(path, data):
+    return write_artifact(path, dump_json(data).encode("utf-8"))
+
+
+def status_label(changed):
+    return "geschrieben" if changed else "unverändert"
+
+
+# ─────────────────────────────────────────────
+# CLI für Workflows
+# ─────────────────────────────────────────────
+
+def read_log(path=ARTIFACT_LOG):
+    if not path or not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return list(dict.fromkeys(line.strip() for line in f if line.strip()))
+
+
+def main(argv):
+    if argv[:1] != ["summary"]:
+        print("Verwendung: ARTIFACT_LOG=<pfad> python f1_artifacts.py summary")
+        return False
+
+    changed = read_log()
+    if changed:
+        print(f"📝 {len(changed)} Artefakte geändert:")
+        for path in changed:
+            print(f"   {path}")
+    else:
+        print("💤 Keine Artefakte geändert – Commit und Deploy entfallen")
+
+    output = os.getenv("GITHUB_OUTPUT")
+    if output:
+        with open(output, "a", encoding="utf-8") as f:
+            f.write(f"changed={str(bool(changed)).lower()}\n")
+            f.write(f"files={' '.join(changed)}\n")
+    return True
+
+
+if __name__ == "__main__":
+    if not main(sys.argv[1:]):
+        exit(1)
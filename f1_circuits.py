@@ -0,0 +1,99 @@
+import f1_log as log
+from f1_jolpica import get_schedule
+from f1_seasons import load_season
+
+# =============================================================================
+# Circuit-Index: ordnet jede Jolpica-Runde (round / circuitId) einmalig der
+# passenden Spalte in RACE_LOCATIONS zu – statt pro Rennen alle Locations per
+# Substring-Vergleich durchzugehen. Grundlage ist der Jolpica-Kalender der
+# Saison, gematcht über das Renndatum (Fallback: Rennname).
+#
+#   python f1_circuits.py      # Validierungsreport für die aktuelle Saison
+# =============================================================================
+
+# Pro Prozess einmal aufbauen (Tabellen/Charts fragen mehrfach)
+_index_cache = {}
+
+
+def build_circuit_index(season, schedule):
+    """
+    season:   load_season()-Dict (Kalender = Spalten)
+    schedule: Jolpica "Races" des Kalenders, None → Rundennummer = Spalte + 1
+
+    Rückgabe:
+      by_round        {round: Spalte}
+      by_circuit      {circuitId: Spalte}
+      round_of        [round je Spalte, None wenn nicht zugeordnet]
+      unmapped_rounds Jolpica-Runden ohne Spalte (z.B. neues/umbenanntes Rennen)
+      source          "jolpica" oder "calendar"
+    """
+    calendar = season["calendar"]
+    by_date  = {e["date"]: col for col, e in enumerate(calendar)}
+    by_name  = {e["name"]: col for col, e in enumerate(calendar)}
+
+    index = {
+        "by_round":        {},
+        "by_circuit":      {},
+        "round_of":        [None] * len(calendar),
+        "unmapped_rounds": [],
+        "source":          "jolpica" if schedule else "calendar",
+    }
+
+    if not schedule:
+        # Kein Kalender verfügbar → Jolpica nummeriert die stattfindenden Rennen fortlaufend
+        for col in range(len(calendar)):
+            index["by_round"][col + 1] = col
+            index["round_of"][col] = col + 1
+        return index
+
+    for race in schedule:
+        round_num = int(race["round"])
+        col = by_date.get(race.get("date"), by_name.get(race.get("raceName")))
+        if col is None:
+            index["unmapped_rounds"].append({
+                "round":     round_num,
+                "raceName":  race.get("raceName"),
+                "circuitId": race.get("Circuit", {}).get("circuitId"),
+                "date":      race.get("date"),
+            })
+            continue
+        index["by_round"][round_num] = col
+        index["round_of"][col] = round_num
+        circuit_id = race.get("Circuit", {}).get("circuitId")
+        if circuit_id:
+            index["by_circuit"][circuit_id] = col
+    return index
+
+
+def circuit_index(season=None, offline=False):
+    season = season or load_season()
+    year   = season["year"]
+    if year not in _index_cache:
+        schedule = get_schedule(year, final=bool(season.get("finalized")), offline=offline)
+        _index_cache[year] = build_circuit_index(season, schedule)
+    return _index_cache[year]
+
+
+def report(season, index):
+    """Gibt nicht zugeordnete Runden und Spalten aus. True, wenn alles zugeordnet ist."""
+    labels  = season["race_locations"]
+    missing = [labels[col] for col, rnd in enumerate(index["round_of"]) if rnd is None]
+
+    log.info(f"🗺️  Circuit-Index {season['year']} ({index['source']}): "
+             f"{len(index['by_round'])} Runden → {len(labels)} Spalten")
+    for r in index["unmapped_rounds"]:
+        log.warning(f"   ⚠️ Runde {r['round']:2d} ohne Spalte: {r['raceName']} "
+                    f"({r['circuitId']}, {r['date']}) – Kalender in seasons/{season['year']}.json prüfen")
+    for label in missing:
+        log.warning(f"   ⚠️ Spalte '{label}' ohne Jolpica-Runde")
+    return not index["unmapped_rounds"] and not missing
+
+
+def main():
+    season = load_season()
+    return report(season, circuit_index(season))
+
+
+if __name__ == "__main__":
+    if not main():
+        exit(1)
@@ -0,0 +1,76 @@
+import json
+import os
+import subprocess
+import sys
+
+# =============================================================================
+# Kaltstart-Check für die kurzen geplanten Läufe: importiert jedes Skript in
+# einem frischen Interpreter, misst die Importzeit und prüft, dass schwere
+# Pakete erst bei Bedarf geladen werden (siehe f1_schedule.load_fastf1(),
+# f1_drivers_table.sync_table()). Schlägt fehl, sobald eines davon wieder
+# beim Import mitkommt.
+#
+#   python f1_coldstart.py               # Report, Exit 1 bei Regression
+#   python f1_coldstart.py --runs 5      # Median über 5 Läufe
+# =============================================================================
+
+# Skript → Pakete, die beim Import NICHT geladen sein dürfen
+LAZY_IMPORTS = {
+    "f1_session_results": ("fastf1", "pandas", "numpy", "pyarrow"),
+    "f1_schedule":        ("fastf1", "pandas"),
+    "f1_drivers_table":   ("notion_client", "httpx"),
+}
+
+# Modul-Importe brechen ohne Token ab – für den Check reicht ein Platzhalter
+CHECK_ENV = {"NOTION_TOKEN": "coldstart-check"}
+
+PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+ms = (time.perf_counter() - t) * 1000
+print(json.dumps({{"ms": ms, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def probe(module, heavy):
+    """Importiert module in einem frischen Prozess → {"ms", "loaded"}."""
+    env = {**os.environ, **CHECK_ENV}
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=heavy)],
+        capture_output=True, text=True, env=env, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def measure(module, heavy, runs):
+    results = [probe(module, heavy) for _ in range(runs)]
+    times = sorted(r["ms"] for r in results)
+    return times[len(times) // 2], results[-1]["loaded"]
+
+
+def main(argv):
+    runs = int(argv[argv.index("--runs") + 1]) if "--runs" in argv else 3
+    print(f"⏱️  Kaltstart-Check ({runs} Läufe je Skript, Median)")
+
+    ok = True
+    for module, heavy in LAZY_IMPORTS.items():
+        try:
+            ms, loaded = measure(module, heavy, runs)
+        except subprocess.CalledProcessError as e:
+            print(f"   ❌ {module}: Import fehlgeschlagen\n{e.stderr}")
+            ok = False
+            continue
+        if loaded:
+            print(f"   ❌ {module}: {ms:6.0f} ms – lädt beim Import {', '.join(loaded)}")
+            ok = False
+        else:
+            print(f"   ✔ {module}: {ms:6.0f} ms")
+
+    print("✅ Keine schweren Importe beim Start" if ok else "❌ Kaltstart-Regression")
+    return ok
+
+
+if __name__ == "__main__":
+    if not main(sys.argv[1:]):
+        exit(1)
@@ -1,148 +1,105 @@
-import requests
-import json
-
-# Rennkalender 2026 – Reihenfolge = Rundennummern 1–24
-RACE_LOCATIONS = [
-    "Australia", "China", "Japan",
-    # "Bahrain", "Saudi Arabia",  # 2026: abgesagt – regionaler Konflikt; für 2027 wieder einkommentieren
-    "Miami",
-    "Canada", "Monaco", "Barcelona", "Austria", "Great Britain", "Belgium",
-    "Hungary", "Netherlands", "Italy", "Spain", "Azerbaijan", "Singapore",
-    "United States", "Mexico", "Brazil", "Las Vegas", "Qatar", "Abu Dhabi"
-]
-
-BASE_URL = "http://api.jolpi.ca/ergast/f1/current/"
-
-# Mapping: API-Name → Anzeigename
-# Deckt alle bekannten Varianten ab (inkl. "Cadillac F1 Team" → "Cadillac")
-API_TO_DISPLAY_NAME = {
-    "Alpine F1 Team":  "Alpine",
-    "RB F1 Team":      "Racing Bulls",
-    "Haas F1 Team":    "Haas",
-    "Cadillac F1 Team": "Cadillac",
-}
-
-# Teamfarben – Saison 2026
-TEAM_COLORS = {
-    "Red Bull":      "#3570c5",
-    "Mercedes":      "#42f4d7",
-    "Ferrari":       "#e8002d",
-    "McLaren":       "#ff8102",
-    "Aston Martin":  "#20956e",
-    "Williams":      "#1868db",
-    "Alpine":        "#00a1e8",
-    "Racing Bulls":  "#6692ff",
-    "Haas":          "#dee1e2",
-    "Audi":          "#ff2d00",
-    "Cadillac":      "#aaaaad",
-}
-
-ALL_TEAMS = list(TEAM_COLORS.keys())
-
-
-def get_sprint_points(round_num):
-    """Gibt dict {Anzeigename: Sprint-Punkte} für eine Runde zurück."""
-    url = f"{BASE_URL}{round_num}/sprint.json"
-    points = {}
-    try:
-        r = requests.get(url, timeout=10)
-        if r.status_code == 200:
-            races = r.json()["MRData"]["RaceTable"]["Races"]
-            if races:
-                for res in races[0]["SprintResults"]:
-                    api_name     = res["Constructor"]["name"]
-                    display_name = API_TO_DISPLAY_NAME.get(api_name, api_name)
-                    points[display_name] = points.get(display_name, 0) + int(float(res["points"]))
-    except Exception:
-        pass
-    return points
-
-
-def build_cumulative_standings():
+import sys
+
+import numpy as np
+
+import f1_log as log
+from f1_artifacts import write_json_artifact, status_label
+from f1_seasons import load_season, output_path
+from f1_entities import load_entities
+from f1_standings import (load_results_frame, points_matrix, completed_columns,
+                          countback_matrix, rank_progression)
+
+# Saison aus der Registry (seasons/<jahr>.json, Auswahl über F1_SEASON)
+# Spalten = RACE_LOCATIONS, Datenquelle über STANDINGS_SOURCE (siehe f1_standings.py)
+SEASON         = load_season()
+RACE_LOCATIONS = SEASON["race_locations"]
+
+# Teams mit Farben aus seasons/<jahr>.json (Entity-Registry, Index = Zeile der Matrix)
+ENTITIES = load_entities(SEASON)
+
+
+def build_cumulative_standings(frame):
     """
-    Baut kumulative Konstrukteurs-Standings auf.
-    Alle bekannten Teams starten als Seed mit 0 – die JSON enthält immer alle Teams.
-    Noch nicht gefahrene Runden werden mit dem letzten Stand fortgeschrieben.
+    Kumulative Konstrukteurs-Standings aus den Race/Sprint-Ergebnissen.
+    Alle Teams der Registry starten mit 0 – die JSON enthält immer alle Teams.
+    Rückgabe: (entities, cumulative [idx, Runde], total [idx])
     """
-    running_total = {team: 0 for team in TEAM_COLORS}
-    cumulative    = {team: [] for team in TEAM_COLORS}
-
-    for round_idx, _ in enumerate(RACE_LOCATIONS):
-        # Die API führt die verbleibenden Rennen nach den Absagen nahtlos fort.
-        # Daher entspricht die API-Rundennummer exakt dem Schleifenindex + 1.
-        round_num = round_idx + 1
-        round_pts  = {}
-
-        try:
-            r = requests.get(f"{BASE_URL}{round_num}/results.json", timeout=10)
-            if r.status_code == 200:
-                races = r.json()["MRData"]["RaceTable"]["Races"]
-                if races:
-                    sprint_pts = get_sprint_points(round_num)
-                    for res in races[0]["Results"]:
-                        api_name     = res["Constructor"]["name"]
-                        display_name = API_TO_DISPLAY_NAME.get(api_name, api_name)
-                        round_pts[display_name] = round_pts.get(display_name, 0) + int(float(res["points"]))
-
-                    for team, pts in sprint_pts.items():
-                        round_pts[team] = round_pts.get(team, 0) + pts
-
-                    # Unbekannte Teams dynamisch ergänzen
-                    for team in round_pts:
-                        if team not in running_total:
-                            running_total[team] = 0
-                            cumulative[team]    = [0] * round_idx
-                else:
-                    # Sprint hat stattgefunden, Rennen noch nicht → nur Sprint-Punkte eintragen
-                    sprint_pts = get_sprint_points(round_num)
-                    for team, pts in sprint_pts.items():
-                        round_pts[team] = round_pts.get(team, 0) + pts
-                        if team not in running_total:
-                            running_total[team] = 0
-                            cumulative[team]    = [0] * round_idx
-        except Exception:
-            pass
-
-        for team in running_total:
-            running_total[team] += round_pts.get(team, 0)
-            cumulative[team].append(running_total[team])
-
-    return cumulative, running_total
-
-
-def write_json(cumulative, total):
-    sorted_teams = sorted(total.keys(), key=lambda t: total[t], reverse=True)
+    matrix, _ = points_matrix(frame, ENTITIES, "constructor", len(RACE_LOCATIONS))
+    cumulative = np.cumsum(matrix, axis=1)
+    total      = cumulative[:, -1] if cumulative.shape[1] else np.zeros(len(matrix), dtype=np.int32)
+    return ENTITIES["constructors"], cumulative, total
+
+
+def build_rank_progression(frame, cumulative):
+    """
+    WM-Position nach jeder Runde (Countback: Siege, 2. Plätze, ...) aus derselben
+    Ergebnis-Tabelle – keine zusätzlichen API-Abfragen.
+    Rückgabe: (ranks [idx, Runde], played [bool je Runde])
+    """
+    countback = countback_matrix(frame, ENTITIES, "constructor", len(RACE_LOCATIONS))
+    return rank_progression(cumulative, countback), completed_columns(frame, len(RACE_LOCATIONS))
+
+
+def write_positions_json(entities, ranks, played):
+    # Reihenfolge = aktuelle WM-Position, noch nicht gefahrene Runden → null
+    last  = max((col for col, p in enumerate(played) if p), default=None)
+    order = np.argsort(ranks[:, last], kind="stable") if last is not None else range(len(entities))
+
+    chart = {
+        "labels": RACE_LOCATIONS,
+        "series": [
+            {
+                "title": entities[i]["name"],
+                "data":  [int(r) if p else None for r, p in zip(ranks[i], played)],
+                "color": entities[i]["color"]
+            }
+            for i in order
+        ],
+        "backgroundColor": "#191919"
+    }
+
+    changed = write_json_artifact(output_path(SEASON, "f1_constructors_positions.json"), chart)
+    log.info(f"✅ f1_constructors_positions.json {status_label(changed)} – {len(entities)} Teams, {sum(played)} gefahrene Runden")
+
+
+def write_json(entities, cumulative, total):
+    # Nach Gesamtpunkten absteigend, bei Gleichstand Registry-Reihenfolge
+    order = np.argsort(-total, kind="stable")
 
     chart = {
         "labels": RACE_LOCATIONS,
         "series": [
             {
-                "title": team,
-                "data":  cumulative[team],
-                "color": TEAM_COLORS.get(team, "#888888")
+                "title": entities[i]["name"],
+                "data":  cumulative[i].tolist(),
+                "color": entities[i]["color"]
             }
-            for team in sorted_teams
+            for i in order
         ],
         "backgroundColor": "#191919"
     }
 
-    with open("f1_constructors_chart.json", "w", encoding="utf-8") as f:
-        json.dump(chart, f, ensure_ascii=False, indent=2)
+    changed = write_json_artifact(output_path(SEASON, "f1_constructors_chart.json"), chart)
+    log.info(f"✅ f1_constructors_chart.json {status_label(changed)} – {len(order)} Teams, {len(RACE_LOCATIONS)} Runden")
 
-    print(f"✅ f1_constructors_chart.json geschrieben – {len(sorted_teams)} Teams, {len(RACE_LOCATIONS)} Runden")
-    print("\nStandings:")
-    print("-" * 45)
-    for i, team in enumerate(sorted_teams, 1):
-        pts     = total[team]
-        preview = [str(x) for x in cumulative[team] if x > 0][-3:]
+    # Konsolenausgabe zur Kontrolle (--verbose)
+    log.debug("\nStandings:")
+    log.debug("-" * 45)
+    for pos, i in enumerate(order, 1):
+        # Zeige die letzten 3 nicht-null-Einträge als Vorschau
+        preview = [str(x) for x in cumulative[i] if x > 0][-3:]
         preview_str = f"[...{', '.join(preview)}]" if preview else "[0, 0, ...]"
-        print(f"{i:2d}. {team:<25} {pts:4d} Pts  {preview_str}")
+        log.debug(f"{pos:2d}. {entities[i]['name']:<25} {int(total[i]):4d} Pts  {preview_str}")
 
 
 def main():
-    print("🔄 Lade F1 2026 Konstrukteurspunkte (kumulativ)...")
-    cumulative, total = build_cumulative_standings()
-    write_json(cumulative, total)
+    log.setup(sys.argv[1:])
+    log.info(f"🔄 Lade F1 {SEASON['year']} Konstrukteurspunkte (kumulativ)...")
+    # --offline: nur aus dem lokalen Season Store, ohne Jolpica-Abfragen
+    frame = load_results_frame(SEASON, ENTITIES, offline="--offline" in sys.argv[1:])
+    entities, cumulative, total = build_cumulative_standings(frame)
+    write_json(entities, cumulative, total)
+    write_positions_json(entities, *build_rank_progression(frame, cumulative))
 
 
 if __name__ == "__main__":
@@ -1,16 +1,28 @@
 import requests
 import datetime
 import os
+import sys
 
-# F1 Constructors Championship Notion Updater für GitHub Actions – Saison 2026
+import f1_log as log
+from f1_notion_query import iter_records, is_not_empty, TITLE
+from f1_seasons import load_season
+from f1_entities import load_entities
+from f1_standings import load_results_frame, points_matrix, completed_columns
+
+# F1 Constructors Championship Notion Updater für GitHub Actions
+# Saison über F1_SEASON (seasons/<jahr>.json), Default: aktuelle Saison
 
 NOTION_TOKEN = os.getenv("NOTION_TOKEN")
 if not NOTION_TOKEN:
-    print("❌ Fehler: NOTION_TOKEN environment variable ist nicht gesetzt!")
+    log.error("❌ Fehler: NOTION_TOKEN environment variable ist nicht gesetzt!")
     exit(1)
 
-NOTION_PARENT_PAGE_ID = "3166839379ed809aa3caf99622a2cb68"
-CONSTRUCTORS_DB_ID    = "3166839379ed81a18ff9c93850213783"
+SEASON = load_season()
+YEAR   = SEASON["year"]
+
+NOTION_PARENT_PAGE_ID = SEASON["notion"]["constructors_parent_page"]
+# Archiv-Saisons ohne feste ID → DB wird per Titel gesucht
+CONSTRUCTORS_DB_ID    = SEASON["notion"].get("constructors_db")
 
 headers = {
     "Authorization": f"Bearer {NOTION_TOKEN}",
@@ -18,125 +30,27 @@ headers = {
     "Notion-Version": "2022-06-28"
 }
 
-RACE_LOCATIONS = [
-    "Australia", "China", "Japan",
-    # "Bahrain", "Saudi Arabia",  # 2026: abgesagt – regionaler Konflikt; für 2027 wieder einkommentieren
-    "Miami",
-    "Canada", "Monaco", "Barcelona", "Austria", "Great Britain", "Belgium",
-    "Hungary", "Netherlands", "Italy", "Spain", "Azerbaijan", "Singapore",
-    "United States", "Mexico", "Brazil", "Las Vegas", "Qatar", "Abu Dhabi"
-]
-
-# Mapping: API-Name → Notion-Anzeigename
-# Jolpica liefert z.B. "Alpine F1 Team", in Notion heißt der Eintrag aber "Alpine".
-API_TO_NOTION_NAME = {
-    "Alpine F1 Team": "Alpine",
-    "RB F1 Team":     "Racing Bulls",
-    "Haas F1 Team":   "Haas",
-}
-
-# Notion-Namen (so wie sie in der DB stehen / stehen sollen)
-TEAMS_NOTION = [
-    "McLaren", "Red Bull", "Mercedes", "Williams", "Aston Martin",
-    "Audi", "Ferrari", "Alpine", "Racing Bulls", "Haas", "Cadillac"
-]
-
-# Reverse-Mapping für API-Abfragen: Notion-Name → API-Name
-NOTION_TO_API_NAME = {v: k for k, v in API_TO_NOTION_NAME.items()}
+RACE_LOCATIONS = SEASON["race_locations"]
 
-BASE_URL = "http://api.jolpi.ca/ergast/f1/current/"
+# Teams (Jolpica-ID → Notion-Name) aus seasons/<jahr>.json
+ENTITIES = load_entities(SEASON)
 
 
-def check_if_race_happened(round_num):
-    url = f"{BASE_URL}{round_num}/results.json"
-    try:
-        r = requests.get(url, timeout=10)
-        if r.status_code == 200:
-            return bool(r.json()['MRData']['RaceTable'].get('Races'))
-    except Exception:
-        pass
-    return False
-
-
-def get_sprint_points(round_num):
-    url = f"{BASE_URL}{round_num}/sprint.json"
-    points = {}
-    try:
-        r = requests.get(url, timeout=10)
-        if r.status_code == 200:
-            races = r.json()['MRData']['RaceTable']['Races']
-            if races:
-                for res in races[0]['SprintResults']:
-                    api_team = res['Constructor']['name']
-                    # Auf Notion-Namen normalisieren
-                    notion_team = API_TO_NOTION_NAME.get(api_team, api_team)
-                    points[notion_team] = points.get(notion_team, 0) + int(float(res['points']))
-    except Exception:
-        pass
-    return points
-
-
-def get_weekend_points():
-    weekend_points = {team: [0] * len(RACE_LOCATIONS) for team in TEAMS_NOTION}
-    race_happened  = [False] * len(RACE_LOCATIONS)
-
-    # Range auf 26 erhöht, um alle echten API-Runden (bis zu 24) sicher abzudecken
-    for round_num in range(1, 26):
-        race_has_results = check_if_race_happened(round_num)
-        sprint_points    = get_sprint_points(round_num)
-
-        # Runde komplett überspringen wenn weder Rennen noch Sprint stattgefunden hat
-        if not race_has_results and not sprint_points:
-            continue
-
-        # Dynamisches Matching der API-Daten zum richtigen Notion-Spalten-Index
-        race_idx = -1
-        url = f"{BASE_URL}{round_num}/results.json" if race_has_results else f"{BASE_URL}{round_num}/sprint.json"
-        
-        try:
-            r = requests.get(url, timeout=10)
-            if r.status_code == 200:
-                races = r.json()['MRData']['RaceTable']['Races']
-                if races:
-                    race_info = races[0]
-                    r_name = race_info['raceName'].lower()
-                    r_country = race_info['Circuit']['Location']['country'].lower()
-                    r_locality = race_info['Circuit']['Location']['locality'].lower()
-                    
-                    # Suche den passenden Index in deiner RACE_LOCATIONS Liste
-                    for idx, loc in enumerate(RACE_LOCATIONS):
-                        loc_lower = loc.lower()
-                        if loc_lower == "great britain" and (r_country == "uk" or "british" in r_name):
-                            race_idx = idx
-                            break
-                        elif loc_lower == "united states" and (r_country == "usa" or "united states" in r_name) and "miami" not in r_name and "las vegas" not in r_name:
-                            race_idx = idx
-                            break
-                        elif loc_lower in r_country or loc_lower in r_locality or loc_lower in r_name:
-                            race_idx = idx
-                            break
-                    
-                    # Wenn die Renn-Location in deiner Liste existiert, Punkte eintragen
-                    if race_idx != -1:
-                        race_happened[race_idx] = True
-                        current_points = {team: 0 for team in TEAMS_NOTION}
-                        
-                        if race_has_results and 'Results' in race_info:
-                            for res in race_info['Results']:
-                                api_team    = res['Constructor']['name']
-                                notion_team = API_TO_NOTION_NAME.get(api_team, api_team)
-                                if notion_team in current_points:
-                                    current_points[notion_team] += int(float(res['points']))
-                                    
-                        for notion_team, pts in sprint_points.items():
-                            if notion_team in current_points:
-                                current_points[notion_team] += pts
-                                
-                        for team in weekend_points:
-                            weekend_points[team][race_idx] = current_points.get(team, 0)
-        except Exception:
-            pass
+def get_weekend_points(frame):
+    """
+    Punkte pro Spalte (Rennen + Sprint) aus dem Ergebnis-DataFrame, gezählt über
+    den Registry-Index. Enthält alle Teams der Registry (auch mit 0 Punkten)
+    plus Teams ohne Registry-Eintrag, die Ergebnisse haben (z.B. Archiv-Saisons).
+    """
+    n_registry   = len(ENTITIES["constructors"])
+    matrix, seen = points_matrix(frame, ENTITIES, "constructor", len(RACE_LOCATIONS))
+    weekend_points = {
+        team["name"]: matrix[i].tolist()
+        for i, team in enumerate(ENTITIES["constructors"]) if i < n_registry or seen[i]
+    }
 
+    # Spalte gilt als gefahren, sobald Rennen oder Sprint Ergebnisse haben
+    race_happened = completed_columns(frame, len(RACE_LOCATIONS))
     return weekend_points, race_happened
 
 
@@ -151,39 +65,22 @@ def get_total_points(weekend_points, race_happened):
 
 def get_existing_entries(database_id):
     existing = {}
-    has_more, start_cursor = True, None
-    while has_more:
-        body = {"page_size": 100}
-        if start_cursor:
-            body["start_cursor"] = start_cursor
-        r = requests.post(
-            f"https://api.notion.com/v1/databases/{database_id}/query",
-            headers=headers, json=body
-        )
-        if r.status_code != 200:
-            print(f"❌ Fehler beim Abfragen der DB: {r.status_code}")
-            break
-        data = r.json()
-        for page in data.get("results", []):
-            if page.get("archived"):
-                continue
-            title_prop = page["properties"].get("Constructor")
-            if title_prop and title_prop.get("title"):
-                name = title_prop["title"][0]["text"]["content"]
-                if name:
-                    existing[name] = page["id"]
-        has_more     = data.get("has_more", False)
-        start_cursor = data.get("next_cursor")
+    try:
+        # Nur Einträge mit Titel, nur die Title-Property ("Constructor")
+        for rec in iter_records(database_id, headers,
+                                filter=is_not_empty(TITLE, "title"), properties=[TITLE]):
+            if rec["title"]:
+                existing[rec["title"]] = rec["id"]
+    except requests.HTTPError as e:
+        log.error(f"❌ Fehler beim Abfragen der DB: {e.response.status_code}")
     return existing
 
 
 def upsert_entries(database_id, weekend_points, total_points, race_happened):
     existing = get_existing_entries(database_id)
-    print(f"📋 Bestehende Einträge in DB: {len(existing)}")
-
-    updated, created = 0, 0
+    log.info(f"📋 Bestehende Einträge in DB: {len(existing)}")
 
-    for team in TEAMS_NOTION:
+    for team in weekend_points:
         properties = {
             "Constructor": {"title": [{"text": {"content": team}}]},
             "Total":       {"number": total_points[team]}
@@ -198,10 +95,11 @@ def upsert_entries(database_id, weekend_points, total_points, race_happened):
                 headers=headers, json={"properties": properties}
             )
             if r.status_code == 200:
-                updated += 1
-                print(f"♻️  {team:<25} {total_points[team]:3d} Pts  [aktualisiert]")
+                log.count("upsert", "updated")
+                log.debug(f"♻️  {team:<25} {total_points[team]:3d} Pts  [aktualisiert]")
             else:
-                print(f"❌ Update-Fehler {team}: {r.status_code} – {r.text}")
+                log.count("upsert", "failed")
+                log.error(f"❌ Update-Fehler {team}: {r.status_code} – {r.text}")
         else:
             r = requests.post(
                 "https://api.notion.com/v1/pages",
@@ -209,28 +107,31 @@ def upsert_entries(database_id, weekend_points, total_points, race_happened):
                 json={"parent": {"database_id": database_id}, "properties": properties}
             )
             if r.status_code == 200:
-                created += 1
-                print(f"✅ {team:<25} {total_points[team]:3d} Pts  [neu erstellt]")
+                log.count("upsert", "created")
+                log.debug(f"✅ {team:<25} {total_points[team]:3d} Pts  [neu erstellt]")
             else:
-                print(f"❌ Erstell-Fehler {team}: {r.status_code} – {r.text}")
+                log.count("upsert", "failed")
+                log.error(f"❌ Erstell-Fehler {team}: {r.status_code} – {r.text}")
 
-    print(f"\n✅ Aktualisiert: {updated} | Neu erstellt: {created}")
-    return updated, created
+    counts = log.summary("upsert", f"\n✅ {len(weekend_points)} Konstrukteurs-Einträge geschrieben")
+    return counts.get("updated", 0), counts.get("created", 0)
 
 
 def find_or_create_database():
-    r = requests.post(
-        f"https://api.notion.com/v1/databases/{CONSTRUCTORS_DB_ID}/query",
-        headers=headers, json={}
-    )
-    if r.status_code == 200:
-        print("🔎 Constructors Championship 2026 DB gefunden (direkte ID)")
-        return CONSTRUCTORS_DB_ID
+    db_title = f"Constructors Championship {YEAR}"
+    if CONSTRUCTORS_DB_ID:
+        r = requests.post(
+            f"https://api.notion.com/v1/databases/{CONSTRUCTORS_DB_ID}/query",
+            headers=headers, params={"filter_properties": TITLE}, json={"page_size": 1}
+        )
+        if r.status_code == 200:
+            log.info(f"🔎 {db_title} DB gefunden (direkte ID)")
+            return CONSTRUCTORS_DB_ID
 
-    print("⚠️ Direkte DB-ID nicht erreichbar, suche per API...")
+    log.warning("⚠️ Direkte DB-ID nicht erreichbar, suche per API...")
     r = requests.post(
         "https://api.notion.com/v1/search", headers=headers,
-        json={"query": "Constructors Championship 2026",
+        json={"query": db_title,
               "filter": {"value": "database", "property": "object"}}
     )
     if r.status_code == 200:
@@ -239,12 +140,12 @@ def find_or_create_database():
                 full_title = "".join(
                     b.get("text", {}).get("content", "") for b in db.get("title", [])
                 )
-                if "Constructors Championship 2026" in full_title:
-                    print(f"🔎 Gefunden per Suche: {full_title}")
+                if db_title in full_title:
+                    log.info(f"🔎 Gefunden per Suche: {full_title}")
                     return db["id"]
 
-    print("⚠️ DB nicht gefunden – wird neu erstellt")
-    return create_database("Constructors Championship 2026")
+    log.warning("⚠️ DB nicht gefunden – wird neu erstellt")
+    return create_database(db_title)
 
 
 def create_database(title):
@@ -261,39 +162,39 @@ def create_database(title):
     )
     if r.status_code == 200:
         db_id = r.json()["id"]
-        print(f"✅ Neue DB erstellt: {title}")
+        log.info(f"✅ Neue DB erstellt: {title}")
         return db_id
-    print(f"❌ DB-Erstellung fehlgeschlagen: {r.status_code} – {r.text}")
+    log.error(f"❌ DB-Erstellung fehlgeschlagen: {r.status_code} – {r.text}")
     return None
 
 
 def main():
-    print("🚀 Starte F1 Konstrukteurswertung 2026 Update...")
+    log.setup(sys.argv[1:])
+    log.info(f"🚀 Starte F1 Konstrukteurswertung {YEAR} Update...")
     try:
-        weekend_points, race_happened = get_weekend_points()
+        weekend_points, race_happened = get_weekend_points(load_results_frame(SEASON, ENTITIES))
         total_points = get_total_points(weekend_points, race_happened)
 
         db_id = find_or_create_database()
         if not db_id:
             return False
 
-        print("🔄 Starte Upsert...")
+        log.info("🔄 Starte Upsert...")
         upsert_entries(db_id, weekend_points, total_points, race_happened)
 
-        print("\nAktuelle Konstrukteurswertung 2026:")
-        print("-" * 60)
+        # Tabelle zur Kontrolle nur mit --verbose
+        log.debug(f"\nAktuelle Konstrukteurswertung {YEAR}:")
+        log.debug("-" * 60)
         for i, team in enumerate(
-            sorted(TEAMS_NOTION, key=lambda t: total_points[t], reverse=True), 1
+            sorted(weekend_points, key=lambda t: total_points[t], reverse=True), 1
         ):
-            print(f"{i:2d}. {team:<25} {total_points[team]:3d} Punkte")
+            log.debug(f"{i:2d}. {team:<25} {total_points[team]:3d} Punkte")
 
-        print(f"\n✅ Fertig um {datetime.datetime.now()}")
+        log.info(f"\n✅ Fertig um {datetime.datetime.now()}")
         return True
 
     except Exception as e:
-        import traceback
-        print(f"❌ Fehler: {e}")
-        traceback.print_exc()
+        log.exception(f"❌ Fehler: {e}")
         return False
 
 
@@ -0,0 +1,115 @@
+import glob
+import json
+import os
+import re
+import sys
+
+import f1_log as log
+from f1_artifacts import write_text_artifact, status_label
+from f1_seasons import load_season, output_path
+from f1_schedule import season_sessions, to_ms
+
+# =============================================================================
+# Countdown-Widget: schreibt den Session-Zeitplan der Saison (FastF1 Event-
+# Schedule, gecacht) als vorsortiertes Epoch-ms-Array in f1_countdown_<jahr>.html.
+# Namen werden hier einmal bereinigt – der Browser muss nichts mehr parsen.
+#
+#   python f1_countdown.py                   # aktuelle Saison
+#   F1_SEASON=2027 python f1_countdown.py    # neue Saison (Vorlage: letztes Widget)
+# =============================================================================
+
+SEASON = load_season()
+YEAR   = SEASON["year"]
+
+# Sponsoren-Präfixe im offiziellen Eventnamen ("FORMULA 1 QATAR AIRWAYS AUSTRALIAN GRAND PRIX 2026")
+SPONSORS = [
+    "QATAR AIRWAYS", "ARAMCO", "HEINEKEN", "GULF AIR", "STC",
+    "CRYPTO.COM", "LENOVO", "LOUIS VUITTON", "MSC CRUISES", "PIRELLI",
+    "AWS", "TAG HEUER", "SINGAPORE AIRLINES", "ETIHAD AIRWAYS", "MOET & CHANDON",
+]
+
+_F1_PREFIX      = re.compile(r"^FORMULA\s+1\s+", re.IGNORECASE)
+_SPONSOR_PREFIX = re.compile(
+    r"^(?:" + "|".join(re.escape(s) for s in SPONSORS) + r")\s+", re.IGNORECASE
+)
+
+# Anzeigenamen im Widget
+SESSION_LABEL = {
+    "Sprint Qualifying": "Sprint Qualification",
+    "Sprint":            "Sprint Race",
+}
+
+# Der generierte Block im Widget steht zwischen diesen Markern
+SCHEDULE_BLOCK = re.compile(
+    r"(// SCHEDULE:BEGIN[^\n]*\n).*?(// SCHEDULE:END)", re.DOTALL
+)
+
+
+def clean_event_name(official_name):
+    """'FORMULA 1 QATAR AIRWAYS AUSTRALIAN GRAND PRIX 2026' → 'AUSTRALIAN GRAND PRIX 2026'"""
+    name = _F1_PREFIX.sub("", official_name.strip())
+    return _SPONSOR_PREFIX.sub("", name).strip()
+
+
+def build_schedule(sessions):
+    """
+    Kompakte Widget-Daten aus season_sessions():
+      titles – bereinigte Eventnamen (einmal pro Event)
+      rows   – [startMs, endMs (0 = unbekannt), titleIdx, Session], nach Start sortiert
+    """
+    titles, title_idx, rows = [], {}, []
+    for s in sorted(sessions, key=lambda s: s["start"]):
+        title = clean_event_name(s["official_name"])
+        if title not in title_idx:
+            title_idx[title] = len(titles)
+            titles.append(title)
+        rows.append([
+            to_ms(s["start"]), to_ms(s["end"]), title_idx[title],
+            SESSION_LABEL.get(s["session"], s["session"]),
+        ])
+    return titles, rows
+
+
+def render_schedule(html, titles, rows):
+    """Ersetzt den SCHEDULE-Block im Widget (eine Session pro Zeile → lesbare Diffs)."""
+    dump  = lambda v: json.dumps(v, ensure_ascii=False, separators=(",", ":"))
+    block = (
+        f"const TITLES = {dump(titles)};\n"
+        "const EVENTS = [\n" + "".join(f"{dump(r)},\n" for r in rows) + "];\n"
+    )
+    html, n = SCHEDULE_BLOCK.subn(lambda m: m.group(1) + block + m.group(2), html, count=1)
+    if not n:
+        raise ValueError("SCHEDULE-Marker im Widget nicht gefunden")
+    return html
+
+
+def widget_template(target):
+    """Bestehendes Widget der Saison, sonst das neueste vorhandene als Vorlage."""
+    if os.path.exists(target):
+        return target
+    candidates = sorted(glob.glob("f1_countdown_*.html"))
+    if not candidates:
+        raise FileNotFoundError("Kein f1_countdown_<jahr>.html als Vorlage gefunden")
+    return candidates[-1]
+
+
+def main():
+    log.setup(sys.argv[1:])
+    log.info(f"🔄 Lade FastF1 Event-Schedule {YEAR}...")
+    sessions     = season_sessions(YEAR, include_testing=True)
+    titles, rows = build_schedule(sessions)
+
+    target   = output_path(SEASON, f"f1_countdown_{YEAR}.html")
+    template = widget_template(target)
+    with open(template, encoding="utf-8") as f:
+        html = render_schedule(f.read(), titles, rows)
+    html = re.sub(r"<title>F1 \d{4} Countdown</title>", f"<title>F1 {YEAR} Countdown</title>", html)
+
+    changed = write_text_artifact(target, html)
+    log.info(f"✅ {target} {status_label(changed)} – {len(titles)} Events, {len(rows)} Sessions")
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        exit(1)
@@ -1,166 +1,106 @@
-import requests
-import json
-
-# Rennkalender 2026 – Reihenfolge = Rundennummern 1–24
-RACE_LOCATIONS = [
-    "Australia", "China", "Japan",
-    # "Bahrain", "Saudi Arabia",  # 2026: abgesagt – regionaler Konflikt; für 2027 wieder einkommentieren
-    "Miami",
-    "Canada", "Monaco", "Barcelona", "Austria", "Great Britain", "Belgium",
-    "Hungary", "Netherlands", "Italy", "Spain", "Azerbaijan", "Singapore",
-    "United States", "Mexico", "Brazil", "Las Vegas", "Qatar", "Abu Dhabi"
-]
-
-BASE_URL = "http://api.jolpi.ca/ergast/f1/current/"
-
-# Farben pro Fahrer – Saison 2026
-# Namen MÜSSEN exakt mit der Jolpica API übereinstimmen
-TEAM_COLORS = {
-    "Max Verstappen":        "#3570c5",
-    "Isack Hadjar":          "#3570c5",
-    "George Russell":        "#42f4d7",
-    "Andrea Kimi Antonelli": "#42f4d7",
-    "Charles Leclerc":       "#e8002d",
-    "Lewis Hamilton":        "#e8002d",
-    "Lando Norris":          "#ff8102",
-    "Oscar Piastri":         "#ff8102",
-    "Fernando Alonso":       "#20956e",
-    "Lance Stroll":          "#20956e",
-    "Alexander Albon":       "#1868db",
-    "Carlos Sainz":          "#1868db",
-    "Pierre Gasly":          "#00a1e8",
-    "Franco Colapinto":      "#00a1e8",
-    "Liam Lawson":           "#6692ff",
-    "Arvid Lindblad":        "#6692ff",
-    "Esteban Ocon":          "#dee1e2",
-    "Oliver Bearman":        "#dee1e2",
-    "Nico Hülkenberg":       "#ff2d00",
-    "Gabriel Bortoleto":     "#ff2d00",
-    "Sergio Pérez":          "#aaaaad",
-    "Valtteri Bottas":       "#aaaaad",
-}
-
-
-def get_sprint_points(round_num):
-    """Gibt dict {Fahrername: Sprint-Punkte} für eine Runde zurück."""
-    url = f"{BASE_URL}{round_num}/sprint.json"
-    try:
-        r = requests.get(url, timeout=10)
-        if r.status_code != 200:
-            return {}
-        races = r.json()["MRData"]["RaceTable"]["Races"]
-        if not races:
-            return {}
-        return {
-            f"{res['Driver']['givenName']} {res['Driver']['familyName']}": int(float(res["points"]))
-            for res in races[0]["SprintResults"]
-        }
-    except Exception:
-        return {}
-
-
-def build_cumulative_standings():
+import sys
+
+import numpy as np
+
+import f1_log as log
+from f1_artifacts import write_json_artifact, status_label
+from f1_seasons import load_season, output_path
+from f1_entities import load_entities
+from f1_standings import (load_results_frame, points_matrix, completed_columns,
+                          countback_matrix, rank_progression)
+
+# Saison aus der Registry (seasons/<jahr>.json, Auswahl über F1_SEASON)
+# Spalten = RACE_LOCATIONS, Datenquelle über STANDINGS_SOURCE (siehe f1_standings.py)
+SEASON         = load_season()
+RACE_LOCATIONS = SEASON["race_locations"]
+
+# Fahrer mit Farben aus seasons/<jahr>.json (Entity-Registry, Index = Zeile der Matrix)
+ENTITIES = load_entities(SEASON)
+
+
+def build_cumulative_standings(frame):
     """
-    Baut die kumulativen Standings auf.
-
-    Rückgabe:
-        per_round_cumulative: {Fahrername: [kumulPunkte_R1, ..., kumulPunkte_R22]}
-        total:                {Fahrername: Gesamtpunkte}
-
-    Logik:
-    - Alle bekannten Fahrer starten mit 0.
-    - Für jede Runde: hole race results + sprint results.
-      Wenn keine Ergebnisse (Rennen noch nicht gefahren): alle Fahrer
-      behalten ihren bisherigen Gesamtstand (flaches Fortschreiben).
-    - Am Ende hat jeder Fahrer exakt 22 Einträge.
+    Kumulative Fahrer-Standings aus den Race/Sprint-Ergebnissen.
+    - Alle Fahrer der Registry starten mit 0, Ersatzfahrer kommen aus dem Store dazu.
+    - Noch nicht gefahrene Runden haben 0 Punkte → flaches Fortschreiben.
+    Rückgabe: (entities, cumulative [idx, Runde], total [idx])
     """
-    num_races = len(RACE_LOCATIONS)
-
-    # Laufende Gesamtpunkte – wird Runde für Runde akkumuliert
-    running_total = {driver: 0 for driver in TEAM_COLORS}
-
-    # Ergebnisliste: pro Fahrer 22 Einträge (kumulativ)
-    cumulative = {driver: [] for driver in TEAM_COLORS}
-
-    for round_idx, location in enumerate(RACE_LOCATIONS):
-        # Die API führt die verbleibenden Rennen nach den Absagen nahtlos fort.
-        # Daher entspricht die API-Rundennummer exakt dem Schleifenindex + 1.
-        round_num = round_idx + 1
-
-        # Race results holen
-        race_pts_this_round = {}
-        try:
-            r = requests.get(f"{BASE_URL}{round_num}/results.json", timeout=10)
-            if r.status_code == 200:
-                races = r.json()["MRData"]["RaceTable"]["Races"]
-                if races:
-                    sprint_pts = get_sprint_points(round_num)
-                    for res in races[0]["Results"]:
-                        name = f"{res['Driver']['givenName']} {res['Driver']['familyName']}"
-                        pts = int(float(res["points"])) + sprint_pts.get(name, 0)
-                        race_pts_this_round[name] = pts
-
-                        # Unbekannter Fahrer (Ersatz) dynamisch ergänzen
-                        if name not in running_total:
-                            running_total[name] = 0
-                            cumulative[name] = [0] * round_idx  # vergangene Runden = 0
-                else:
-                    # Sprint hat stattgefunden, Rennen noch nicht → nur Sprint-Punkte eintragen
-                    sprint_pts = get_sprint_points(round_num)
-                    for name, pts in sprint_pts.items():
-                        race_pts_this_round[name] = pts
-                        if name not in running_total:
-                            running_total[name] = 0
-                            cumulative[name] = [0] * round_idx
-        except Exception:
-            pass  # Netzwerkfehler → Runde als nicht gefahren behandeln
-
-        # Kumulierten Stand für alle bekannten Fahrer fortschreiben
-        for driver in running_total:
-            running_total[driver] += race_pts_this_round.get(driver, 0)
-            cumulative[driver].append(running_total[driver])
-
-    return cumulative, running_total
-
-
-def write_json(cumulative, total):
-    """Schreibt driver_chart.json im exakt erwarteten Format."""
-    # Sortiere nach Gesamtpunkten absteigend
-    sorted_drivers = sorted(total.keys(), key=lambda d: total[d], reverse=True)
+    matrix, _ = points_matrix(frame, ENTITIES, "driver", len(RACE_LOCATIONS))
+    cumulative = np.cumsum(matrix, axis=1)
+    total      = cumulative[:, -1] if cumulative.shape[1] else np.zeros(len(matrix), dtype=np.int32)
+    return ENTITIES["drivers"], cumulative, total
+
+
+def build_rank_progression(frame, cumulative):
+    """
+    WM-Position nach jeder Runde (Countback: Siege, 2. Plätze, ...) aus derselben
+    Ergebnis-Tabelle – keine zusätzlichen API-Abfragen.
+    Rückgabe: (ranks [idx, Runde], played [bool je Runde])
+    """
+    countback = countback_matrix(frame, ENTITIES, "driver", len(RACE_LOCATIONS))
+    return rank_progression(cumulative, countback), completed_columns(frame, len(RACE_LOCATIONS))
+
+
+def write_positions_json(entities, ranks, played):
+    # Reihenfolge = aktuelle WM-Position, noch nicht gefahrene Runden → null
+    last  = max((col for col, p in enumerate(played) if p), default=None)
+    order = np.argsort(ranks[:, last], kind="stable") if last is not None else range(len(entities))
 
     chart = {
         "labels": RACE_LOCATIONS,
         "series": [
             {
-                "title": driver,
-                "data":  cumulative[driver],
-                "color": TEAM_COLORS.get(driver, "#888888")
+                "title": entities[i]["api_name"],
+                "data":  [int(r) if p else None for r, p in zip(ranks[i], played)],
+                "color": entities[i]["color"]
             }
-            for driver in sorted_drivers
+            for i in order
         ],
         "backgroundColor": "#191919"
     }
 
-    with open("f1_drivers_chart.json", "w", encoding="utf-8") as f:
-        json.dump(chart, f, ensure_ascii=False, indent=2)
+    changed = write_json_artifact(output_path(SEASON, "f1_drivers_positions.json"), chart)
+    log.info(f"✅ f1_drivers_positions.json {status_label(changed)} – {len(entities)} Fahrer, {sum(played)} gefahrene Runden")
+
+
+def write_json(entities, cumulative, total):
+    # Nach Gesamtpunkten absteigend, bei Gleichstand Registry-Reihenfolge
+    order = np.argsort(-total, kind="stable")
+
+    chart = {
+        "labels": RACE_LOCATIONS,
+        "series": [
+            {
+                "title": entities[i]["api_name"],
+                "data":  cumulative[i].tolist(),
+                "color": entities[i]["color"]
+            }
+            for i in order
+        ],
+        "backgroundColor": "#191919"
+    }
 
-    print(f"✅ f1_drivers_chart.json geschrieben – {len(sorted_drivers)} Fahrer, {len(RACE_LOCATIONS)} Runden")
+    changed = write_json_artifact(output_path(SEASON, "f1_drivers_chart.json"), chart)
+    log.info(f"✅ f1_drivers_chart.json {status_label(changed)} – {len(order)} Fahrer, {len(RACE_LOCATIONS)} Runden")
 
-    # Konsolenausgabe zur Kontrolle
-    print("\nStandings:")
-    print("-" * 45)
-    for i, driver in enumerate(sorted_drivers, 1):
-        pts = total[driver]
+    # Konsolenausgabe zur Kontrolle (--verbose)
+    log.debug("\nStandings:")
+    log.debug("-" * 45)
+    for pos, i in enumerate(order, 1):
         # Zeige die letzten 3 nicht-null-Einträge als Vorschau
-        preview = [str(x) for x in cumulative[driver] if x > 0][-3:]
+        preview = [str(x) for x in cumulative[i] if x > 0][-3:]
         preview_str = f"[...{', '.join(preview)}]" if preview else "[0, 0, ...]"
-        print(f"{i:2d}. {driver:<30} {pts:4d} Pts  {preview_str}")
+        log.debug(f"{pos:2d}. {entities[i]['api_name']:<30} {int(total[i]):4d} Pts  {preview_str}")
 
 
 def main():
-    print("🔄 Lade F1 2026 Fahrerpunkte (kumulativ)...")
-    cumulative, total = build_cumulative_standings()
-    write_json(cumulative, total)
+    log.setup(sys.argv[1:])
+    log.info(f"🔄 Lade F1 {SEASON['year']} Fahrerpunkte (kumulativ)...")
+    # --offline: nur aus dem lokalen Season Store, ohne Jolpica-Abfragen
+    frame = load_results_frame(SEASON, ENTITIES, offline="--offline" in sys.argv[1:])
+    entities, cumulative, total = build_cumulative_standings(frame)
+    write_json(entities, cumulative, total)
+    write_positions_json(entities, *build_rank_progression(frame, cumulative))
 
 
 if __name__ == "__main__":
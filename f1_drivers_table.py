@@ -1,178 +1,61 @@
-import requests
+import asyncio
 import os
-from notion_client import Client
-import httpx
+import sys
+import time
 
-# F1 Drivers Championship Notion Updater für GitHub Actions – Saison 2026
+import f1_log as log
+from f1_notion_query import aiter_records, is_not_empty, TITLE
+from f1_seasons import load_season
+from f1_entities import load_entities
+from f1_standings import load_results_frame, points_matrix
 
-NOTION_TOKEN = os.getenv("NOTION_TOKEN")
-DATABASE_ID  = "3166839379ed81f8bc7dc0999f1f8e6d"  # Drivers Championship 2026
-
-RACE_LOCATIONS = [
-    "Australia", "China", "Japan",
-    # "Bahrain", "Saudi Arabia",  # 2026: abgesagt – regionaler Konflikt; für 2027 wieder einkommentieren
-    "Miami",
-    "Canada", "Monaco", "Barcelona", "Austria", "Great Britain", "Belgium",
-    "Hungary", "Netherlands", "Italy", "Spain", "Azerbaijan", "Singapore",
-    "United States", "Mexico", "Brazil", "Las Vegas", "Qatar", "Abu Dhabi"
-]
-
-BASE_URL = "http://api.jolpi.ca/ergast/f1/current/"
-
-# Mapping: API-Name → Notion-Anzeigename
-# Die API liefert z.B. "Andrea Kimi Antonelli", in Notion heißt der Eintrag aber "Kimi Antonelli".
-API_TO_NOTION_NAME = {
-    "Andrea Kimi Antonelli": "Kimi Antonelli",
-}
-
-# Mapping: Notion-Anzeigename → Seiten-ID im "Drivers 2026" DB
-# Wird für die "Driver"-Relation in der Drivers Championship 2026 DB benötigt.
-DRIVER_PAGE_IDS = {
-    "Max Verstappen":   "3166839379ed81f3b6f5cf5864abdcba",
-    "Isack Hadjar":     "3166839379ed8153acedd2bed8ed3c5e",
-    "George Russell":   "3166839379ed81499980c7fde7c353e9",
-    "Kimi Antonelli":   "3166839379ed814695edceee97561ad0",
-    "Charles Leclerc":  "3166839379ed81049f8aca1b3fbb5c2e",
-    "Lewis Hamilton":   "3166839379ed81b39fbfc668967b43ca",
-    "Lando Norris":     "3166839379ed8159a2dccc7dd76ba669",
-    "Oscar Piastri":    "3166839379ed81a48c4bccd923a59d12",
-    "Fernando Alonso":  "3166839379ed8111856dca4832af4816",
-    "Lance Stroll":     "3166839379ed81f28f6be9c75c6d86b9",
-    "Alexander Albon":  "3166839379ed81d78a12e2564f90c3b9",
-    "Carlos Sainz":     "3166839379ed81a3a73bf3a63e6505d6",
-    "Pierre Gasly":     "3166839379ed81f6be7bd54256fb4096",
-    "Franco Colapinto": "3186839379ed80ebbef3ce6d9d66cf7e",
-    "Liam Lawson":      "3166839379ed81179562f8bb3d7ea15a",
-    "Arvid Lindblad":   "3186839379ed80d08be1c9359498ac59",
-    "Esteban Ocon":     "3166839379ed81eaa7a1d971704c679a",
-    "Oliver Bearman":   "3166839379ed81488937d5a06740ae28",
-    "Nico Hülkenberg":  "3166839379ed81be895df1bb7cd0fa40",
-    "Gabriel Bortoleto":"3166839379ed81659d63ca189da1b672",
-    "Sergio Pérez":     "3186839379ed8095acdbe00d33cbfa35",
-    "Valtteri Bottas":  "3186839379ed801693e1d191cca36300",
-}
-
-TEAM_COLORS = {
-    "Max Verstappen":   "#0600EF",
-    "Isack Hadjar":     "#0600EF",
-    "George Russell":   "#00D2BE",
-    "Kimi Antonelli":   "#00D2BE",
-    "Charles Leclerc":  "#DC0000",
-    "Lewis Hamilton":   "#DC0000",
-    "Lando Norris":     "#FF8700",
-    "Oscar Piastri":    "#FF8700",
-    "Fernando Alonso":  "#006F62",
-    "Lance Stroll":     "#006F62",
-    "Alexander Albon":  "#005AFF",
-    "Carlos Sainz":     "#005AFF",
-    "Pierre Gasly":     "#0090FF",
-    "Franco Colapinto": "#0090FF",
-    "Liam Lawson":      "#0131d1",
-    "Arvid Lindblad":   "#0131d1",
-    "Esteban Ocon":     "#FFFFFF",
-    "Oliver Bearman":   "#FFFFFF",
-    "Nico Hülkenberg":  "#00e701",
-    "Gabriel Bortoleto":"#00e701",
-    "Sergio Pérez":     "#B0B0B0",
-    "Valtteri Bottas":  "#B0B0B0",
-}
-
-
-def get_sprint_points(round_num):
-    """Holt Sprint-Punkte und normalisiert die Fahrernamen auf Notion-Namen."""
-    url = f"{BASE_URL}{round_num}/sprint.json"
-    sprint_points = {}
-    try:
-        r = requests.get(url, timeout=10)
-        if r.status_code == 200:
-            races = r.json()['MRData']['RaceTable']['Races']
-            if races:
-                for res in races[0]['SprintResults']:
-                    api_name    = f"{res['Driver']['givenName']} {res['Driver']['familyName']}"
-                    notion_name = API_TO_NOTION_NAME.get(api_name, api_name)
-                    sprint_points[notion_name] = int(float(res['points']))
-    except Exception:
-        pass
-    return sprint_points
-
-
-def get_weekend_points():
-    """
-    Berechnet die Punkte pro Rennwochenende.
-    Fahrernamen werden sofort auf Notion-Namen normalisiert (kein Duplikat-Risiko).
-    """
-    weekend_points = {}
+# F1 Drivers Championship Notion Updater für GitHub Actions
+# Saison über F1_SEASON (seasons/<jahr>.json), Default: aktuelle Saison
 
-    for round_idx, location in enumerate(RACE_LOCATIONS):
-        # Die API führt die verbleibenden Rennen nach den Absagen nahtlos fort.
-        # Daher entspricht die API-Rundennummer exakt dem Schleifenindex + 1.
-        round_num = round_idx + 1
+SEASON = load_season()
+YEAR   = SEASON["year"]
 
-        try:
-            r = requests.get(f"{BASE_URL}{round_num}/results.json", timeout=10)
-            if r.status_code != 200:
-                continue
-        except Exception:
-            continue
+NOTION_TOKEN = os.getenv("NOTION_TOKEN")
+DATABASE_ID  = SEASON["notion"]["drivers_championship_db"]  # Drivers Championship <jahr>
+NOTION_VERSION = "2022-06-28"
 
-        races         = r.json()['MRData']['RaceTable']['Races']
-        sprint_points = get_sprint_points(round_num)
+# Parallele Upserts – Notion erlaubt im Schnitt 3 Requests/s pro Integration,
+# kurze Bursts darüber werden toleriert
+NOTION_MAX_CONCURRENCY = int(os.getenv("NOTION_MAX_CONCURRENCY", "4"))
+NOTION_RATE_PER_SEC    = float(os.getenv("NOTION_RATE_PER_SEC", "3"))
+NOTION_RATE_BURST      = int(os.getenv("NOTION_RATE_BURST", "10"))
 
-        if races:
-            for res in races[0]['Results']:
-                api_name    = f"{res['Driver']['givenName']} {res['Driver']['familyName']}"
-                notion_name = API_TO_NOTION_NAME.get(api_name, api_name)
-                pts         = int(float(res['points'])) + sprint_points.get(notion_name, 0)
+RACE_LOCATIONS = SEASON["race_locations"]
 
-                if notion_name not in weekend_points:
-                    weekend_points[notion_name] = [0] * len(RACE_LOCATIONS)
+# Fahrer (Jolpica-ID, Notion-Name, Seiten-ID, Farbe) aus seasons/<jahr>.json
+ENTITIES = load_entities(SEASON)
 
-                weekend_points[notion_name][round_idx] = pts
-        elif sprint_points:
-            # Sprint hat stattgefunden, Rennen noch nicht → nur Sprint-Punkte eintragen
-            for notion_name, pts in sprint_points.items():
-                if notion_name not in weekend_points:
-                    weekend_points[notion_name] = [0] * len(RACE_LOCATIONS)
-                weekend_points[notion_name][round_idx] = pts
 
-    return weekend_points
+def get_weekend_points(frame):
+    """
+    Punkte pro Rennwochenende (Rennen + Sprint) aus dem Ergebnis-DataFrame.
+    Fahrer werden über ihren Registry-Index gezählt und unter dem Notion-Namen ausgegeben.
+    """
+    matrix, seen = points_matrix(frame, ENTITIES, "driver", len(RACE_LOCATIONS))
+    drivers = ENTITIES["drivers"]
+    return {drivers[i]["name"]: matrix[i].tolist() for i in range(len(drivers)) if seen[i]}
 
 
 def calculate_total_points(weekend_points):
     return {driver: sum(pts) for driver, pts in weekend_points.items()}
 
 
-def get_existing_entries(db_id):
+async def get_existing_entries(notion, db_id):
     """Gibt Dict {Fahrername (Notion): page_id} zurück."""
-    http_headers = {
-        "Authorization": f"Bearer {NOTION_TOKEN}",
-        "Notion-Version": "2022-06-28",
-        "Content-Type": "application/json"
-    }
     existing = {}
-    has_more, start_cursor = True, None
-    while has_more:
-        body = {"page_size": 100}
-        if start_cursor:
-            body["start_cursor"] = start_cursor
-        r = httpx.post(
-            f"https://api.notion.com/v1/databases/{db_id}/query",
-            headers=http_headers, json=body, timeout=30.0
-        )
-        if r.status_code != 200:
-            print(f"❌ Query fehlgeschlagen: {r.status_code} – {r.text}")
-            break
-        data = r.json()
-        for page in data.get("results", []):
-            if page.get("archived"):
-                continue
-            title_prop = page["properties"].get("Name") or page["properties"].get("Driver")
-            if title_prop and title_prop.get("title"):
-                name = title_prop["title"][0]["text"]["content"] if title_prop["title"] else None
-                if name:
-                    existing[name] = page["id"]
-        has_more     = data.get("has_more", False)
-        start_cursor = data.get("next_cursor")
+    try:
+        # Nur Einträge mit Titel, nur die Title-Property ("Driver", ältere DBs: "Name")
+        async for rec in aiter_records(notion, db_id, filter=is_not_empty(TITLE, "title"),
+                                       properties=[TITLE]):
+            if rec["title"]:
+                existing[rec["title"]] = rec["id"]
+    except Exception as e:
+        log.error(f"❌ Query fehlgeschlagen: {e}")
     return existing
 
 
@@ -189,13 +72,70 @@ def build_properties(driver, points):
     return props
 
 
-def upsert_driver_entries(notion, db_id, weekend_points, total_points):
-    print("\n" + "="*60)
-    print("🔄 UPSERT FAHRER-EINTRÄGE")
-    print("="*60)
+# ─────────────────────────────────────────────
+# Nebenläufige Upserts: Semaphore begrenzt parallele Requests, der Rate-Limiter
+# hält den Notion-Durchschnitt (3 Requests/s) ein. 429-Antworten wiederholt
+# notion_client selbst (Retry-After).
+# ─────────────────────────────────────────────
 
-    existing = get_existing_entries(db_id)
-    print(f"📋 Bestehende Einträge in DB: {len(existing)}")
+def make_rate_limiter(rate_per_sec, burst):
+    """
+    Token-Bucket: bis zu `burst` Requests sofort, danach rate_per_sec.
+    Gibt eine Coroutine zurück, die vor jedem Request awaited wird.
+    """
+    lock  = asyncio.Lock()
+    state = {"tokens": float(burst), "last": None}
+
+    async def wait():
+        async with lock:
+            loop = asyncio.get_running_loop()
+            now  = loop.time()
+            if state["last"] is not None:
+                state["tokens"] = min(burst, state["tokens"] + (now - state["last"]) * rate_per_sec)
+            state["last"] = now
+            if state["tokens"] < 1:
+                await asyncio.sleep((1 - state["tokens"]) / rate_per_sec)
+                state["tokens"], state["last"] = 1.0, loop.time()
+            state["tokens"] -= 1
+
+    return wait
+
+
+def latency_report(latencies):
+    """min / median / p95 / max in ms über alle Upsert-Requests."""
+    if not latencies:
+        return "keine Requests"
+    ms = sorted(s * 1000 for s in latencies)
+    p95 = ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))]
+    return (f"{len(ms)} Requests – min {ms[0]:.0f} ms | median {ms[len(ms) // 2]:.0f} ms | "
+            f"p95 {p95:.0f} ms | max {ms[-1]:.0f} ms")
+
+
+async def upsert_driver(notion, db_id, driver, props, page_id, semaphore, throttle, latencies):
+    """Ein Upsert: Rückgabe ("updated" | "created" | None, Latenz in s)."""
+    async with semaphore:
+        await throttle()
+        t0 = time.perf_counter()
+        try:
+            if page_id:
+                await notion.pages.update(page_id=page_id, properties=props)
+                action = "updated"
+            else:
+                await notion.pages.create(parent={"database_id": db_id}, properties=props)
+                action = "created"
+        except Exception as e:
+            log.error(f"❌ {'Update' if page_id else 'Erstell'}-Fehler {driver}: {e}")
+            action = None
+        elapsed = time.perf_counter() - t0
+        latencies.append(elapsed)
+        return action, elapsed
+
+
+async def upsert_driver_entries(notion, db_id, weekend_points, total_points):
+    log.banner("🔄 UPSERT FAHRER-EINTRÄGE")
+
+    existing = await get_existing_entries(notion, db_id)
+    log.info(f"📋 Bestehende Einträge in DB: {len(existing)}")
 
     sorted_drivers = sorted(
         weekend_points.keys(),
@@ -203,59 +143,68 @@ def upsert_driver_entries(notion, db_id, weekend_points, total_points):
         reverse=True
     )
 
-    updated, created = 0, 0
+    semaphore = asyncio.Semaphore(NOTION_MAX_CONCURRENCY)
+    throttle  = make_rate_limiter(NOTION_RATE_PER_SEC, NOTION_RATE_BURST)
+    latencies = []
 
-    for pos, driver in enumerate(sorted_drivers, 1):
-        points = weekend_points.get(driver, [0] * len(RACE_LOCATIONS))
-        props  = build_properties(driver, points)
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(
+        upsert_driver(
+            notion, db_id, driver,
+            build_properties(driver, weekend_points.get(driver, [0] * len(RACE_LOCATIONS))),
+            existing.get(driver), semaphore, throttle, latencies
+        )
+        for driver in sorted_drivers
+    ))
+    wall = time.perf_counter() - t0
 
-        if driver in existing:
-            try:
-                notion.pages.update(page_id=existing[driver], properties=props)
-                updated += 1
-                print(f"♻️  {pos:2d}. {driver:<30} {total_points[driver]:3d} Pts  [aktualisiert]")
-            except Exception as e:
-                print(f"❌ Update-Fehler {driver}: {e}")
-        else:
-            try:
-                notion.pages.create(parent={"database_id": db_id}, properties=props)
-                created += 1
-                print(f"✅ {pos:2d}. {driver:<30} {total_points[driver]:3d} Pts  [neu erstellt]")
-            except Exception as e:
-                print(f"❌ Erstell-Fehler {driver}: {e}")
+    # Einzelzeilen (--verbose) in Tabellenreihenfolge, unabhängig von der Abschlussreihenfolge
+    for pos, (driver, (action, elapsed)) in enumerate(zip(sorted_drivers, results), 1):
+        log.count("upsert", action or "failed")
+        if action == "updated":
+            log.debug(f"♻️  {pos:2d}. {driver:<30} {total_points[driver]:3d} Pts  [aktualisiert, {elapsed * 1000:.0f} ms]")
+        elif action == "created":
+            log.debug(f"✅ {pos:2d}. {driver:<30} {total_points[driver]:3d} Pts  [neu erstellt, {elapsed * 1000:.0f} ms]")
 
-    print(f"\n✅ Aktualisiert: {updated} | Neu erstellt: {created}")
-    return updated, created
+    counts = log.summary("upsert", f"\n✅ {len(sorted_drivers)} Fahrer-Einträge geschrieben")
+    log.info(f"⏱️  {latency_report(latencies)} | gesamt {wall:.1f} s")
+    return counts.get("updated", 0), counts.get("created", 0)
 
 
-def main():
-    print("\n" + "="*60)
-    print("🏎️  F1 DRIVERS CHAMPIONSHIP 2026 UPDATE")
-    print("="*60)
-    print(f"Database ID: {DATABASE_ID}")
+async def sync_table():
+    """
+    Erst die Jolpica-Phase (Season Store), dann ein gemeinsamer httpx.AsyncClient
+    für Query und alle Upserts. notion_client/httpx werden erst für die
+    Notion-Phase importiert.
+    """
+    log.info(f"\n📡 Hole F1-Daten (Saison {YEAR})...")
+    weekend_points = get_weekend_points(load_results_frame(SEASON, ENTITIES))
+    total_points   = calculate_total_points(weekend_points)
+    log.info(f"✅ Daten für {len(total_points)} Fahrer geladen")
 
-    try:
-        notion = Client(auth=NOTION_TOKEN)
-        print("✅ Notion Client initialisiert")
+    import httpx
+    from notion_client import AsyncClient
+
+    async with httpx.AsyncClient(timeout=httpx.Timeout(30.0),
+                                 limits=httpx.Limits(max_connections=NOTION_MAX_CONCURRENCY)) as http:
+        notion = AsyncClient(auth=NOTION_TOKEN, notion_version=NOTION_VERSION, client=http)
+        log.info("✅ Notion Client initialisiert")
+        return await upsert_driver_entries(notion, DATABASE_ID, weekend_points, total_points)
 
-        print("\n📡 Hole F1-Daten (Saison 2026)...")
-        weekend_points = get_weekend_points()
-        total_points   = calculate_total_points(weekend_points)
-        print(f"✅ Daten für {len(total_points)} Fahrer geladen")
 
-        updated, created = upsert_driver_entries(notion, DATABASE_ID, weekend_points, total_points)
+def main():
+    log.setup(sys.argv[1:])
+    log.banner(f"🏎️  F1 DRIVERS CHAMPIONSHIP {YEAR} UPDATE")
+    log.info(f"Database ID: {DATABASE_ID}")
+
+    try:
+        updated, created = asyncio.run(sync_table())
 
-        print("\n" + "="*60)
-        print("✅ UPDATE ERFOLGREICH!")
-        print("="*60)
-        print(f"Aktualisiert: {updated} | Neu erstellt: {created}")
-        print("="*60)
+        log.banner(f"✅ UPDATE ERFOLGREICH!\nAktualisiert: {updated} | Neu erstellt: {created}")
         return True
 
     except Exception as e:
-        import traceback
-        print(f"\n❌ FEHLER: {e}")
-        traceback.print_exc()
+        log.exception(f"\n❌ FEHLER: {e}")
         return False
 
 
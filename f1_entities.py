@@ -0,0 +1,74 @@
+from f1_seasons import load_season
+
+# =============================================================================
+# Entity-Registry: Fahrer und Konstrukteure einer Saison, geschlüsselt nach
+# Jolpica driverId/constructorId (Fahrer zusätzlich nach FastF1-Kürzel).
+# Jede Entity bekommt einen dichten Index 0..n-1 → Aggregation per
+# Array-Indexing statt Namens-Normalisierung über mehrere Mapping-Dicts.
+#
+# Daten: seasons/<jahr>.json → "drivers" / "constructors"
+#   name        – Anzeige-/Notion-Name
+#   api_name    – Jolpica-Name, falls abweichend (z.B. "Alpine F1 Team")
+#   color       – Konstrukteursfarbe, Fahrer erben die Farbe ihres Teams
+#   notion_page – Seiten-ID im "Drivers <jahr>" DB
+# =============================================================================
+
+DEFAULT_COLOR = "#888888"
+
+# Pro Prozess einmal laden
+_registry_cache = {}
+
+
+def _entry(data, idx):
+    entry = dict(data)
+    entry["idx"] = idx
+    entry.setdefault("api_name", entry["name"])
+    entry.setdefault("color", DEFAULT_COLOR)
+    return entry
+
+
+def load_entities(season=None):
+    """
+    Rückgabe:
+      drivers / constructors  – Listen, Position = idx
+      driver_idx / constructor_idx – {Jolpica-ID: idx}
+      driver_by_code          – {FastF1-Kürzel: idx}
+    """
+    season = season or load_season()
+    year   = season["year"]
+    if year in _registry_cache:
+        return _registry_cache[year]
+
+    constructors = [_entry(c, i) for i, c in enumerate(season.get("constructors", []))]
+    constructor_idx = {c["id"]: c["idx"] for c in constructors}
+
+    drivers = []
+    for i, d in enumerate(season.get("drivers", [])):
+        entry = _entry(d, i)
+        team  = constructor_idx.get(d.get("constructor"))
+        entry["color"] = d.get("color") or (constructors[team]["color"] if team is not None else DEFAULT_COLOR)
+        drivers.append(entry)
+
+    registry = {
+        "drivers":         drivers,
+        "constructors":    constructors,
+        "driver_idx":      {d["id"]: d["idx"] for d in drivers},
+        "driver_by_code":  {d["code"]: d["idx"] for d in drivers if d.get("code")},
+        "constructor_idx": constructor_idx,
+    }
+    _registry_cache[year] = registry
+    return registry
+
+
+def entity_index(registry, kind, entity_id, api_name=None):
+    """
+    Dichter Index für driverId/constructorId (kind: "driver" | "constructor").
+    Unbekannte IDs (Ersatzfahrer, Archiv-Saisons ohne Registry) werden angehängt.
+    """
+    ids = registry[f"{kind}_idx"]
+    if entity_id not in ids:
+        entities = registry[f"{kind}s"]
+        name = api_name or entity_id
+        entities.append(_entry({"id": entity_id, "name": name, "api_name": name}, len(entities)))
+        ids[entity_id] = len(entities) - 1
+    return ids[entity_id]
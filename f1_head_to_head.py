@@ -0,0 +1,302 @@
+import sys
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import requests
+
+import f1_log as log
+from f1_artifacts import write_json_artifact, status_label, json_number
+from f1_entities import load_entities
+from f1_notion_query import NOTION_API, iter_records, is_not_empty, find_or_create_database, TITLE
+from f1_season_store import open_synced_store
+from f1_seasons import load_season, output_path
+from f1_standings import notion_headers
+
+# =============================================================================
+# Teamkollegen-Duelle pro Team-Paarung über die ganze Saison:
+#   Quali-H2H      – wer stand im Qualifying vorne
+#   Race-H2H       – wer kam im Grand Prix vorne an (Jolpica-Reihenfolge,
+#                    Ausfälle also hinter den Gewerteten)
+#   Quali-Gap      – Median des Abstands im letzten Segment, das beide
+#                    erreicht haben (Q3 vor Q2 vor Q1), in s und %
+#                    (negativ = Fahrer A schneller)
+#   Punkteanteil   – Punkte (Rennen + Sprint) innerhalb der Paarung
+#
+# Datenbasis ist der Season Store (Rennen/Sprints + Qualifying mit Q1–Q3):
+# neue Wochenenden werden dort angehängt, die Auswertung läuft danach
+# vektorisiert über alle Runden (Self-Join pro Runde und Team).
+#
+#   python f1_head_to_head.py             # f1_head_to_head.json
+#   python f1_head_to_head.py --notion    # zusätzlich Head-to-Head-DB (nur Änderungen)
+#   python f1_head_to_head.py --offline   # nur lokaler Season Store
+# =============================================================================
+
+SEASON = load_season()
+YEAR   = SEASON["year"]
+
+ENTITIES = load_entities(SEASON)
+
+PAIR_KEYS = ["constructor_id", "driver_a", "driver_b"]
+
+H2H_DB_ID      = SEASON["notion"].get("head_to_head_db")
+PARENT_PAGE_ID = SEASON["notion"].get("constructors_parent_page")
+DB_TITLE       = f"Teammate Head-to-Head {YEAR}"
+
+# Notion-Spalte → Feld der Paarung (Reihenfolge = Spalten beim Anlegen)
+NUMBER_PROPERTIES = {
+    "Rounds":          "rounds",
+    "Quali A":         "quali_a",
+    "Quali B":         "quali_b",
+    "Race A":          "race_a",
+    "Race B":          "race_b",
+    "Quali Gap (s)":   "gap_s",
+    "Quali Gap (%)":   "gap_pct",
+    "Points A":        "points_a",
+    "Points B":        "points_b",
+    "Points Share A":  "share_a",
+}
+
+
+# ─────────────────────────────────────────────
+# Daten aus dem Season Store
+# ─────────────────────────────────────────────
+
+def load_frames(offline=False):
+    with closing(open_synced_store(offline=offline)) as conn:
+        quali = pd.read_sql_query(
+            "SELECT round, driver_id, driver_code, constructor_id, constructor_name, position, q1, q2, q3 "
+            "FROM qualifying WHERE season=?", conn, params=(YEAR,)
+        )
+        results = pd.read_sql_query(
+            "SELECT round, session, driver_id, driver_code, constructor_id, constructor_name, position, points "
+            "FROM results WHERE season=?", conn, params=(YEAR,)
+        )
+    return quali, results
+
+
+def teammate_pairs(df, keys=("round",)):
+    """
+    Self-Join pro Runde und Team → eine Zeile pro Teamkollegen-Paar, Spalten
+    mit Suffix _a/_b (driver_a < driver_b, damit jede Paarung genau einmal vorkommt).
+    """
+    on    = list(keys) + ["constructor_id"]
+    pairs = df.merge(df, on=on, suffixes=("_a", "_b"))
+    pairs = pairs[pairs["driver_id_a"] < pairs["driver_id_b"]]
+    return pairs.rename(columns={"driver_id_a": "driver_a", "driver_id_b": "driver_b"})
+
+
+def quali_gaps(pairs):
+    """Abstand A − B (s) im letzten gemeinsamen Segment; NaN ohne gemeinsame Zeit."""
+    both = {q: pairs[f"{q}_a"].notna() & pairs[f"{q}_b"].notna() for q in ("q3", "q2", "q1")}
+    time_a = np.select([both[q] for q in both], [pairs[f"{q}_a"] for q in both], np.nan)
+    time_b = np.select([both[q] for q in both], [pairs[f"{q}_b"] for q in both], np.nan)
+    return time_a - time_b, (time_a - time_b) / time_b * 100
+
+
+# ─────────────────────────────────────────────
+# Auswertung
+# ─────────────────────────────────────────────
+
+def head_to_head(quali, results):
+    """Eine Zeile pro Team-Paarung; A ist der Fahrer mit mehr Quali-Duellen."""
+    q = teammate_pairs(quali)
+    q["quali_a"] = (q["position_a"] < q["position_b"]).astype(int)
+    q["quali_b"] = (q["position_b"] < q["position_a"]).astype(int)
+    q["gap_s"], q["gap_pct"] = quali_gaps(q)
+
+    race = teammate_pairs(results[results["session"] == "race"])
+    race["race_a"] = (race["position_a"] < race["position_b"]).astype(int)
+    race["race_b"] = (race["position_b"] < race["position_a"]).astype(int)
+
+    # Punkte nur aus Runden/Sessions, in denen beide für das Team fuhren
+    pts = teammate_pairs(results, keys=("round", "session"))
+
+    table = pd.concat([
+        q.groupby(PAIR_KEYS).agg(quali_a=("quali_a", "sum"), quali_b=("quali_b", "sum"),
+                                 gap_s=("gap_s", "median"), gap_pct=("gap_pct", "median")),
+        race.groupby(PAIR_KEYS).agg(race_a=("race_a", "sum"), race_b=("race_b", "sum")),
+        pts.groupby(PAIR_KEYS).agg(points_a=("points_a", "sum"), points_b=("points_b", "sum")),
+        # Runden mit Quali oder Rennen – am Samstag zählt das Wochenende schon mit
+        pd.concat([q[PAIR_KEYS + ["round"]], pts[PAIR_KEYS + ["round"]]])
+          .drop_duplicates().groupby(PAIR_KEYS).size().rename("rounds"),
+    ], axis=1)
+    if table.empty:
+        return table
+
+    counts = ["quali_a", "quali_b", "race_a", "race_b", "rounds", "points_a", "points_b"]
+    table[counts] = table[counts].fillna(0)
+    total = table["points_a"] + table["points_b"]
+    table["share_a"] = np.where(total > 0, table["points_a"] / total.where(total > 0, 1), np.nan)
+    table = table.reset_index()
+
+    # Ausrichtung: A = Fahrer mit mehr Quali-Duellen (bei Gleichstand mehr Punkte)
+    swap = (table["quali_b"] > table["quali_a"]) | (
+        (table["quali_b"] == table["quali_a"]) & (table["points_b"] > table["points_a"]))
+    for a, b in (("driver_a", "driver_b"), ("quali_a", "quali_b"), ("race_a", "race_b"),
+                 ("points_a", "points_b")):
+        table.loc[swap, [a, b]] = table.loc[swap, [b, a]].to_numpy()
+    table.loc[swap, ["gap_s", "gap_pct"]] *= -1
+    table.loc[swap, "share_a"] = 1 - table.loc[swap, "share_a"]
+    return table
+
+
+def driver_labels(quali, results):
+    """Jolpica-ID → Kürzel (z.B. max_verstappen → VER) und Team-ID → Name."""
+    both = pd.concat([quali, results])
+    codes = both.dropna(subset=["driver_code"]).drop_duplicates("driver_id")
+    teams = both.drop_duplicates("constructor_id")
+    return (dict(zip(codes["driver_id"], codes["driver_code"])),
+            dict(zip(teams["constructor_id"], teams["constructor_name"])))
+
+
+# ─────────────────────────────────────────────
+# Chart-JSON
+# ─────────────────────────────────────────────
+
+def build_pairings(table, codes, team_names):
+    """Paarungen in Team-Reihenfolge der Saison-Datei, Kennzahlen als einfache Zahlen."""
+    order = {c["id"]: i for i, c in enumerate(ENTITIES["constructors"])}
+    rows = []
+    for r in sorted(table.itertuples(index=False), key=lambda r: (order.get(r.constructor_id, 99), r.driver_a)):
+        team = ENTITIES["constructor_idx"].get(r.constructor_id)
+        rows.append({
+            "title":    f"{codes.get(r.driver_a, r.driver_a)} – {codes.get(r.driver_b, r.driver_b)}",
+            "team":     ENTITIES["constructors"][team]["name"] if team is not None
+                        else team_names.get(r.constructor_id, r.constructor_id),
+            "color":    ENTITIES["constructors"][team]["color"] if team is not None else "#888888",
+            "drivers":  [codes.get(r.driver_a, r.driver_a), codes.get(r.driver_b, r.driver_b)],
+            "rounds":   int(r.rounds),
+            "quali_a":  int(r.quali_a),
+            "quali_b":  int(r.quali_b),
+            "race_a":   int(r.race_a),
+            "race_b":   int(r.race_b),
+            "gap_s":    json_number(r.gap_s),
+            "gap_pct":  json_number(r.gap_pct),
+            "points_a": json_number(r.points_a, 1),
+            "points_b": json_number(r.points_b, 1),
+            "share_a":  json_number(r.share_a, 4),
+        })
+    return rows
+
+
+def write_json(pairings, rounds):
+    data = {
+        "season":   YEAR,
+        "rounds":   rounds,
+        "pairings": pairings,
+        "backgroundColor": "#191919",
+    }
+    changed = write_json_artifact(output_path(SEASON, "f1_head_to_head.json"), data)
+    log.info(f"✅ f1_head_to_head.json {status_label(changed)} – {len(pairings)} Paarungen, {rounds} Runden")
+
+
+def print_summary(pairings):
+    """Tabelle nur mit --verbose."""
+    log.debug(f"\n{'Team':<16} {'Paarung':<11} {'Quali':>6} {'Race':>6} {'Gap':>8} {'Punkte':>10}")
+    log.debug("-" * 64)
+    for p in pairings:
+        gap = f"{p['gap_s']:+.3f}" if p["gap_s"] is not None else "–"
+        log.debug(f"{p['team']:<16} {p['title']:<11} {p['quali_a']:>2}:{p['quali_b']:<3} "
+                  f"{p['race_a']:>2}:{p['race_b']:<3} {gap:>8} {p['points_a']:>4g}:{p['points_b']:<4g}")
+
+
+# ─────────────────────────────────────────────
+# Notion: eine Zeile pro Paarung, nur geänderte Werte schreiben
+# ─────────────────────────────────────────────
+
+def pairing_title(p):
+    return f"{p['team']}: {p['title']}"
+
+
+def pairing_key(title):
+    """
+    Reihenfolge-unabhängige Identität einer Zeile: "Team: A – B" und
+    "Team: B – A" sind dieselbe Paarung (A = wer das Quali-Duell gerade führt).
+    """
+    team, _, drivers = title.rpartition(": ")
+    return team, tuple(sorted(drivers.split(" – ")))
+
+
+def h2h_database(headers):
+    properties = {"Pairing": {"title": {}}, "Team": {"select": {}}}
+    properties.update({name: {"number": {}} for name in NUMBER_PROPERTIES})
+    properties["Points Share A"] = {"number": {"format": "percent"}}
+    return find_or_create_database(headers, H2H_DB_ID, DB_TITLE, properties,
+                                   PARENT_PAGE_ID, config_key="head_to_head_db")
+
+
+def pairing_numbers(p):
+    return {name: p[field] for name, field in NUMBER_PROPERTIES.items()}
+
+
+def sync_notion(pairings):
+    """
+    Upsert über pairing_key(). Bestehende Zeilen werden nur gepatcht, wenn
+    sich eine Zahl oder die Ausrichtung (Titel) geändert hat – nach einem
+    Wochenende also nur die Teams, deren Duelle sich verschoben haben.
+    """
+    headers = notion_headers()
+    db_id = h2h_database(headers)
+    if not db_id:
+        return False
+
+    existing = {
+        pairing_key(rec["title"]): rec
+        for rec in iter_records(db_id, headers, filter=is_not_empty(TITLE, "title"),
+                                properties=[TITLE, *NUMBER_PROPERTIES])
+    }
+    log.info(f"📋 Bestehende Paarungen in DB: {len(existing)}")
+
+    for p in pairings:
+        title   = pairing_title(p)
+        numbers = pairing_numbers(p)
+        rec     = existing.get(pairing_key(title))
+        if rec and rec["title"] == title and all(rec.get(name) == value for name, value in numbers.items()):
+            log.count("h2h", "unchanged")
+            continue
+
+        properties = {name: {"number": value} for name, value in numbers.items()}
+        if rec:
+            if rec["title"] != title:
+                # Führung im Quali-Duell gewechselt → A/B im Titel tauschen
+                properties["Pairing"] = {"title": [{"text": {"content": title}}]}
+            r = requests.patch(f"{NOTION_API}/pages/{rec['id']}", headers=headers, timeout=30,
+                               json={"properties": properties})
+            key = "updated"
+        else:
+            properties["Pairing"] = {"title": [{"text": {"content": title}}]}
+            properties["Team"]    = {"select": {"name": p["team"]}}
+            r = requests.post(f"{NOTION_API}/pages", headers=headers, timeout=30,
+                              json={"parent": {"database_id": db_id}, "properties": properties})
+            key = "created"
+        if r.ok:
+            log.count("h2h", key)
+            log.debug(f"   {'♻️ ' if rec else '✅'} {title}")
+        else:
+            log.count("h2h", "failed")
+            log.error(f"❌ Fehler {title}: {r.status_code} – {r.text}")
+
+    counts = log.summary("h2h", "📊 Head-to-Head → Notion")
+    return not counts.get("failed")
+
+
+def main(argv):
+    log.setup(argv)
+    log.info(f"🤜🤛 Teamkollegen-Duelle {YEAR}...")
+    quali, results = load_frames(offline="--offline" in argv)
+    table = head_to_head(quali, results)
+    codes, team_names = driver_labels(quali, results)
+    pairings = build_pairings(table, codes, team_names) if not table.empty else []
+    rounds = int(pd.concat([quali["round"], results["round"]]).nunique())
+    write_json(pairings, rounds)
+    print_summary(pairings)
+
+    if "--notion" not in argv:
+        return True
+    return sync_notion(pairings)
+
+
+if __name__ == "__main__":
+    if not main(sys.argv[1:]):
+        exit(1)
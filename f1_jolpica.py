@@ -0,0 +1,86 @@
+import json
+import os
+import requests
+
+# =============================================================================
+# Jolpica (Ergast) Zugriff mit Runden-Cache auf der Platte.
+# Partitioniert nach Saison: data/jolpica/<jahr>/<runde>_<art>.json
+# Finale Runden (abgeschlossene Saison oder Protestfrist vorbei) werden nie
+# erneut abgefragt – laufende Runden immer frisch von der API.
+# =============================================================================
+
+JOLPICA_URL     = "http://api.jolpi.ca/ergast/f1"
+ROUND_CACHE_DIR = os.getenv("ROUND_CACHE_DIR", "./data/jolpica")
+
+
+def base_url(year):
+    """z.B. http://api.jolpi.ca/ergast/f1/2026/ – statt 'current', damit alte Saisons stabil bleiben."""
+    return f"{JOLPICA_URL}/{year}/"
+
+
+def _cache_path(year, name):
+    return os.path.join(ROUND_CACHE_DIR, str(year), f"{name}.json")
+
+
+def _read_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def _get_cached(url, path, final):
+    """GET mit Platten-Cache. None bei Netzwerk-/HTTP-Fehler."""
+    if final:
+        cached = _read_cache(path)
+        if cached is not None:
+            return cached
+    try:
+        r = requests.get(url, timeout=10)
+    except Exception:
+        return None
+    if r.status_code != 200:
+        return None
+    races = r.json()["MRData"]["RaceTable"]["Races"]
+    if final:
+        _write_cache(path, races)
+    return races
+
+
+def get_races(year, round_num, kind="results", final=False):
+    """
+    Gibt die "Races"-Liste einer Runde zurück (kind: "results", "sprint" oder "qualifying").
+    Leere Liste → (noch) keine Ergebnisse; None → Abruf fehlgeschlagen.
+    """
+    return _get_cached(
+        f"{base_url(year)}{round_num}/{kind}.json",
+        _cache_path(year, f"{round_num:02d}_{kind}"),
+        final
+    )
+
+
+def get_schedule(year, final=False, offline=False):
+    """
+    Gibt den Rennkalender einer Saison aus Jolpica zurück (Races ohne Ergebnisse).
+    Der Kalender wird immer lokal abgelegt: offline=True liest nur die Datei,
+    bei Netzwerkfehlern wird auf den letzten bekannten Stand zurückgegriffen.
+    """
+    path = _cache_path(year, "schedule")
+    if final or offline:
+        cached = _read_cache(path)
+        if cached is not None or offline:
+            return cached
+    races = _get_cached(f"{base_url(year)}races.json?limit=100", path, final=False)
+    if races is None:
+        return _read_cache(path)
+    _write_cache(path, races)
+    return races
@@ -0,0 +1,187 @@
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import f1_log as log
+
+# =============================================================================
+# Persistenter Runden-Datensatz: die Laps jeder FastF1-Session einmal als
+# Parquet ablegen, partitioniert nach Jahr / Wochenende / Session
+# (Hive-Layout: year=2026/weekend=AUS/session=R/laps.parquet).
+#
+# Geschrieben wird von f1_session_results.py direkt nach session.load().
+# Auswertungen lesen über read_laps() nur die benötigten Spalten und
+# Partitionen (Partition Pruning + Predicate Pushdown in pyarrow) – ohne
+# FastF1-Session erneut zu laden.
+#
+#   python f1_laps.py info                       # Partitionen und Zeilen
+#   python f1_laps.py fastest 2026 AUS Q         # Klassifikation aus dem Datensatz
+# =============================================================================
+
+LAPS_DIR = os.getenv("LAP_DATASET_DIR", "./data/laps")
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("year", pa.int16()), ("weekend", pa.string()), ("session", pa.string())]),
+    flavor="hive",
+)
+
+# Zeiten als Sekunden (float64) statt timedelta – direkt für NumPy nutzbar.
+# "Time" = Session-Zeit am Rundenende (Abstände zwischen Fahrern, f1_stints.py)
+TIME_COLUMNS = ["LapTime", "Sector1Time", "Sector2Time", "Sector3Time", "Time"]
+
+SCHEMA = pa.schema([
+    ("Driver",         pa.dictionary(pa.int8(), pa.string())),
+    ("DriverNumber",   pa.string()),
+    ("Team",           pa.dictionary(pa.int8(), pa.string())),
+    ("LapNumber",      pa.int16()),
+    ("Stint",          pa.int8()),
+    ("Compound",       pa.dictionary(pa.int8(), pa.string())),
+    ("TyreLife",       pa.float32()),
+    ("FreshTyre",      pa.bool_()),
+    ("LapTime",        pa.float64()),
+    ("Sector1Time",    pa.float64()),
+    ("Sector2Time",    pa.float64()),
+    ("Sector3Time",    pa.float64()),
+    ("Time",           pa.float64()),
+    ("PitIn",          pa.bool_()),
+    ("PitOut",         pa.bool_()),
+    ("Position",       pa.int8()),
+    ("TrackStatus",    pa.string()),
+    ("IsAccurate",     pa.bool_()),
+    ("IsPersonalBest", pa.bool_()),
+    ("Deleted",        pa.bool_()),
+])
+
+
+def partition_dir(year, weekend, session):
+    return os.path.join(LAPS_DIR, f"year={year}", f"weekend={weekend}", f"session={session}")
+
+
+def has_session(year, weekend, session):
+    return os.path.exists(os.path.join(partition_dir(year, weekend, session), "laps.parquet"))
+
+
+def laps_table(laps):
+    """FastF1-Laps → Arrow-Tabelle mit festem Schema (fehlende Spalten → null)."""
+    df = pd.DataFrame(index=laps.index)
+    for name in SCHEMA.names:
+        if name in TIME_COLUMNS:
+            df[name] = laps[name].dt.total_seconds() if name in laps else None
+        elif name == "PitIn":
+            df[name] = laps["PitInTime"].notna() if "PitInTime" in laps else False
+        elif name == "PitOut":
+            df[name] = laps["PitOutTime"].notna() if "PitOutTime" in laps else False
+        elif name in laps:
+            df[name] = laps[name]
+        else:
+            df[name] = None
+
+    # Nullable Ganzzahlen und Flags vor der Konvertierung vereinheitlichen
+    for name in ("LapNumber", "Stint", "Position"):
+        df[name] = pd.to_numeric(df[name], errors="coerce").astype("Int64")
+    for name in ("FreshTyre", "IsAccurate", "IsPersonalBest", "Deleted"):
+        df[name] = df[name].astype("boolean")
+    for name in ("Driver", "DriverNumber", "Team", "Compound", "TrackStatus"):
+        df[name] = df[name].astype("string")
+    return pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+
+
+def write_session_laps(laps, year, weekend, session, overwrite=False):
+    """
+    Schreibt die Laps einer Session in ihre Partition (atomar über temp + rename).
+    Laps ändern sich nach der Session nicht → vorhandene Partitionen werden
+    übersprungen. Rückgabe: Anzahl geschriebener Runden (0 = übersprungen).
+    """
+    if not overwrite and has_session(year, weekend, session):
+        return 0
+    table = laps_table(laps)
+    directory = partition_dir(year, weekend, session)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "laps.parquet")
+    tmp  = path + ".tmp"
+    pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, path)
+    return table.num_rows
+
+
+# ─────────────────────────────────────────────
+# Abfragen
+# ─────────────────────────────────────────────
+
+def dataset():
+    # Festes Schema: Partitionen aus älteren Läufen ohne neue Spalten → null
+    schema = pa.schema(list(SCHEMA) + list(PARTITIONING.schema))
+    return ds.dataset(LAPS_DIR, format="parquet", partitioning=PARTITIONING, schema=schema)
+
+
+def _eq_or_in(field, value):
+    if isinstance(value, (list, tuple, set)):
+        return ds.field(field).isin(list(value))
+    return ds.field(field) == value
+
+
+def read_laps(columns=None, year=None, weekend=None, session=None, drivers=None, where=None):
+    """
+    Liest Runden als DataFrame – nur die angefragten Spalten.
+    year/weekend/session (Wert oder Liste) wählen Partitionen aus, ohne andere
+    Dateien zu öffnen; drivers und where (pyarrow-Ausdruck, z.B.
+    ds.field("Compound") == "SOFT") werden als Prädikat an den Scan übergeben.
+    Partitionsspalten sind im Ergebnis enthalten, sofern angefragt.
+    """
+    if not os.path.isdir(LAPS_DIR):
+        return pd.DataFrame(columns=columns or SCHEMA.names)
+
+    expr = None
+    for field, value in (("year", year), ("weekend", weekend), ("session", session), ("Driver", drivers)):
+        if value is not None:
+            cond = _eq_or_in(field, value)
+            expr = cond if expr is None else expr & cond
+    if where is not None:
+        expr = where if expr is None else expr & where
+
+    table = dataset().to_table(columns=columns, filter=expr)
+    return table.to_pandas()
+
+
+def session_laps(year, weekend, session, columns=None):
+    return read_laps(columns=columns, year=year, weekend=weekend, session=session)
+
+
+def fastest_laps(year, weekend, session):
+    """Schnellste Runde je Fahrer, sortiert – Klassifikation wie in FP, ohne FastF1."""
+    laps = session_laps(year, weekend, session, columns=["Driver", "LapTime", "Deleted"])
+    laps = laps[laps["LapTime"].notna() & ~laps["Deleted"].fillna(False).astype(bool)]
+    best = laps.groupby("Driver", observed=True)["LapTime"].min()
+    return best.sort_values().reset_index()
+
+
+def main(argv):
+    log.setup(argv)
+    if argv[:1] == ["info"]:
+        if not os.path.isdir(LAPS_DIR):
+            log.info(f"💤 Kein Runden-Datensatz unter {LAPS_DIR}")
+            return True
+        parts = read_laps(columns=["year", "weekend", "session"])
+        counts = parts.groupby(["year", "weekend", "session"], observed=True).size()
+        log.info(f"🗂️  {LAPS_DIR}: {len(counts)} Sessions, {int(counts.sum()):,} Runden")
+        for (year, weekend, session), n in counts.items():
+            log.info(f"   {year} {weekend:<4} {session:<4} {n:5d} Runden")
+        return True
+
+    if argv[:1] == ["fastest"] and len(argv) >= 4:
+        best = fastest_laps(int(argv[1]), argv[2], argv[3])
+        for pos, row in enumerate(best.itertuples(), 1):
+            log.info(f"{pos:2d}. {row.Driver:<4} {row.LapTime:8.3f} s")
+        return not best.empty
+
+    print("Verwendung: python f1_laps.py info | fastest <jahr> <wochenende> <session>")
+    return False
+
+
+if __name__ == "__main__":
+    if not main(sys.argv[1:]):
+        exit(1)
@@ -0,0 +1,112 @@
+import json
+import os
+import sys
+import traceback
+from datetime import datetime, timezone
+
+# =============================================================================
+# Einheitliches Log für alle Skripte: Levels, kompakter Text (Default) oder
+# JSON Lines, und Zähler pro Stage statt einer Zeile pro Datensatz.
+#
+#   log.info("📋 Lade Fahrer-Datenbank...")
+#   log.count("Race", "updated")                  # pro Zeile nur zählen
+#   log.debug("🔄 Aktualisiert", entry=title)     # Einzelzeile nur mit --verbose
+#   log.summary("Race", "📊 Race fertig")         # → "📊 Race fertig updated=19 created=3"
+#
+# Steuerung (Argumente jedes Skripts oder Umgebung):
+#   --quiet   / F1_LOG_LEVEL=warning   nur Warnungen und Fehler
+#   --verbose / F1_LOG_LEVEL=debug     inkl. Einzelzeilen
+#   --log-json / F1_LOG_FORMAT=json    eine JSON-Zeile pro Ereignis
+# =============================================================================
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+LOG_LEVEL  = os.getenv("F1_LOG_LEVEL", "info").strip().lower()
+LOG_FORMAT = os.getenv("F1_LOG_FORMAT", "text").strip().lower()
+
+_config   = {"level": LEVELS.get(LOG_LEVEL, LEVELS["info"]), "json": LOG_FORMAT == "json"}
+_counters = {}
+
+
+def setup(argv=()):
+    """Übernimmt --quiet/--verbose/--log-json aus den Skript-Argumenten."""
+    if "--verbose" in argv:
+        _config["level"] = LEVELS["debug"]
+    if "--quiet" in argv:
+        _config["level"] = LEVELS["warning"]
+    if "--log-json" in argv:
+        _config["json"] = True
+
+
+def enabled(level):
+    return LEVELS[level] >= _config["level"]
+
+
+def _emit(level, msg, fields):
+    if not enabled(level):
+        return
+    if _config["json"]:
+        record = {
+            "ts":    datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "level": level,
+            "msg":   msg.strip(),
+            **fields,
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str)
+    else:
+        line = msg + "".join(f" {k}={v}" for k, v in fields.items())
+    sys.stdout.write(line + "\n")
+    # Fehler sofort sichtbar, der Rest darf gepuffert werden
+    if LEVELS[level] >= LEVELS["warning"]:
+        sys.stdout.flush()
+
+
+def debug(msg, **fields):
+    _emit("debug", msg, fields)
+
+
+def info(msg, **fields):
+    _emit("info", msg, fields)
+
+
+def warning(msg, **fields):
+    _emit("warning", msg, fields)
+
+
+def error(msg, **fields):
+    _emit("error", msg, fields)
+
+
+def exception(msg, **fields):
+    """Fehler mit Traceback (Text: unter der Meldung, JSON: Feld "traceback")."""
+    tb = traceback.format_exc()
+    if _config["json"]:
+        _emit("error", msg, {**fields, "traceback": tb})
+    else:
+        _emit("error", msg + "\n" + tb.rstrip(), fields)
+
+
+def banner(title):
+    """Abschnittsüberschrift – im Text-Modus eingerahmt, in JSON eine normale Zeile."""
+    if _config["json"]:
+        info(title)
+    else:
+        info(f"\n{'=' * 60}\n{title}\n{'=' * 60}")
+
+
+# ─────────────────────────────────────────────
+# Zähler und Stage-Zusammenfassungen
+# ─────────────────────────────────────────────
+
+def count(stage, key, n=1):
+    counters = _counters.setdefault(stage, {})
+    counters[key] = counters.get(key, 0) + n
+
+
+def summary(stage, msg=None, level="info", **fields):
+    """Eine Zeile mit allen Zählern der Stage; die Zähler werden danach zurückgesetzt."""
+    counters = _counters.pop(stage, {})
+    prefix   = {"stage": stage} if _config["json"] else {}
+    _emit(level, msg or f"📊 {stage}", {**prefix, **counters, **fields})
+    return counters
+
@@ -0,0 +1,302 @@
+import asyncio
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+
+import f1_log as log
+
+# =============================================================================
+# Notion Query-Builder – Filter und Property-Projektion serverseitig statt
+# "alles laden, in Python filtern".
+#
+#   pages = query_database(db_id, HEADERS,
+#                          filter=is_not_empty("Prediction", "number"),
+#                          properties=["Prediction"])
+#
+# Für große DBs (Session Results: tausende Zeilen pro Saison) streamen statt
+# sammeln – pro Seite nur ein schlankes Record, die nächste Seite wird
+# geladen, während die aktuelle verarbeitet wird:
+#
+#   for rec in iter_records(db_id, HEADERS, properties=["Prediction"]):
+#       rec["id"], rec["title"], rec["Prediction"]
+# =============================================================================
+
+NOTION_API = "https://api.notion.com/v1"
+
+# Property-IDs ändern sich nicht, wenn eine Property umbenannt wird – Namen schon.
+# Deshalb pro Prozess einmal das DB-Schema laden und Namen → IDs auflösen.
+_property_id_cache = {}
+
+
+# Filter und Projektion akzeptieren Property-Namen oder -IDs; die Title-Property
+# hat immer die ID "title" – unabhängig davon, wie sie in der DB benannt ist.
+TITLE = "title"
+
+
+# ─────────────────────────────────────────────
+# Filter-Bausteine
+# ─────────────────────────────────────────────
+
+def is_not_empty(prop, prop_type):
+    """z.B. is_not_empty("Prediction", "number")"""
+    return {"property": prop, prop_type: {"is_not_empty": True}}
+
+
+def title_equals(prop, value):
+    return {"property": prop, "title": {"equals": value}}
+
+
+def select_equals(prop, value):
+    return {"property": prop, "select": {"equals": value}}
+
+
+def relation_contains(prop, page_id):
+    return {"property": prop, "relation": {"contains": page_id}}
+
+
+def edited_after(iso_timestamp, inclusive=False):
+    """Seiten, die nach `iso_timestamp` angelegt/bearbeitet wurden."""
+    op = "on_or_after" if inclusive else "after"
+    return {"timestamp": "last_edited_time", "last_edited_time": {op: iso_timestamp}}
+
+
+def all_of(*filters):
+    filters = [f for f in filters if f]
+    return filters[0] if len(filters) == 1 else {"and": filters}
+
+
+def any_of(*filters):
+    filters = [f for f in filters if f]
+    return filters[0] if len(filters) == 1 else {"or": filters}
+
+
+# ─────────────────────────────────────────────
+# Projektion (filter_properties)
+# ─────────────────────────────────────────────
+
+def _schema_property_ids(schema):
+    # IDs kommen URL-kodiert zurück – requests/httpx kodieren die Query-Parameter selbst
+    return {name: unquote(prop["id"]) for name, prop in schema.get("properties", {}).items()}
+
+
+def _match_property_ids(ids, names):
+    return [ids.get(name, TITLE if name == TITLE else None) for name in names
+            if name in ids or name == TITLE]
+
+
+def resolve_property_ids(db_id, names, headers):
+    """
+    Übersetzt Property-Namen in Property-IDs für `filter_properties`.
+    Unbekannte Namen werden ignoriert (z.B. alternative Title-Namen).
+    """
+    if all(name == TITLE for name in names):
+        return list(names)  # kein Schema-Request nötig
+    if db_id not in _property_id_cache:
+        r = requests.get(f"{NOTION_API}/databases/{db_id}", headers=headers, timeout=30)
+        r.raise_for_status()
+        _property_id_cache[db_id] = _schema_property_ids(r.json())
+    return _match_property_ids(_property_id_cache[db_id], names)
+
+
+def build_query(filter=None, sorts=None, page_size=100, start_cursor=None):
+    """Baut den JSON-Body für POST /databases/{id}/query."""
+    body = {"page_size": page_size}
+    if filter:
+        body["filter"] = filter
+    if sorts:
+        body["sorts"] = sorts
+    if start_cursor:
+        body["start_cursor"] = start_cursor
+    return body
+
+
+def _projection_params(db_id, headers, properties):
+    if properties is None:
+        return None
+    property_ids = resolve_property_ids(db_id, properties, headers) if properties else []
+    # Leere Projektion wäre "alle Properties" → auf den Titel beschränken
+    return [("filter_properties", pid) for pid in (property_ids or [TITLE])]
+
+
+def iter_pages(db_id, headers, filter=None, properties=None, sorts=None,
+               page_size=100, prefetch=True):
+    """
+    Generator über alle Seiten-Objekte einer gefilterten Abfrage.
+    Es liegt immer nur ein Batch (page_size Seiten) im Speicher. Mit prefetch
+    läuft der Request für den nächsten Cursor in einem Hintergrund-Thread,
+    während der Aufrufer den aktuellen Batch verarbeitet.
+    """
+    params = _projection_params(db_id, headers, properties)
+    url    = f"{NOTION_API}/databases/{db_id}/query"
+
+    def fetch(cursor):
+        body = build_query(filter=filter, sorts=sorts, page_size=page_size, start_cursor=cursor)
+        r = requests.post(url, headers=headers, params=params, json=body, timeout=30)
+        r.raise_for_status()
+        return r.json()
+
+    pool = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    pending = None
+    try:
+        result = fetch(None)
+        while True:
+            cursor = result.get("next_cursor") if result.get("has_more") else None
+            if cursor and pool:
+                pending = pool.submit(fetch, cursor)
+            batch, result = result.get("results", []), None
+            yield from batch
+            del batch
+            if not cursor:
+                return
+            result = pending.result() if pending else fetch(cursor)
+            pending = None
+    finally:
+        # Abbruch durch den Aufrufer (break, max_results) – laufenden Prefetch verwerfen
+        if pending:
+            pending.cancel()
+        if pool:
+            pool.shutdown(wait=False)
+
+
+def query_database(db_id, headers, filter=None, properties=None, sorts=None,
+                   page_size=100, max_results=None):
+    """
+    Paginierte Datenbank-Abfrage mit serverseitigem Filter, Ergebnis als Liste.
+
+    properties:  Liste von Property-Namen – nur diese werden von Notion geliefert.
+                 None → alle Properties. Archivierte Seiten liefert der Query-
+                 Endpoint ohnehin nicht.
+    max_results: Abbruch nach so vielen Ergebnissen (z.B. 1 für Existenz-Checks).
+    """
+    pages = []
+    # Bei max_results lohnt kein Prefetch – meist reicht die erste Seite
+    for page in iter_pages(db_id, headers, filter=filter, properties=properties,
+                           sorts=sorts, page_size=page_size, prefetch=max_results is None):
+        pages.append(page)
+        if max_results is not None and len(pages) >= max_results:
+            break
+    return pages
+
+
+# ─────────────────────────────────────────────
+# Datenbanken finden bzw. anlegen
+# ─────────────────────────────────────────────
+
+def find_or_create_database(headers, db_id, title, properties, parent, config_key="db"):
+    """
+    Feste ID aus seasons/<jahr>.json, sonst Suche per Titel (Archiv-Saisons
+    ohne feste ID), sonst neue DB unter `parent` mit `properties` als Schema.
+    config_key nennt nur den Schlüssel in den Log-Hinweisen. None bei Fehler.
+    """
+    if db_id:
+        return db_id
+
+    r = requests.post(f"{NOTION_API}/search", headers=headers, timeout=30,
+                      json={"query": title, "filter": {"value": "database", "property": "object"}})
+    if r.ok:
+        for db in r.json().get("results", []):
+            full_title = "".join(b.get("text", {}).get("content", "") for b in db.get("title", []))
+            if title in full_title:
+                log.info(f"🔎 Gefunden per Suche: {full_title}")
+                return db["id"]
+
+    if not parent:
+        log.warning(f"⚠️ Season-Datei enthält weder {config_key} noch constructors_parent_page")
+        return None
+
+    r = requests.post(f"{NOTION_API}/databases", headers=headers, timeout=30, json={
+        "parent": {"type": "page_id", "page_id": parent},
+        "title": [{"type": "text", "text": {"content": title}}],
+        "properties": properties, "is_inline": False,
+    })
+    if not r.ok:
+        log.error(f"❌ DB-Erstellung fehlgeschlagen: {r.status_code} – {r.text}")
+        return None
+    log.info(f"✅ Neue DB erstellt: {title} – als {config_key} in die Season-Datei eintragen")
+    return r.json()["id"]
+
+
+# ─────────────────────────────────────────────
+# Schlanke Records statt kompletter Seiten-JSONs
+# ─────────────────────────────────────────────
+
+def _plain_text(rich):
+    return "".join(t.get("plain_text") or t.get("text", {}).get("content", "") for t in rich).strip()
+
+
+def property_value(prop):
+    """Notion-Property → einfacher Python-Wert (Text, Zahl, Name, ID-Liste, ...)."""
+    if not prop:
+        return None
+    kind  = prop.get("type")
+    value = prop.get(kind)
+    if kind in ("title", "rich_text"):
+        return _plain_text(value or [])
+    if kind in ("select", "status"):
+        return value["name"] if value else None
+    if kind == "multi_select":
+        return [v["name"] for v in value or []]
+    if kind == "relation":
+        return [v["id"] for v in value or []]
+    if kind == "date":
+        return value["start"] if value else None
+    if kind == "formula":
+        return value.get(value.get("type")) if value else None
+    return value
+
+
+def to_record(page, properties=None):
+    """
+    {"id", "title", <Property>: Wert} – title ist der Text der Title-Property,
+    egal wie sie heißt. properties=None → alle gelieferten Properties.
+    """
+    props  = page.get("properties", {})
+    record = {"id": page["id"], "title": ""}
+    for name, prop in props.items():
+        if prop.get("type") == "title":
+            record["title"] = property_value(prop)
+        if properties is None or name in properties:
+            record[name] = property_value(prop)
+    return record
+
+
+def iter_records(db_id, headers, filter=None, properties=None, sorts=None,
+                 page_size=100, prefetch=True):
+    """Wie iter_pages, liefert aber pro Seite nur ein schlankes Record (to_record)."""
+    for page in iter_pages(db_id, headers, filter=filter, properties=properties,
+                           sorts=sorts, page_size=page_size, prefetch=prefetch):
+        yield to_record(page, properties)
+
+
+async def aiter_records(notion, db_id, filter=None, properties=None, sorts=None, page_size=100):
+    """
+    Async-Variante für notion_client.AsyncClient: der nächste Cursor wird als
+    Task geladen, während der aktuelle Batch verarbeitet wird.
+    """
+    query = None
+    if properties is not None:
+        property_ids = [name for name in properties if name == TITLE]
+        if any(name != TITLE for name in properties):
+            if db_id not in _property_id_cache:
+                schema = await notion.request(path=f"databases/{db_id}", method="GET")
+                _property_id_cache[db_id] = _schema_property_ids(schema)
+            property_ids = _match_property_ids(_property_id_cache[db_id], properties)
+        query = {"filter_properties": property_ids or [TITLE]}
+
+    def fetch(cursor):
+        body = build_query(filter=filter, sorts=sorts, page_size=page_size, start_cursor=cursor)
+        return asyncio.ensure_future(
+            notion.request(path=f"databases/{db_id}/query", method="POST", query=query, body=body)
+        )
+
+    pending = fetch(None)
+    try:
+        while pending:
+            result  = await pending
+            cursor  = result.get("next_cursor") if result.get("has_more") else None
+            pending = fetch(cursor) if cursor else None
+            for page in result.get("results", []):
+                yield to_record(page, properties)
+    finally:
+        if pending:
+            pending.cancel()
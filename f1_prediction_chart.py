@@ -1,11 +1,18 @@
-import requests
 import math
 import json
 import os
+import sys
+
+import f1_log as log
+from f1_artifacts import write_json_artifact, status_label
+from f1_notion_query import iter_records, is_not_empty
+from f1_seasons import load_season, output_path
+
+SEASON = load_season()
 
 # Notion API Config
 NOTION_TOKEN = os.environ["NOTION_TOKEN"]
-DATABASE_ID = "3166839379ed81d7bd2de7ed38537d08"
+DATABASE_ID = SEASON["notion"]["predictions_db"]
 HEADERS = {
     "Authorization": f"Bearer {NOTION_TOKEN}",
     "Content-Type": "application/json",
@@ -14,31 +21,13 @@ HEADERS = {
 
 # Schritt 1: Datenbank-Einträge aus Notion abrufen
 def get_notion_predictions():
-    url = f"https://api.notion.com/v1/databases/{DATABASE_ID}/query"
-    predictions = []
-    has_more = True
-    next_cursor = None
-
-    while has_more:
-        payload = {}
-        if next_cursor:
-            payload["start_cursor"] = next_cursor
-
-        res = requests.post(url, headers=HEADERS, json=payload)
-        data = res.json()
-
-        for page in data.get("results", []):
-            
-           # print(json.dumps(page["properties"], indent=2))
-
-            prediction_val = page["properties"]["Prediction"].get("number")
-            if prediction_val is not None:  # nur gefahrene Rennen zählen
-                predictions.append(prediction_val)
-
-        has_more = data.get("has_more", False)
-        next_cursor = data.get("next_cursor")
-
-    return predictions
+    # Nur gefahrene Rennen (Prediction gesetzt) und nur die Prediction-Property
+    records = iter_records(
+        DATABASE_ID, HEADERS,
+        filter=is_not_empty("Prediction", "number"),
+        properties=["Prediction"]
+    )
+    return [rec["Prediction"] for rec in records]
 
 # Schritt 2: Accuracy berechnen
 def calculate_accuracy(predictions):
@@ -49,108 +38,25 @@ def calculate_accuracy(predictions):
     accuracy = sum_predictions / (3 * count_races)
     return accuracy
 
-# Schritt 3: HTML mit Chart.js generieren
-def generate_html(accuracy, correct_count, incorrect_count):
-    percent = round(accuracy * 100, 1)
-    ring_color = "#cd4945"
-    background_ring = "rgba(255,255,255,0.1)"
-    text_color = "#ffffff"
-
-    html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-  <meta charset="UTF-8">
-  <title>Prediction Accuracy</title>
-  <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-  <style>
-    body {{
-      margin: 0;
-      background-color: #191919;
-    }}
-    #chartContainer {{
-      width: 300px;
-      height: 300px;
-      display: flex;
-      justify-content: center;
-      align-items: center;
-    }}
-    canvas {{
-      background-color: #191919;
-    }}
-  </style>
-</head>
-<body>
-  <div id="chartContainer">
-    <canvas id="accuracyChart"></canvas>
-  </div>
-  <script>
-    const accuracy = {percent};
-    const correct = {correct_count};
-    const incorrect = {incorrect_count};
-    const ctx = document.getElementById('accuracyChart').getContext('2d');
-
-    new Chart(ctx, {{
-      type: 'doughnut',
-      data: {{
-        labels: ['Correct', 'Incorrect'],
-        datasets: [{{
-          data: [correct, incorrect],
-          backgroundColor: ['{ring_color}', '{background_ring}'],
-          borderWidth: 0
-        }}]
-      }},
-      options: {{
-        cutout: '75%',
-        responsive: false,
-        plugins: {{
-          legend: {{ display: false }},
-          tooltip: {{
-            enabled: true,
-            callbacks: {{
-              label: function(context) {{
-                let label = context.label || '';
-                let value = context.parsed;
-                return label + ': ' + value;
-              }}
-            }}
-          }}
-        }}
-      }},
-      plugins: [{{
-        id: 'centerText',
-        beforeDraw: (chart) => {{
-          const {{ ctx, chartArea: {{ width, height }} }} = chart;
-          ctx.save();
-          // "Predictions" oben
-          ctx.font = '16px Arial';
-          ctx.fillStyle = '{text_color}';
-          ctx.textAlign = 'center';
-          ctx.textBaseline = 'middle';
-          ctx.fillText('Predictions', width / 2, height / 2 - 20);
-
-          // Prozentzahl darunter
-          ctx.font = 'bold 32px Arial';
-          ctx.fillStyle = '{text_color}';
-          ctx.fillText(accuracy + '%', width / 2, height / 2 + 10);
-        }}
-      }}]
-    }});
-  </script>
-</body>
-</html>
-"""
-    with open("f1_prediction_chart.html", "w", encoding="utf-8") as f:
-        f.write(html_content)
+# Schritt 3: Daten für das Widget schreiben (f1_prediction_chart.html lädt sie,
+# f1_widgets.py baut daraus die statische Version mit eingebetteten Daten)
+def write_json(accuracy, correct_count, incorrect_count):
+    data = {
+        "accuracy":  round(accuracy * 100, 1),
+        "correct":   correct_count,
+        "incorrect": incorrect_count
+    }
+    return write_json_artifact(output_path(SEASON, "f1_prediction_chart.json"), data)
 
 
 # Hauptlogik
 if __name__ == "__main__":
+    log.setup(sys.argv[1:])
     predictions = get_notion_predictions()
     accuracy = calculate_accuracy(predictions)
 
     correct_count = int(sum(predictions))
     incorrect_count = int(len(predictions) * 3 - correct_count)
 
-    generate_html(accuracy, correct_count, incorrect_count)
-    print(f"✅ Prediction Accuracy Chart erstellt ({round(accuracy*100, 1)}%) → f1_prediction_chart.html")
+    changed = write_json(accuracy, correct_count, incorrect_count)
+    log.info(f"✅ Prediction Accuracy {round(accuracy*100, 1)}% → f1_prediction_chart.json {status_label(changed)}")
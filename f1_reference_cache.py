@@ -0,0 +1,103 @@
+import json
+import os
+from datetime import datetime, timezone
+
+import f1_log as log
+
+# =============================================================================
+# Lokaler Snapshot der Notion-Referenzdaten (Drivers, Weekends, Constructors,
+# Teams) – diese ändern sich höchstens ein paar Mal pro Saison, wurden aber
+# bei jedem Lauf komplett neu paginiert.
+#
+# Ablauf pro Eintrag:
+#   1. Snapshot jünger als die TTL           → 0 Requests
+#   2. TTL abgelaufen, DB unverändert         → 1 Request (last_edited_time-Filter)
+#   3. DB seit dem Snapshot bearbeitet/fehlt  → kompletter Reload wie bisher
+# =============================================================================
+
+CACHE_PATH = os.getenv("REFERENCE_CACHE_PATH", "./notion_cache/reference_maps.json")
+
+# Nach Ablauf der TTL wird per günstiger Filter-Abfrage auf Änderungen geprüft
+CACHE_TTL_HOURS = float(os.getenv("REFERENCE_CACHE_TTL_HOURS", "24"))
+
+# REFRESH_REFERENCE_CACHE=1 erzwingt einen kompletten Reload (z.B. nach dem
+# Archivieren von Seiten – das taucht im last_edited_time-Filter nicht auf)
+FORCE_REFRESH = os.getenv("REFRESH_REFERENCE_CACHE", "").strip() in ("1", "true", "yes")
+
+# 2: Teamnamen als eigener Eintrag "teams" statt im Eintrag "drivers"
+SNAPSHOT_VERSION = 2
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _parse(ts):
+    return datetime.fromisoformat(ts) if ts else None
+
+
+def load_snapshot(path=CACHE_PATH):
+    """Lädt den Snapshot von der Platte. Fehlend/kaputt → leerer Snapshot."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if snapshot.get("version") == SNAPSHOT_VERSION:
+            return snapshot
+    except (OSError, ValueError):
+        pass
+    return {"version": SNAPSHOT_VERSION, "entries": {}}
+
+
+def save_snapshot(snapshot, path=CACHE_PATH):
+    """Schreibt den Snapshot atomar (temp + rename)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def cached_map(snapshot, name, db_id, loader, changed_since,
+               ttl_hours=CACHE_TTL_HOURS, force=FORCE_REFRESH):
+    """
+    Gibt die Map `name` zurück – aus dem Snapshot, wenn noch gültig, sonst über `loader()`.
+
+    loader:        () → Map (JSON-serialisierbar), lädt die Daten komplett aus Notion
+    changed_since: (db_id, iso_timestamp) → bool, True wenn seitdem Seiten bearbeitet wurden
+    """
+    entries = snapshot.setdefault("entries", {})
+    entry   = entries.get(name)
+    now     = _now()
+
+    if entry and entry.get("db_id") == db_id and not force:
+        checked_at = _parse(entry.get("checked_at"))
+        age_hours  = (now - checked_at).total_seconds() / 3600 if checked_at else None
+
+        if age_hours is not None and age_hours < ttl_hours:
+            log.info(f"💾 {name}: Snapshot verwendet (Alter {age_hours:.1f}h < TTL {ttl_hours:g}h)")
+            return entry["data"]
+
+        try:
+            changed = changed_since(db_id, entry["fetched_at"])
+        except Exception as e:
+            log.warning(f"   ⚠️ Freshness-Check für {name} fehlgeschlagen: {e} → Reload")
+            changed = True
+
+        if not changed:
+            entry["checked_at"] = now.isoformat()
+            log.info(f"💾 {name}: Snapshot unverändert seit {entry['fetched_at']} → weiterverwendet")
+            return entry["data"]
+
+        log.info(f"🔄 {name}: DB seit dem Snapshot bearbeitet → Reload")
+
+    data = loader()
+    # Auf die Minute abrunden: Notion speichert last_edited_time nur minutengenau,
+    # Änderungen während des Ladens werden so beim nächsten Check sicher erkannt.
+    stamp = now.replace(second=0, microsecond=0).isoformat()
+    entries[name] = {
+        "db_id":      db_id,
+        "fetched_at": stamp,
+        "checked_at": now.isoformat(),
+        "data":       data,
+    }
+    return data
@@ -0,0 +1,228 @@
+import io
+import json
+import os
+import sys
+
+import matplotlib
+matplotlib.use("Agg")  # kein Display in CI – vor pyplot/Figure-Import setzen
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import f1_log as log
+from f1_artifacts import content_hash, dump_json, write_artifact, write_json_artifact
+from f1_seasons import load_season, output_path
+
+# =============================================================================
+# Serverseitiges Rendering der Charts als PNG/SVG (matplotlib, Agg-Backend) –
+# z.B. für Vorschaubilder oder Embeds ohne JavaScript.
+#
+# Datenbasis wie bei den Chart.js-Widgets: build_cumulative_standings() der
+# beiden Chart-Skripte (ein gemeinsamer Ergebnis-DataFrame) und
+# f1_prediction_chart.json. Alle Charts in einem Prozess auf einer
+# wiederverwendeten Figure; ein Chart wird nur neu gerendert, wenn sich der
+# Hash seiner Daten geändert hat (Index: public/.render_cache.json).
+#
+#   python f1_render.py             # alle Charts → public/*.png / *.svg
+#   python f1_render.py --offline   # nur lokaler Season Store
+#   python f1_render.py --force     # Cache ignorieren
+#
+# Speed-Trace-Vergleiche (kind "speed_trace") rendert f1_telemetry.py über
+# render_all() nach demselben Schema.
+# =============================================================================
+
+SEASON = load_season()
+YEAR   = SEASON["year"]
+
+# Neben den gebauten Widgets (f1_widgets.py)
+RENDER_DIR   = output_path(SEASON, "public")
+RENDER_CACHE = os.path.join(RENDER_DIR, ".render_cache.json")
+
+# Bei Layout-Änderungen erhöhen → alle Charts werden neu gerendert
+RENDER_VERSION = 1
+
+FORMATS = ("png", "svg")
+
+BACKGROUND = "#191919"
+GRID_COLOR = "#333333"
+TEXT_COLOR = "#ffffff"
+TICK_COLOR = "#aaaaaa"
+
+# Deterministische SVG-IDs und keine Zeitstempel → unveränderte Charts ergeben
+# identische Dateien (siehe f1_artifacts.py)
+matplotlib.rcParams["svg.hashsalt"] = "f1-render"
+SAVE_METADATA = {"png": {"Software": None}, "svg": {"Date": None, "Creator": None}}
+
+
+# ─────────────────────────────────────────────
+# Chart-Daten
+# ─────────────────────────────────────────────
+
+def line_chart_payload(title, entities, cumulative, total, label_key):
+    """Serien in Tabellenreihenfolge – dieselbe Sortierung wie die JSON-Charts."""
+    order = sorted(range(len(entities)), key=lambda i: -int(total[i]))
+    return {
+        "kind":   "line",
+        "title":  title,
+        "labels": SEASON["race_locations"],
+        "series": [
+            {"title": entities[i][label_key], "color": entities[i]["color"],
+             "data": [int(v) for v in cumulative[i]]}
+            for i in order
+        ],
+    }
+
+
+def collect_payloads(offline=False):
+    """Alle Chart-Daten aus einem gemeinsamen Ergebnis-DataFrame (ein Ladevorgang)."""
+    import f1_constructors_chart
+    import f1_drivers_chart
+    from f1_standings import load_results_frame
+
+    frame = load_results_frame(SEASON, f1_drivers_chart.ENTITIES, offline=offline)
+    payloads = {
+        "f1_drivers_chart": line_chart_payload(
+            f"Drivers Championship {YEAR}",
+            *f1_drivers_chart.build_cumulative_standings(frame), "api_name"),
+        "f1_constructors_chart": line_chart_payload(
+            f"Constructors Championship {YEAR}",
+            *f1_constructors_chart.build_cumulative_standings(frame), "name"),
+    }
+
+    prediction_path = output_path(SEASON, "f1_prediction_chart.json")
+    if os.path.exists(prediction_path):
+        with open(prediction_path, encoding="utf-8") as f:
+            payloads["f1_prediction_chart"] = {"kind": "doughnut", **json.load(f)}
+    return payloads
+
+
+# ─────────────────────────────────────────────
+# Zeichnen (eine Figure für alle Charts)
+# ─────────────────────────────────────────────
+
+def _style_axes(ax):
+    ax.set_facecolor(BACKGROUND)
+    ax.grid(color=GRID_COLOR, linewidth=0.8)
+    ax.tick_params(colors=TICK_COLOR, labelsize=9)
+    for spine in ax.spines.values():
+        spine.set_color(GRID_COLOR)
+
+
+def draw_line(fig, chart):
+    fig.set_size_inches(12, 6.5)
+    ax = fig.add_subplot()
+    _style_axes(ax)
+    x = range(len(chart["labels"]))
+    for s in chart["series"]:
+        ax.plot(x, s["data"], color=s["color"], linewidth=2, marker="o", markersize=2.5,
+                label=s["title"])
+    ax.set_xticks(list(x), chart["labels"], rotation=45, ha="right")
+    ax.set_title(chart["title"], color=TEXT_COLOR, fontsize=14, loc="left")
+    ax.legend(loc="upper left", bbox_to_anchor=(1.01, 1), frameon=False,
+              labelcolor=TEXT_COLOR, fontsize=9)
+    fig.tight_layout()
+
+
+def draw_doughnut(fig, chart):
+    fig.set_size_inches(4, 4)
+    ax = fig.add_subplot()
+    ax.set_facecolor(BACKGROUND)
+    ax.pie([chart["correct"], chart["incorrect"]], colors=["#cd4945", (1, 1, 1, 0.1)],
+           startangle=90, counterclock=False, wedgeprops={"width": 0.25})
+    ax.text(0, 0.18, "Predictions", ha="center", va="center", color=TEXT_COLOR, fontsize=13)
+    ax.text(0, -0.1, f"{chart['accuracy']}%", ha="center", va="center", color=TEXT_COLOR,
+            fontsize=26, fontweight="bold")
+    ax.set_aspect("equal")
+
+
+def draw_speed_trace(fig, chart):
+    """Telemetrie-Vergleich (f1_telemetry.py): Speed oben, Zeitabstand unten."""
+    fig.set_size_inches(12, 6.5)
+    speed_ax, delta_ax = fig.subplots(2, 1, sharex=True, gridspec_kw={"height_ratios": [3, 1]})
+    for ax in (speed_ax, delta_ax):
+        _style_axes(ax)
+    for s in chart["series"]:
+        speed_ax.plot(chart["distance"], s["speed"], color=s["color"], linewidth=1.4, label=s["title"])
+        delta_ax.plot(chart["distance"], s["delta"], color=s["color"], linewidth=1.4)
+    speed_ax.set_ylabel("km/h", color=TICK_COLOR)
+    delta_ax.set_ylabel("Δ s", color=TICK_COLOR)
+    delta_ax.set_xlabel("Distanz (m)", color=TICK_COLOR)
+    speed_ax.set_title(chart["title"], color=TEXT_COLOR, fontsize=14, loc="left")
+    speed_ax.legend(loc="lower right", frameon=False, labelcolor=TEXT_COLOR, fontsize=9)
+    fig.tight_layout()
+
+
+DRAW = {"line": draw_line, "doughnut": draw_doughnut, "speed_trace": draw_speed_trace}
+
+
+def render_chart(fig, name, chart):
+    """Zeichnet ein Chart auf die (geleerte) Figure und schreibt alle Formate."""
+    fig.clf()
+    fig.set_facecolor(BACKGROUND)
+    DRAW[chart["kind"]](fig, chart)
+
+    written = []
+    for fmt in FORMATS:
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, dpi=150, facecolor=BACKGROUND,
+                    metadata=SAVE_METADATA[fmt])
+        if write_artifact(os.path.join(RENDER_DIR, f"{name}.{fmt}"), buf.getvalue()):
+            written.append(fmt)
+    return written
+
+
+# ─────────────────────────────────────────────
+# Render-Cache
+# ─────────────────────────────────────────────
+
+def chart_hash(chart):
+    return content_hash(dump_json({"v": RENDER_VERSION, "chart": chart}).encode("utf-8"))
+
+
+def load_cache():
+    try:
+        with open(RENDER_CACHE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def is_cached(cache, name, digest):
+    return cache.get(name) == digest and all(
+        os.path.exists(os.path.join(RENDER_DIR, f"{name}.{fmt}")) for fmt in FORMATS
+    )
+
+
+def render_all(payloads, force=False):
+    """Rendert alle geänderten Charts. Rückgabe: Liste der neu gerenderten Namen."""
+    os.makedirs(RENDER_DIR, exist_ok=True)
+    cache    = load_cache()
+    fig      = Figure()
+    FigureCanvasAgg(fig)
+    rendered = []
+
+    for name, chart in payloads.items():
+        digest = chart_hash(chart)
+        if not force and is_cached(cache, name, digest):
+            log.info(f"   💾 {name}: unverändert (Cache)")
+            continue
+        written = render_chart(fig, name, chart)
+        cache[name] = digest
+        rendered.append(name)
+        log.info(f"   🖼️  {name}: gerendert" + (f" → {', '.join(written)} geschrieben" if written else ""))
+
+    write_json_artifact(RENDER_CACHE, cache)
+    return rendered
+
+
+def main(argv):
+    log.setup(argv)
+    log.info(f"🎨 Rendere Charts {YEAR} (PNG/SVG) → {RENDER_DIR}")
+    payloads = collect_payloads(offline="--offline" in argv)
+    rendered = render_all(payloads, force="--force" in argv)
+    log.info(f"✅ {len(rendered)}/{len(payloads)} Charts neu gerendert")
+    return True
+
+
+if __name__ == "__main__":
+    if not main(sys.argv[1:]):
+        exit(1)
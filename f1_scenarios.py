@@ -0,0 +1,333 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+import f1_log as log
+from f1_artifacts import write_json_artifact, status_label
+from f1_notion_query import NOTION_API, iter_records, is_not_empty, TITLE
+from f1_seasons import load_season, output_path
+from f1_entities import load_entities
+from f1_standings import load_results_frame, points_matrix, completed_columns, notion_headers
+
+# =============================================================================
+# Championship-Szenarien ("Wer kann noch Weltmeister werden?")
+#
+# Aus den Punkten pro Spalte (dieselbe Matrix wie in den Tabellen) und den
+# noch offenen Wochenenden des Kalenders:
+#   max_points        – Punkte, wenn ab jetzt alles gewonnen wird
+#   eliminated        – max_points reicht nicht mehr an den Führenden heran
+#   clinched          – kein Rivale kann noch vorbeiziehen
+#   points_to_clinch  – fehlende Punkte bis zum sicheren Titel (obere Schranke)
+#   win_probability   – Monte Carlo über die Restsaison (NumPy, vektorisiert
+#                       über alle Samples; große Läufe auf mehrere Prozesse)
+#
+# Modell: pro Rennen/Sprint eine Plackett-Luce-Reihenfolge (Gumbel-Trick),
+# Stärke = bisheriger Punkteschnitt pro Wochenende (+ FORM_PRIOR).
+#
+#   python f1_scenarios.py             # f1_scenarios.json
+#   python f1_scenarios.py --notion    # zusätzlich Spalte in beiden Championship-DBs
+#   python f1_scenarios.py --offline   # nur lokaler Season Store
+# =============================================================================
+
+SEASON = load_season()
+YEAR   = SEASON["year"]
+
+RACE_LOCATIONS = SEASON["race_locations"]
+
+ENTITIES = load_entities(SEASON)
+
+# Punktesystem ab 2026 – kein Bonuspunkt für die schnellste Runde
+RACE_POINTS   = (25, 18, 15, 12, 10, 8, 6, 4, 2, 1)
+SPRINT_POINTS = (8, 7, 6, 5, 4, 3, 2, 1)
+
+SCENARIO_SAMPLES = int(os.getenv("SCENARIO_SAMPLES", "100000"))
+SCENARIO_SEED    = int(os.getenv("SCENARIO_SEED", "2026"))
+
+# Ab so vielen Samples lohnt der Prozess-Pool (Start-Overhead ~1 s)
+PARALLEL_MIN_SAMPLES = 50000
+
+# Glättung: auch Fahrer ohne Punkte haben eine kleine Siegchance
+FORM_PRIOR = 2.0
+
+# Notion-Spalte (Number, Prozentformat) in Drivers/Constructors Championship
+SCENARIO_PROPERTY = os.getenv("SCENARIO_NOTION_PROPERTY", "Title Chance")
+
+NOTION_WORKERS = 3
+
+
+# ─────────────────────────────────────────────
+# Ausgangslage
+# ─────────────────────────────────────────────
+
+def remaining_sessions(frame, num_cols):
+    """
+    Offene Grands Prix und Sprints → (Rennen, Sprints), getrennt nach Session:
+    nach dem Sprint ist der Grand Prix desselben Wochenendes noch offen.
+    """
+    sprint       = frame["sprint"].astype(bool)
+    races_done   = set(frame.loc[~sprint, "col"].astype(int))
+    sprints_done = set(frame.loc[sprint, "col"].astype(int))
+    races   = sum(1 for col in range(num_cols) if col not in races_done)
+    sprints = sum(1 for col in range(num_cols)
+                  if SEASON["calendar"][col].get("sprint") and col not in sprints_done)
+    return races, sprints
+
+
+def starting_grid(frame, done):
+    """
+    Fahrer, die in der Restsaison fahren, und ihr Team (Registry-Index).
+    Stamm-Lineup aus der Registry; wer zuletzt für ein anderes Team gefahren
+    ist (Ersatzfahrer, Archiv-Saisons), bekommt das Team aus den Ergebnissen.
+    """
+    team_of = {d["idx"]: ENTITIES["constructor_idx"][d["constructor"]]
+               for d in ENTITIES["drivers"] if d.get("constructor") in ENTITIES["constructor_idx"]}
+
+    played = [col for col, d in enumerate(done) if d]
+    if played:
+        last = frame[(frame["col"] == played[-1]) & frame["constructor"].notna()]
+        for driver, team in zip(last["driver"], last["constructor"]):
+            team_of[int(driver)] = int(team)
+
+    drivers = sorted(team_of)
+    return np.array(drivers, dtype=np.intp), np.array([team_of[d] for d in drivers], dtype=np.intp)
+
+
+def championship_bounds(current, max_gain):
+    """Deterministische Grenzen ohne Simulation (Arrays über alle Entities)."""
+    max_points = current + max_gain
+    leader     = current.max() if len(current) else 0
+
+    # Bester Rivale je Entity: Maximum über alle anderen
+    order        = np.argsort(-max_points, kind="stable")
+    best_rival   = np.full(len(current), max_points[order[0]] if len(current) else 0)
+    if len(current) > 1:
+        best_rival[order[0]] = max_points[order[1]]
+
+    return {
+        "max_points":       max_points,
+        "eliminated":       max_points < leader,
+        "clinched":         current > best_rival,
+        "points_to_clinch": np.clip(best_rival - current + 1, 0, None),
+    }
+
+
+# ─────────────────────────────────────────────
+# Monte Carlo
+# ─────────────────────────────────────────────
+
+def _session_points(rng, log_strength, samples, table):
+    """
+    Eine Session für alle Samples: Gumbel-Rauschen + log-Stärke → Reihenfolge
+    (Plackett-Luce), Rang → Punkte per Lookup. Rückgabe [samples, fahrer] int16.
+    """
+    n      = len(log_strength)
+    keys   = log_strength + rng.gumbel(size=(samples, n)).astype(np.float32)
+    ranks  = np.argsort(np.argsort(-keys, axis=1), axis=1)
+    lookup = np.zeros(n, dtype=np.int16)
+    lookup[:min(n, len(table))] = table[:n]
+    return lookup[ranks]
+
+
+def _win_share(totals):
+    """Titelanteil pro Entity; Gleichstand an der Spitze wird geteilt."""
+    leaders = totals == totals.max(axis=1, keepdims=True)
+    return (leaders / leaders.sum(axis=1, keepdims=True)).sum(axis=0)
+
+
+def simulate_chunk(args):
+    """
+    Ein Block Samples (auch als Prozess-Worker). Rückgabe: Summen über den Block
+    (Titel Fahrer, Titel Teams, Punkte Fahrer, Punkte Teams).
+    """
+    seed, samples, log_strength, grid, current_d, current_t, races, sprints = args
+    drivers, teams = grid
+    rng = np.random.default_rng(seed)
+
+    gains = np.zeros((samples, len(log_strength)), dtype=np.int32)
+    for _ in range(races):
+        gains += _session_points(rng, log_strength, samples, RACE_POINTS)
+    for _ in range(sprints):
+        gains += _session_points(rng, log_strength, samples, SPRINT_POINTS)
+
+    # Fahrer ohne Cockpit behalten ihre Punkte, Teams summieren ihre Fahrer
+    membership = np.zeros((len(drivers), len(current_t)), dtype=np.int32)
+    membership[np.arange(len(drivers)), teams] = 1
+    totals_d = np.broadcast_to(current_d, (samples, len(current_d))).copy()
+    totals_d[:, drivers] += gains
+    totals_t = current_t + gains @ membership
+
+    return (_win_share(totals_d), _win_share(totals_t),
+            totals_d.sum(axis=0, dtype=np.int64), totals_t.sum(axis=0, dtype=np.int64))
+
+
+def simulate(current_d, current_t, grid, strength, races, sprints,
+             samples=SCENARIO_SAMPLES, seed=SCENARIO_SEED):
+    """Titelwahrscheinlichkeit und erwartete Endpunkte für Fahrer und Teams."""
+    log_strength = np.log(strength + FORM_PRIOR).astype(np.float32)
+    workers = (os.cpu_count() or 1) if samples >= PARALLEL_MIN_SAMPLES else 1
+    seeds   = np.random.SeedSequence(seed).spawn(workers)
+    sizes   = [samples // workers + (i < samples % workers) for i in range(workers)]
+    jobs    = [(s, n, log_strength, grid, current_d, current_t, races, sprints)
+               for s, n in zip(seeds, sizes) if n]
+
+    if len(jobs) > 1:
+        log.info(f"🎲 {samples:,} Samples auf {len(jobs)} Prozesse verteilt")
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            parts = list(pool.map(simulate_chunk, jobs))
+    else:
+        parts = [simulate_chunk(job) for job in jobs]
+
+    win_d, win_t, sum_d, sum_t = (sum(p[k] for p in parts) for k in range(4))
+    return win_d / samples, win_t / samples, sum_d / samples, sum_t / samples
+
+
+# ─────────────────────────────────────────────
+# Szenarien berechnen
+# ─────────────────────────────────────────────
+
+def build_scenarios(frame, samples=SCENARIO_SAMPLES):
+    num_cols = len(RACE_LOCATIONS)
+    matrix_d, seen_d = points_matrix(frame, ENTITIES, "driver", num_cols)
+    matrix_t, _      = points_matrix(frame, ENTITIES, "constructor", num_cols)
+    done             = completed_columns(frame, num_cols)
+    races, sprints   = remaining_sessions(frame, num_cols)
+
+    current_d = matrix_d.sum(axis=1)
+    current_t = matrix_t.sum(axis=1)
+    drivers, teams = starting_grid(frame, done)
+
+    # Maximal mögliche Punkte: Fahrer gewinnt alles, Team holt 1-2
+    gain_d = np.zeros(len(current_d), dtype=np.int64)
+    gain_d[drivers] = races * RACE_POINTS[0] + sprints * SPRINT_POINTS[0]
+    gain_t = np.zeros(len(current_t), dtype=np.int64)
+    gain_t[np.unique(teams)] = races * sum(RACE_POINTS[:2]) + sprints * sum(SPRINT_POINTS[:2])
+
+    played   = max(1, sum(done))
+    strength = current_d[drivers] / played
+
+    if races and len(drivers):
+        win_d, win_t, exp_d, exp_t = simulate(current_d, current_t, (drivers, teams),
+                                              strength, races, sprints, samples)
+    else:
+        # Saison vorbei – Tabelle ist das Ergebnis
+        win_d, win_t = (_win_share(current_d[None, :]), _win_share(current_t[None, :]))
+        exp_d, exp_t = current_d, current_t
+        samples = 0
+
+    def rows(entities, current, gain, win, expected, active):
+        bounds = championship_bounds(current, gain)
+        return [
+            {
+                "title":            entities[i]["name"],
+                "color":            entities[i]["color"],
+                "points":           int(current[i]),
+                "max_points":       int(bounds["max_points"][i]),
+                "eliminated":       bool(bounds["eliminated"][i]),
+                "clinched":         bool(bounds["clinched"][i]),
+                "points_to_clinch": int(bounds["points_to_clinch"][i]),
+                "win_probability":  round(float(win[i]), 4),
+                "expected_points":  round(float(expected[i]), 1),
+            }
+            for i in np.argsort(-current, kind="stable") if active[i]
+        ]
+
+    active_t = np.zeros(len(current_t), dtype=bool)
+    active_t[:len(ENTITIES["constructors"])] = True
+    active_t[teams] = True
+    active_t |= current_t > 0
+    active_d = seen_d.copy()
+    active_d[drivers] = True
+
+    return {
+        "season":       YEAR,
+        "remaining":    {"races": races, "sprints": sprints},
+        "samples":      samples,
+        "drivers":      rows(ENTITIES["drivers"], current_d, gain_d, win_d, exp_d, active_d),
+        "constructors": rows(ENTITIES["constructors"], current_t, gain_t, win_t, exp_t, active_t),
+        "backgroundColor": "#191919",
+    }
+
+
+def write_json(scenarios):
+    changed = write_json_artifact(output_path(SEASON, "f1_scenarios.json"), scenarios)
+    log.info(f"✅ f1_scenarios.json {status_label(changed)} – {scenarios['remaining']['races']} Rennen, "
+             f"{scenarios['remaining']['sprints']} Sprints offen, {scenarios['samples']:,} Samples")
+
+
+def print_summary(scenarios):
+    """Tabelle pro Entity – nur mit --verbose."""
+    for kind, label in (("drivers", "Fahrer"), ("constructors", "Teams")):
+        log.debug(f"\n{label}:")
+        log.debug("-" * 70)
+        for pos, r in enumerate(scenarios[kind], 1):
+            status = "🏆 Titel sicher" if r["clinched"] else "❌ raus" if r["eliminated"] else ""
+            log.debug(f"{pos:2d}. {r['title']:<25} {r['points']:4d} Pts  max {r['max_points']:4d}  "
+                     f"{r['win_probability'] * 100:6.2f} %  {status}")
+
+
+# ─────────────────────────────────────────────
+# Notion: Titelchance als Spalte in den Championship-DBs
+# ─────────────────────────────────────────────
+
+def ensure_number_property(db_id, headers, name):
+    """Legt die Spalte als Prozent-Zahl an, falls sie in der DB noch fehlt."""
+    r = requests.get(f"{NOTION_API}/databases/{db_id}", headers=headers, timeout=30)
+    r.raise_for_status()
+    if name in r.json().get("properties", {}):
+        return
+    r = requests.patch(f"{NOTION_API}/databases/{db_id}", headers=headers, timeout=30,
+                       json={"properties": {name: {"number": {"format": "percent"}}}})
+    r.raise_for_status()
+    log.info(f"   ➕ Spalte '{name}' angelegt")
+
+
+def update_notion_column(db_id, headers, rows):
+    """Schreibt win_probability in die Zeilen der DB (Zuordnung über den Titel)."""
+    ensure_number_property(db_id, headers, SCENARIO_PROPERTY)
+    chance = {r["title"]: r["win_probability"] for r in rows}
+    pages  = [(rec["id"], chance[rec["title"]])
+              for rec in iter_records(db_id, headers, filter=is_not_empty(TITLE, "title"),
+                                      properties=[TITLE])
+              if rec["title"] in chance]
+
+    def patch(item):
+        page_id, value = item
+        r = requests.patch(f"{NOTION_API}/pages/{page_id}", headers=headers, timeout=30,
+                           json={"properties": {SCENARIO_PROPERTY: {"number": value}}})
+        return r.ok
+
+    with ThreadPoolExecutor(max_workers=NOTION_WORKERS) as pool:
+        ok = sum(pool.map(patch, pages))
+    log.info(f"   ✅ {ok}/{len(pages)} Einträge aktualisiert")
+    return ok == len(pages)
+
+
+def main(argv):
+    log.setup(argv)
+    log.info(f"🔄 Berechne Championship-Szenarien {YEAR}...")
+    frame     = load_results_frame(SEASON, ENTITIES, offline="--offline" in argv)
+    scenarios = build_scenarios(frame)
+    write_json(scenarios)
+    print_summary(scenarios)
+
+    if "--notion" not in argv:
+        return True
+
+    headers = notion_headers()
+    success = True
+    for kind, db_key in (("drivers", "drivers_championship_db"), ("constructors", "constructors_db")):
+        db_id = SEASON["notion"].get(db_key)
+        if not db_id:
+            log.warning(f"⚠️ seasons/{YEAR}.json enthält keine {db_key} – Spalte übersprungen")
+            continue
+        log.info(f"\n📤 {SCENARIO_PROPERTY} → {db_key}")
+        success &= update_notion_column(db_id, headers, scenarios[kind])
+    return success
+
+
+if __name__ == "__main__":
+    if not main(sys.argv[1:]):
+        exit(1)
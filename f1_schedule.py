@@ -0,0 +1,201 @@
+import os
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+
+from f1_seasons import load_season
+
+# =============================================================================
+# Session-Zeitplan einer Saison aus dem FastF1 Event-Schedule.
+# Eine flache, nach Startzeit sortierte Liste aller Sessions mit Start/Ende
+# in UTC – Grundlage für Countdown-Widget, Scheduler und Kalender-Index.
+# Abgesagte Rennen (seasons/<jahr>.json → "cancelled") werden ausgelassen.
+# =============================================================================
+
+# Eigener Pfad per Env, damit der Scheduler nur den kleinen Schedule-Cache lädt
+FASTF1_CACHE_DIR = os.getenv("FASTF1_CACHE_DIR", "./fastf1_cache/")
+
+# FastF1 liefert nur Startzeiten – geplante Dauer pro Session in Minuten
+SESSION_DURATION_MIN = {
+    "Practice 1":        60,
+    "Practice 2":        60,
+    "Practice 3":        60,
+    "Sprint Qualifying": 44,
+    "Sprint":            60,
+    "Qualifying":        60,
+    "Race":              120,
+}
+
+# Fenster für "aktuelles Wochenende": so lange vor FP1 bzw. nach dem Rennen
+WEEKEND_LEAD_DAYS  = 5
+WEEKEND_TRAIL_DAYS = 3
+
+# Vorprüfung ohne FastF1 (nur Renndatum aus seasons/<jahr>.json): großzügiger als
+# current_weekend() – FP1 liegt bis zu 3 Tage vor dem Renndatum, das Rennende
+# kann in UTC auf den Folgetag fallen
+PRECHECK_LEAD_DAYS  = WEEKEND_LEAD_DAYS + 3
+PRECHECK_TRAIL_DAYS = WEEKEND_TRAIL_DAYS + 1
+
+# Ältere Session-Namen aus FastF1 → Namen wie in f1_session_results.py
+SESSION_NAME_ALIASES = {
+    "Sprint Shootout": "Sprint Qualifying",
+}
+
+
+# FastF1 zieht pandas, numpy und requests-cache nach (~1-2 s Import) – erst beim
+# ersten Gebrauch laden, damit kurze Läufe ohne Session-Daten schnell enden
+_fastf1 = None
+
+
+def load_fastf1():
+    """Importiert FastF1 und aktiviert den Cache – einmal pro Prozess."""
+    global _fastf1
+    if _fastf1 is None:
+        import fastf1
+        os.makedirs(FASTF1_CACHE_DIR, exist_ok=True)
+        fastf1.Cache.enable_cache(FASTF1_CACHE_DIR)
+        _fastf1 = fastf1
+    return _fastf1
+
+
+def _utc(ts):
+    """Naiver UTC-Timestamp aus FastF1 → tz-aware datetime, NaT → None."""
+    if ts is None or ts != ts:  # NaT != NaT
+        return None
+    return ts.to_pydatetime().replace(tzinfo=timezone.utc)
+
+
+def to_ms(dt):
+    return int(dt.timestamp() * 1000) if dt else 0
+
+
+def season_sessions(year=None, include_testing=False):
+    """
+    Alle Sessions der Saison, sortiert nach Start:
+      {"event", "official_name", "round", "sprint", "session", "start", "end"}
+    start/end sind tz-aware UTC; end ist None bei Testfahrten (Dauer unbekannt).
+    """
+    season = load_season(year)
+    schedule  = load_fastf1().get_event_schedule(season["year"], include_testing=include_testing)
+    cancelled = set(season["cancelled"])
+
+    sessions = []
+    for _, event in schedule.iterrows():
+        if event["EventName"] in cancelled:
+            continue
+        testing = event["EventFormat"] == "testing"
+        for n in range(1, 6):
+            name  = event.get(f"Session{n}")
+            start = _utc(event.get(f"Session{n}DateUtc"))
+            if not name or start is None:
+                continue
+            name     = SESSION_NAME_ALIASES.get(name, name)
+            duration = None if testing else SESSION_DURATION_MIN.get(name)
+            sessions.append({
+                "event":         event["EventName"],
+                "official_name": event.get("OfficialEventName") or event["EventName"],
+                "round":         int(event["RoundNumber"]),
+                "sprint":        "sprint" in str(event["EventFormat"]),
+                "session":       name,
+                "start":         start,
+                "end":           start + timedelta(minutes=duration) if duration else None,
+            })
+
+    sessions.sort(key=lambda s: s["start"])
+    return sessions
+
+
+# ─────────────────────────────────────────────
+# Kalender-Index: sortierte Arrays, Lookups per Binärsuche
+# ─────────────────────────────────────────────
+
+def build_calendar_index(sessions):
+    """
+    Baut einmalig sortierte Start/End-Arrays (epoch ms) für Sessions und Wochenenden.
+    Sessions überschneiden sich nicht → auch die End-Arrays sind sortiert.
+    """
+    sessions = sorted(sessions, key=lambda s: s["start"])
+    weekends = {}
+    for i, s in enumerate(sessions):
+        w = weekends.setdefault(s["event"], {"event": s["event"], "sprint": s["sprint"],
+                                             "first": i, "last": i})
+        w["last"] = i
+    weekends = sorted(weekends.values(), key=lambda w: w["first"])
+
+    ends = [to_ms(s["end"] or s["start"]) for s in sessions]
+    return {
+        "sessions":       sessions,
+        "starts":         [to_ms(s["start"]) for s in sessions],
+        "ends":           ends,
+        "weekends":       weekends,
+        "weekend_starts": [to_ms(sessions[w["first"]]["start"]) for w in weekends],
+        "weekend_ends":   [ends[w["last"]] for w in weekends],
+        "by_event":       {w["event"]: w for w in weekends},
+    }
+
+
+def _now_ms(now=None):
+    return to_ms(now or datetime.now(timezone.utc))
+
+
+def live_session(index, now=None):
+    """Session, die gerade läuft – sonst None."""
+    t = _now_ms(now)
+    i = bisect_right(index["starts"], t) - 1
+    if i >= 0 and t < index["ends"][i]:
+        return index["sessions"][i]
+    return None
+
+
+def last_completed_session(index, now=None):
+    t = _now_ms(now)
+    i = bisect_right(index["ends"], t) - 1
+    return index["sessions"][i] if i >= 0 else None
+
+
+def next_session(index, now=None):
+    t = _now_ms(now)
+    i = bisect_right(index["starts"], t)
+    return index["sessions"][i] if i < len(index["sessions"]) else None
+
+
+def completed_sessions(index, event, now=None):
+    """Bereits beendete Sessions eines Wochenendes (in Reihenfolge)."""
+    w = index["by_event"].get(event)
+    if not w:
+        return []
+    t  = _now_ms(now)
+    hi = bisect_right(index["ends"], t, w["first"], w["last"] + 1)
+    return index["sessions"][w["first"]:hi]
+
+
+def current_weekend(index, now=None):
+    """
+    Wochenende, das läuft oder vor höchstens WEEKEND_TRAIL_DAYS endete – sonst das
+    nächste, falls es in höchstens WEEKEND_LEAD_DAYS beginnt.
+    Rückgabe: ({"event", "sprint", ...}, "live" | "ended" | "upcoming") oder (None, None)
+    """
+    t   = _now_ms(now)
+    day = 86400000
+    wi  = bisect_right(index["weekend_starts"], t) - 1
+    if wi >= 0:
+        end = index["weekend_ends"][wi]
+        if t < end:
+            return index["weekends"][wi], "live"
+        if t < end + WEEKEND_TRAIL_DAYS * day:
+            return index["weekends"][wi], "ended"
+    if wi + 1 < len(index["weekends"]) and index["weekend_starts"][wi + 1] - WEEKEND_LEAD_DAYS * day <= t:
+        return index["weekends"][wi + 1], "upcoming"
+    return None, None
+
+
+def weekend_in_window(season, today=None):
+    """
+    Schnelle Vorprüfung vor jedem FastF1-Import: Kalendereintrag, dessen
+    Wochenende laut Renndatum im (erweiterten) Fenster liegt – sonst None.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    for event in season["calendar"]:
+        diff = (today - datetime.strptime(event["date"], "%Y-%m-%d").date()).days
+        if -PRECHECK_LEAD_DAYS <= diff <= PRECHECK_TRAIL_DAYS:
+            return event
+    return None
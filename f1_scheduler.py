@@ -0,0 +1,176 @@
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+from f1_schedule import season_sessions
+
+# =============================================================================
+# Event-gesteuerter Job-Scheduler: statt "Workflow läuft, egal ob neue Daten
+# da sind" wird aus den Session-Endzeiten (FastF1 Event-Schedule) berechnet,
+# wann welcher Job fällig ist:
+#
+#   Session-Ende + DATA_DELAY_MIN        → session_results (nur diese Session)
+#   Race/Sprint-Ende + STANDINGS_DELAY_MIN → standings (Tabellen + Charts)
+#
+#   python f1_scheduler.py next-run     # fällige Jobs → GITHUB_OUTPUT
+#   python f1_scheduler.py mark-done <checked_at>   # nach erfolgreichem Lauf
+#   python f1_scheduler.py list         # alle Jobs der Saison
+# =============================================================================
+
+# FastF1-Timing ist ca. 30 min nach Session-Ende vollständig
+DATA_DELAY_MIN = int(os.getenv("SCHEDULER_DATA_DELAY_MIN", "30"))
+
+# Jolpica übernimmt offizielle Ergebnisse etwas später
+STANDINGS_DELAY_MIN = int(os.getenv("SCHEDULER_STANDINGS_DELAY_MIN", "90"))
+
+# Zeitpunkt des letzten erfolgreichen Laufs (zwischen CI-Läufen per actions/cache)
+STATE_PATH = os.getenv("SCHEDULER_STATE_PATH", "./scheduler_state/state.json")
+
+# Ohne State nur so weit zurückschauen – sonst wäre die ganze Saison "fällig"
+INITIAL_LOOKBACK_HOURS = 6
+
+STANDINGS_SESSIONS = ("Race", "Sprint")
+
+
+def build_jobs(sessions, data_delay=DATA_DELAY_MIN, standings_delay=STANDINGS_DELAY_MIN):
+    """
+    Fällige Jobs pro Session, sortiert nach Fälligkeit:
+      {"due", "event", "session", "job"}  mit job ∈ {"session_results", "standings"}
+    Sessions ohne Endzeit (Testfahrten) erzeugen keine Jobs.
+    """
+    jobs = []
+    for s in sessions:
+        if s["end"] is None:
+            continue
+        jobs.append({"due": s["end"] + timedelta(minutes=data_delay),
+                     "event": s["event"], "session": s["session"], "job": "session_results"})
+        if s["session"] in STANDINGS_SESSIONS:
+            jobs.append({"due": s["end"] + timedelta(minutes=standings_delay),
+                         "event": s["event"], "session": s["session"], "job": "standings"})
+    jobs.sort(key=lambda j: j["due"])
+    return jobs
+
+
+def due_jobs(jobs, since, now):
+    """Jobs, die im Intervall (since, now] fällig geworden sind."""
+    return [j for j in jobs if since < j["due"] <= now]
+
+
+def next_job(jobs, now):
+    return next((j for j in jobs if j["due"] > now), None)
+
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return datetime.fromisoformat(json.load(f)["last_run"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_state(last_run, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"last_run": last_run.isoformat()}, f)
+
+
+def plan_run(jobs, now, last_run=None):
+    """
+    Fasst die fälligen Jobs zu einem Lauf zusammen. RACE_NAME kennt nur ein
+    Wochenende – bei mehreren Events (verpasste Läufe) wird das älteste
+    verarbeitet und checked_at nur bis zu dessen letztem Job vorgerückt.
+    Die Jobs der späteren Events bleiben fällig und folgen im nächsten Lauf.
+    """
+    since = last_run or now - timedelta(hours=INITIAL_LOOKBACK_HOURS)
+    due   = due_jobs(jobs, since, now)
+    upcoming = next_job(jobs, now)
+    plan = {
+        "due":             bool(due),
+        "race_name":       "",
+        "sessions":        [],
+        "session_results": False,
+        "standings":       False,
+        "pending":         0,
+        "next_run":        upcoming["due"].isoformat() if upcoming else "",
+        "checked_at":      now.isoformat(),
+    }
+    if not due:
+        return plan
+
+    event = due[0]["event"]
+    batch = []
+    for j in due:
+        if j["event"] != event:
+            break
+        batch.append(j)
+    for j in batch:
+        plan[j["job"]] = True
+        if j["job"] == "session_results" and j["session"] not in plan["sessions"]:
+            plan["sessions"].append(j["session"])
+    plan["race_name"] = event
+
+    plan["pending"] = len(due) - len(batch)
+    if plan["pending"]:
+        # Nur bis zum letzten verarbeiteten Job als erledigt markieren
+        plan["checked_at"] = batch[-1]["due"].isoformat()
+        plan["next_run"]   = now.isoformat()
+    return plan
+
+
+def write_github_output(plan):
+    """Schreibt den Plan als Step-Outputs (GITHUB_OUTPUT), lokal nur Ausgabe."""
+    lines = [
+        f"due={str(plan['due']).lower()}",
+        f"race_name={plan['race_name']}",
+        f"sessions={','.join(plan['sessions'])}",
+        f"session_results={str(plan['session_results']).lower()}",
+        f"standings={str(plan['standings']).lower()}",
+        f"pending={plan['pending']}",
+        f"next_run={plan['next_run']}",
+        f"checked_at={plan['checked_at']}",
+    ]
+    output = os.getenv("GITHUB_OUTPUT")
+    if output:
+        with open(output, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    for line in lines:
+        print(f"   {line}")
+
+
+def main(argv):
+    now = datetime.now(timezone.utc)
+    command = argv[0] if argv else ""
+
+    if command == "next-run":
+        jobs = build_jobs(season_sessions())
+        plan = plan_run(jobs, now, load_state())
+        if plan["due"]:
+            print(f"⏰ Fällig: {plan['race_name']} – {', '.join(plan['sessions']) or 'Standings'}")
+            if plan["pending"]:
+                print(f"   ⏭️  {plan['pending']} weitere fällige Jobs späterer Events → nächster Lauf")
+        else:
+            print(f"💤 Keine neuen Daten – nächster Lauf: {plan['next_run'] or 'Saison beendet'}")
+        write_github_output(plan)
+        return True
+
+    if command == "mark-done":
+        # Zeitpunkt aus next-run übernehmen – Jobs, die währenddessen fällig
+        # wurden, bleiben so für den nächsten Lauf erhalten
+        last_run = datetime.fromisoformat(argv[1]) if len(argv) > 1 else now
+        save_state(last_run)
+        print(f"✅ Letzter Lauf gespeichert: {last_run.isoformat()}")
+        return True
+
+    if command == "list":
+        for j in build_jobs(season_sessions()):
+            print(f"{j['due']:%Y-%m-%d %H:%M} UTC  {j['job']:<16} {j['event']} – {j['session']}")
+        return True
+
+    print("Verwendung: python f1_scheduler.py next-run | mark-done [<checked_at>] | list")
+    return False
+
+
+if __name__ == "__main__":
+    if not main(sys.argv[1:]):
+        exit(1)
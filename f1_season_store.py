@@ -0,0 +1,215 @@
+import os
+import sqlite3
+import sys
+from datetime import date, datetime, timedelta
+
+import f1_log as log
+from f1_seasons import load_season, fetch_round, is_round_final
+from f1_circuits import circuit_index
+
+# =============================================================================
+# Lokaler Season Store (SQLite) – Datenquelle für Charts und Tabellen (STANDINGS_SOURCE=jolpica).
+#
+# Pro Runde und Session (race/sprint) eine Zeile pro Fahrer mit Punkten,
+# Position und Status, dazu das Qualifying mit Q1/Q2/Q3-Zeiten (Sekunden)
+# in einer eigenen Tabelle. Neue Runden werden angehängt (O(Fahrer)), finale
+# Runden nie wieder abgefragt. Die Ausgaben lesen die Datei über f1_standings.py.
+#
+#   python f1_season_store.py sync           # neue Runden von Jolpica holen
+#   python f1_drivers_chart.py --offline     # Chart nur aus dem Store bauen
+# =============================================================================
+
+STORE_PATH = os.getenv("SEASON_STORE_PATH", "./data/season_store.sqlite")
+
+# Session im Store → Jolpica-Endpoint
+SESSIONS = (("race", "results"), ("sprint", "sprint"), ("qualifying", "qualifying"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    season       INTEGER NOT NULL,
+    round        INTEGER NOT NULL,
+    session      TEXT    NOT NULL,
+    final        INTEGER NOT NULL DEFAULT 0,
+    race_name    TEXT,
+    circuit_id   TEXT,
+    country      TEXT,
+    locality     TEXT,
+    PRIMARY KEY (season, round, session)
+);
+CREATE TABLE IF NOT EXISTS results (
+    season           INTEGER NOT NULL,
+    round            INTEGER NOT NULL,
+    session          TEXT    NOT NULL,
+    driver_id        TEXT    NOT NULL,
+    driver_name      TEXT    NOT NULL,
+    driver_code      TEXT,
+    constructor_id   TEXT,
+    constructor_name TEXT,
+    position         INTEGER,
+    grid             INTEGER,
+    points           REAL    NOT NULL DEFAULT 0,
+    status           TEXT,
+    PRIMARY KEY (season, round, session, driver_id)
+);
+CREATE TABLE IF NOT EXISTS qualifying (
+    season           INTEGER NOT NULL,
+    round            INTEGER NOT NULL,
+    driver_id        TEXT    NOT NULL,
+    driver_code      TEXT,
+    constructor_id   TEXT,
+    constructor_name TEXT,
+    position         INTEGER,
+    q1               REAL,
+    q2               REAL,
+    q3               REAL,
+    PRIMARY KEY (season, round, driver_id)
+);
+"""
+
+
+def open_store(path=STORE_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _lap_seconds(value):
+    """Jolpica-Rundenzeit "1:15.096" → 75.096; leer/fehlend → None."""
+    if not value:
+        return None
+    minutes, _, seconds = value.rpartition(":")
+    try:
+        return int(minutes or 0) * 60 + float(seconds)
+    except ValueError:
+        return None
+
+
+def _record_round(conn, year, round_num, session, race, final):
+    loc = race.get("Circuit", {}).get("Location", {})
+    conn.execute(
+        "INSERT OR REPLACE INTO rounds VALUES (?,?,?,?,?,?,?,?)",
+        (year, round_num, session, int(final), race.get("raceName"),
+         race.get("Circuit", {}).get("circuitId"), loc.get("country"), loc.get("locality"))
+    )
+
+
+def append_qualifying(conn, year, round_num, race, final=False):
+    """Qualifying einer Runde (QualifyingResults) → Tabelle qualifying. O(Fahrer)."""
+    rows = [
+        (
+            year, round_num,
+            res["Driver"]["driverId"],
+            res["Driver"].get("code"),
+            res["Constructor"]["constructorId"],
+            res["Constructor"]["name"],
+            _int(res.get("position")),
+            _lap_seconds(res.get("Q1")),
+            _lap_seconds(res.get("Q2")),
+            _lap_seconds(res.get("Q3")),
+        )
+        for res in race.get("QualifyingResults", [])
+    ]
+    with conn:
+        conn.execute("DELETE FROM qualifying WHERE season=? AND round=?", (year, round_num))
+        conn.executemany("INSERT INTO qualifying VALUES (?,?,?,?,?,?,?,?,?,?)", rows)
+        _record_round(conn, year, round_num, "qualifying", race, final)
+    return len(rows)
+
+
+def append_round(conn, year, round_num, session, race, final=False):
+    """Schreibt eine Jolpica-Runde (ein Eintrag aus "Races") in den Store. O(Fahrer)."""
+    if session == "qualifying":
+        return append_qualifying(conn, year, round_num, race, final=final)
+    key  = "Results" if session == "race" else "SprintResults"
+    rows = [
+        (
+            year, round_num, session,
+            res["Driver"]["driverId"],
+            f"{res['Driver']['givenName']} {res['Driver']['familyName']}",
+            res["Driver"].get("code"),
+            res["Constructor"]["constructorId"],
+            res["Constructor"]["name"],
+            _int(res.get("position")),
+            _int(res.get("grid")),
+            float(res["points"]),
+            res.get("status"),
+        )
+        for res in race.get(key, [])
+    ]
+    with conn:
+        conn.execute("DELETE FROM results WHERE season=? AND round=? AND session=?",
+                     (year, round_num, session))
+        conn.executemany("INSERT INTO results VALUES (?,?,?,?,?,?,?,?,?,?,?,?)", rows)
+        _record_round(conn, year, round_num, session, race, final)
+    return len(rows)
+
+
+def _final_rounds(conn, year):
+    return {
+        (r, s) for r, s in conn.execute(
+            "SELECT round, session FROM rounds WHERE season=? AND final=1", (year,)
+        )
+    }
+
+
+def sync_season(conn, season=None):
+    """
+    Holt alle noch nicht finalen Runden der Saison von Jolpica und hängt sie an.
+    Runden, deren Wochenende noch nicht begonnen hat, werden gar nicht erst abgefragt.
+    Gibt die Anzahl der geschriebenen Zeilen zurück.
+    """
+    season = season or load_season()
+    year   = season["year"]
+    done   = _final_rounds(conn, year)
+    today  = date.today()
+    written = 0
+
+    for event, round_num in zip(season["calendar"], circuit_index(season)["round_of"]):
+        if round_num is None:
+            continue
+        race_date = datetime.strptime(event["date"], "%Y-%m-%d").date()
+        # Sprint am Samstag/Freitag – ab 2 Tage vor dem Renndatum kann es Ergebnisse geben
+        if race_date - timedelta(days=2) > today:
+            continue
+
+        final = is_round_final(year, round_num, season)
+        for session, kind in SESSIONS:
+            if (round_num, session) in done:
+                continue
+            if session == "sprint" and not event.get("sprint"):
+                continue
+            races = fetch_round(season, round_num, kind)
+            if races:
+                written += append_round(conn, year, round_num, session, races[0], final=final)
+    return written
+
+
+def open_synced_store(offline=False):
+    """Öffnet den Store und zieht (außer offline) neue Runden nach."""
+    conn = open_store()
+    if not offline:
+        written = sync_season(conn)
+        log.info(f"💾 Season Store synchronisiert – {written} Zeilen neu/aktualisiert")
+    return conn
+
+
+def main(argv):
+    log.setup(argv)
+    if argv and argv[0] == "sync":
+        open_synced_store()
+        return True
+    print("Verwendung: python f1_season_store.py sync")
+    return False
+
+
+if __name__ == "__main__":
+    if not main(sys.argv[1:]):
+        exit(1)
@@ -0,0 +1,135 @@
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+from f1_jolpica import base_url, get_races, get_schedule
+
+# =============================================================================
+# Saison-Registry: Kalender, Notion-IDs und Ausgabeordner pro Jahr liegen in
+# seasons/<jahr>.json. Alle Skripte lesen die Saison über F1_SEASON
+# (Default: DEFAULT_SEASON), statt Konstanten pro Jahr zu duplizieren.
+#
+#   F1_SEASON=2025 python f1_drivers_chart.py
+#   python f1_seasons.py totals 2019 2026     # Konstrukteurs-Summen über Saisons
+# =============================================================================
+
+DEFAULT_SEASON = 2026
+SEASONS_DIR    = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seasons")
+
+# Nach so vielen Tagen gilt ein Rennergebnis als final (Strafen/Protest-Fenster)
+FINAL_AFTER_DAYS = 7
+
+
+def season_year():
+    return int(os.getenv("F1_SEASON", "").strip() or DEFAULT_SEASON)
+
+
+def available_seasons():
+    return sorted(
+        int(name[:-5]) for name in os.listdir(SEASONS_DIR)
+        if name.endswith(".json") and name[:-5].isdigit()
+    )
+
+
+def load_season(year=None):
+    """
+    Lädt seasons/<jahr>.json und ergänzt abgeleitete Felder:
+      calendar         – nur stattfindende Rennen (ohne "cancelled")
+      cancelled        – Namen der abgesagten Rennen
+      race_locations   – Spaltennamen der Championship-Tabellen, Reihenfolge = Runden
+      gp_country_code  – GP-Name → Kürzel für Eintragstitel (z.B. "AUS")
+      gp_weekend_name  – GP-Name → Name in der Weekends-DB
+      base_url         – Jolpica-URL der Saison
+    """
+    year = year or season_year()
+    with open(os.path.join(SEASONS_DIR, f"{year}.json"), encoding="utf-8") as f:
+        season = json.load(f)
+
+    calendar = [e for e in season["calendar"] if not e.get("cancelled")]
+    season["cancelled"]       = [e["name"] for e in season["calendar"] if e.get("cancelled")]
+    season["calendar"]        = calendar
+    season["race_locations"]  = [e["location"] for e in calendar]
+    season["gp_country_code"] = {e["name"]: e["code"] for e in calendar}
+    season["gp_weekend_name"] = {e["name"]: e["location"] for e in calendar}
+    season["base_url"]        = base_url(year)
+    season.setdefault("notion", {})
+    return season
+
+
+def output_path(season, filename):
+    """Ausgabepfad für Chart-Artefakte – aktuelle Saison im Repo-Root, Archiv-Saisons im eigenen Ordner."""
+    return os.path.join(season.get("output_dir", "."), filename)
+
+
+def is_round_final(year, round_num, season=None):
+    """True, wenn die Ergebnisse dieser Runde sich nicht mehr ändern (→ Cache-fähig)."""
+    if season is None and year in available_seasons():
+        season = load_season(year)
+    if season is None:
+        return year < date.today().year
+    if season.get("finalized"):
+        return True
+    calendar = season["calendar"]
+    if round_num > len(calendar):
+        return False
+    race_date = datetime.strptime(calendar[round_num - 1]["date"], "%Y-%m-%d").date()
+    return date.today() > race_date + timedelta(days=FINAL_AFTER_DAYS)
+
+
+def fetch_round(season, round_num, kind="results"):
+    """Jolpica-Runde einer Registry-Saison – finale Runden aus dem lokalen Cache."""
+    year = season["year"]
+    return get_races(year, round_num, kind, final=is_round_final(year, round_num, season))
+
+
+# ─────────────────────────────────────────────
+# Saisonübergreifende Auswertungen
+# ─────────────────────────────────────────────
+
+def round_count(year):
+    if year in available_seasons():
+        return len(load_season(year)["calendar"])
+    schedule = get_schedule(year, final=year < date.today().year)
+    return len(schedule or [])
+
+
+def constructor_totals(year):
+    """Konstrukteurspunkte (Rennen + Sprint) einer Saison: {Team (API-Name): Punkte}."""
+    season = load_season(year) if year in available_seasons() else None
+    totals = {}
+    for round_num in range(1, round_count(year) + 1):
+        final = is_round_final(year, round_num, season)
+        for kind, key in (("results", "Results"), ("sprint", "SprintResults")):
+            races = get_races(year, round_num, kind, final=final)
+            if not races:
+                continue
+            for res in races[0].get(key, []):
+                team = res["Constructor"]["name"]
+                totals[team] = totals.get(team, 0) + float(res["points"])
+    return totals
+
+
+def multi_season_constructor_totals(years):
+    """{jahr: {team: punkte}} – abgeschlossene Saisons kommen komplett aus dem Cache."""
+    return {year: constructor_totals(year) for year in years}
+
+
+def main(argv):
+    if len(argv) >= 2 and argv[0] == "totals":
+        first, last = int(argv[1]), int(argv[2]) if len(argv) > 2 else int(argv[1])
+        for year, totals in multi_season_constructor_totals(range(first, last + 1)).items():
+            print(f"\n🏆 Konstrukteure {year}")
+            print("-" * 45)
+            for i, (team, pts) in enumerate(sorted(totals.items(), key=lambda t: t[1], reverse=True), 1):
+                print(f"{i:2d}. {team:<30} {pts:6g} Pts")
+        return True
+
+    print("Verwendung: python f1_seasons.py totals <von> [<bis>]")
+    print(f"Verfügbare Saisons: {available_seasons()}")
+    return False
+
+
+if __name__ == "__main__":
+    if not main(sys.argv[1:]):
+        exit(1)
@@ -1,42 +1,63 @@
-import fastf1
-import pandas as pd
 import requests
 import json
-import traceback
 import os
+import sys
 import time
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import f1_log as log
+from f1_reference_cache import load_snapshot, save_snapshot, cached_map, FORCE_REFRESH
+from f1_notion_query import query_database, iter_records, edited_after, relation_contains
+from f1_seasons import load_season
+from f1_schedule import (season_sessions, build_calendar_index, current_weekend, completed_sessions,
+                         load_fastf1, weekend_in_window)
 
 # =============================================================================
 # F1 Session Results → Notion (Long Format) für GitHub Actions
-# Saison 2026 – schreibt in zentrale "Session Results (Long Format)" Datenbank
+# Saison über F1_SEASON (seasons/<jahr>.json) – schreibt in die zentrale
+# "Session Results (Long Format)" Datenbank der Saison
 # =============================================================================
 
 # ─────────────────────────────────────────────
-# KONFIGURATION – diese IDs musst du ersetzen!
+# KONFIGURATION – Notion-IDs stehen in seasons/<jahr>.json
 # ─────────────────────────────────────────────
 NOTION_TOKEN = os.getenv("NOTION_TOKEN")
 if not NOTION_TOKEN:
-    print("❌ Fehler: NOTION_TOKEN environment variable ist nicht gesetzt!")
+    log.error("❌ Fehler: NOTION_TOKEN environment variable ist nicht gesetzt!")
     exit(1)
 
+SEASON = load_season()
+YEAR   = SEASON["year"]
+
+# Notion-IDs der Saison (seasons/<jahr>.json → "notion")
 # ID der zentralen "📊 Session Results (Long Format)" Datenbank
-# → Öffne die DB in Notion, kopiere die ID aus der URL
-RESULTS_DB_ID = "4c7a3557b9174b0d9cb21f7d9aff25d2"  # ← aus URL: notion.so/DIESE-ID
+RESULTS_DB_ID = SEASON["notion"].get("results_db")
 
-# ID der "👤 Drivers 2026" Datenbank (enthält alle Fahrer-Objekte)
-DRIVERS_DB_ID = "3166839379ed8077ac10d568e95178c0"  # Drivers 2026
+# ID der "👤 Drivers <jahr>" Datenbank (enthält alle Fahrer-Objekte)
+DRIVERS_DB_ID = SEASON["notion"].get("drivers_db")
 
 # ID der "Weekends" Datenbank (enthält alle GP-Wochenenden)
-WEEKENDS_DB_ID = "3166839379ed8135b474d348837083bb"
+WEEKENDS_DB_ID = SEASON["notion"].get("weekends_db")
 
-# ID der "👥 Constructors Championship 2026" (Session Results → Team zeigt hierauf)
-CONSTRUCTORS_DB_ID = "3166839379ed81a18ff9c93850213783"
+# ID der "👥 Constructors Championship <jahr>" (Session Results → Team zeigt hierauf)
+CONSTRUCTORS_DB_ID = SEASON["notion"].get("constructors_db")
 
-# ─────────────────────────────────────────────
-# FastF1 Cache
-# ─────────────────────────────────────────────
-fastf1.Cache.enable_cache("./fastf1_cache/")
+# ID der Teams-DB, auf die die "Team"-Relation der Fahrer zeigt (optional).
+# Leer → wird bei Bedarf über parent.database_id einer Team-Seite ermittelt.
+TEAMS_DB_ID = os.getenv("TEAMS_DB_ID", "").strip() or None
+
+# Max. parallele Einzelabrufe von Team-Seiten (Notion-Limit: ~3 Requests/s)
+TEAM_FETCH_WORKERS = 4
+
+# FastF1 (und pandas) werden erst beim ersten Session-Abruf importiert,
+# Cache-Verzeichnis siehe f1_schedule.load_fastf1()
+
+# Opt-in: Telemetrie der schnellsten Quali-Runden (f1_telemetry.py), läuft im
+# Hintergrundprozess – der Notion-Sync wartet nicht darauf
+TELEMETRY_ENABLED = ("--telemetry" in sys.argv
+                     or os.getenv("F1_TELEMETRY", "").strip().lower() in ("1", "true", "yes"))
+_telemetry_jobs = []
 
 # ─────────────────────────────────────────────
 # Notion API Headers
@@ -48,96 +69,17 @@ HEADERS = {
 }
 
 # ─────────────────────────────────────────────
-# 2026 F1 Kalender
-# Sprint-Wochenenden sind mit sprint=True markiert
-# WICHTIG: Datumsangaben bitte vor der Saison gegen den offiziellen
-# FIA-Kalender verifizieren – hier steht das jeweilige Renndatum (Sonntag)
+# Kalender der Saison (Renndatum = Sonntag, Sprint-Wochenenden mit sprint=True)
+# Abgesagte Rennen sind in der Saison-Datei mit "cancelled" markiert.
 # ─────────────────────────────────────────────
-F1_2026_CALENDAR = [
-    {"name": "Australian Grand Prix",    "date": "2026-03-08", "sprint": False},
-    {"name": "Chinese Grand Prix",       "date": "2026-03-15", "sprint": True},
-    {"name": "Japanese Grand Prix",      "date": "2026-03-29", "sprint": False},
-    # {"name": "Bahrain Grand Prix",       "date": "2026-04-12", "sprint": False},  # 2026: abgesagt – regionaler Konflikt; für 2027 wieder einkommentieren
-    # {"name": "Saudi Arabian Grand Prix", "date": "2026-04-19", "sprint": False},  # 2026: abgesagt – regionaler Konflikt; für 2027 wieder einkommentieren
-    {"name": "Miami Grand Prix",         "date": "2026-05-03", "sprint": True},
-    {"name": "Canadian Grand Prix",      "date": "2026-05-25", "sprint": True},
-    {"name": "Monaco Grand Prix",        "date": "2026-06-07", "sprint": False},
-    {"name": "Barcelona-Catalunya Grand Prix",       "date": "2026-06-14", "sprint": False},
-    {"name": "Austrian Grand Prix",      "date": "2026-06-28", "sprint": False},
-    {"name": "British Grand Prix",       "date": "2026-07-05", "sprint": True},
-    {"name": "Belgian Grand Prix",       "date": "2026-07-19", "sprint": False},
-    {"name": "Hungarian Grand Prix",     "date": "2026-07-26", "sprint": False},
-    {"name": "Dutch Grand Prix",         "date": "2026-08-23", "sprint": True},
-    {"name": "Italian Grand Prix",       "date": "2026-09-06", "sprint": False},
-    {"name": "Spanish Grand Prix",       "date": "2026-09-13", "sprint": False},
-    {"name": "Azerbaijan Grand Prix",    "date": "2026-09-26", "sprint": False},
-    {"name": "Singapore Grand Prix",     "date": "2026-10-11", "sprint": True},
-    {"name": "United States Grand Prix", "date": "2026-10-25", "sprint": False},
-    {"name": "Mexican Grand Prix",       "date": "2026-11-01", "sprint": False},
-    {"name": "Brazilian Grand Prix",     "date": "2026-11-08", "sprint": False},
-    {"name": "Las Vegas Grand Prix",     "date": "2026-11-21", "sprint": False},
-    {"name": "Qatar Grand Prix",         "date": "2026-11-29", "sprint": False},
-    {"name": "Abu Dhabi Grand Prix",     "date": "2026-12-06", "sprint": False},
-  
-]
+F1_CALENDAR = SEASON["calendar"]
 
 # Länderkürzel für das Eintrag-Muster (z.B. "AUS Race – NOR")
-GP_COUNTRY_CODE = {
-    "Australian Grand Prix":         "AUS",
-    "Chinese Grand Prix":            "CHN",
-    "Japanese Grand Prix":           "JPN",
-    # "Bahrain Grand Prix":            "BHR",  # 2026: abgesagt – regionaler Konflikt; für 2027 wieder einkommentieren
-    # "Saudi Arabian Grand Prix":      "SAU",  # 2026: abgesagt – regionaler Konflikt; für 2027 wieder einkommentieren
-    "Miami Grand Prix":              "MIA",
-    "Canadian Grand Prix":           "CAN",
-    "Monaco Grand Prix":             "MON",
-    "Barcelona-Catalunya Grand Prix":"BAR",
-    "Austrian Grand Prix":           "AUT",
-    "British Grand Prix":            "GBR",
-    "Belgian Grand Prix":            "BEL",
-    "Hungarian Grand Prix":          "HUN",
-    "Dutch Grand Prix":              "NED",
-    "Italian Grand Prix":            "ITA",
-    "Spanish Grand Prix":            "ESP",
-    "Azerbaijan Grand Prix":         "AZE",
-    "Singapore Grand Prix":          "SGP",
-    "United States Grand Prix":      "USA",
-    "Mexican Grand Prix":            "MEX",
-    "Brazilian Grand Prix":          "BRA",
-    "Las Vegas Grand Prix":          "LVG",
-    "Qatar Grand Prix":              "QAT",
-    "Abu Dhabi Grand Prix":          "UAE",
-}
+GP_COUNTRY_CODE = SEASON["gp_country_code"]
 
 # Mapping FastF1-Name → Name in der Weekends-Datenbank
 # FastF1 nutzt "Australian Grand Prix", die Weekends-DB speichert nur "Australia" etc.
-# Ausnahmen: Miami, Barcelona, Las Vegas, Abu Dhabi (Stadtname statt Land)
-GP_WEEKEND_NAME = {
-    "Australian Grand Prix":         "Australia",
-    "Chinese Grand Prix":            "China",
-    "Japanese Grand Prix":           "Japan",
-    # "Bahrain Grand Prix":            "Bahrain",        # 2026: abgesagt – regionaler Konflikt; für 2027 wieder einkommentieren
-    # "Saudi Arabian Grand Prix":      "Saudi Arabia",   # 2026: abgesagt – regionaler Konflikt; für 2027 wieder einkommentieren
-    "Miami Grand Prix":              "Miami",
-    "Canadian Grand Prix":           "Canada",
-    "Monaco Grand Prix":             "Monaco",
-    "Barcelona-Catalunya Grand Prix":"Barcelona",
-    "Austrian Grand Prix":           "Austria",
-    "British Grand Prix":            "Great Britain",
-    "Belgian Grand Prix":            "Belgium",
-    "Hungarian Grand Prix":          "Hungary",
-    "Dutch Grand Prix":              "Netherlands",
-    "Italian Grand Prix":            "Italy",
-    "Spanish Grand Prix":            "Spain",
-    "Azerbaijan Grand Prix":         "Azerbaijan",
-    "Singapore Grand Prix":          "Singapore",
-    "United States Grand Prix":      "United States",
-    "Mexican Grand Prix":            "Mexico",
-    "Brazilian Grand Prix":          "Brazil",
-    "Las Vegas Grand Prix":          "Las Vegas",
-    "Qatar Grand Prix":              "Qatar",
-    "Abu Dhabi Grand Prix":          "Abu Dhabi",
-}
+GP_WEEKEND_NAME = SEASON["gp_weekend_name"]
 
 # Kurzname des Session-Typs für den Eintrag-Titel
 SESSION_SHORT_NAME = {
@@ -204,109 +146,182 @@ def notion_patch(url, payload):
     return r.json()
 
 
-def load_all_pages_from_db(db_id):
-    """Lädt alle Seiten aus einer Notion-Datenbank (paginiert)."""
-    pages = []
-    cursor = None
-    while True:
-        payload = {"page_size": 100}
-        if cursor:
-            payload["start_cursor"] = cursor
-        result = notion_post(f"https://api.notion.com/v1/databases/{db_id}/query", payload)
-        pages.extend(result.get("results", []))
-        if not result.get("has_more"):
-            break
-        cursor = result.get("next_cursor")
-    return pages
+def iter_db_records(db_id, properties=None, filter=None):
+    """
+    Streamt schlanke Records {"id", "title", <Property>: Wert} aus einer Notion-
+    Datenbank (paginiert, nächste Seite per Prefetch). Filter und Property-
+    Projektion werden serverseitig ausgewertet.
+    """
+    return iter_records(db_id, HEADERS, filter=filter, properties=properties)
+
+
+def db_changed_since(db_id, iso_timestamp):
+    """
+    Günstiger Freshness-Check: True, wenn in der DB seit `iso_timestamp` eine Seite
+    bearbeitet oder angelegt wurde. Ein einziger Request mit page_size=1.
+    """
+    pages = query_database(
+        db_id, HEADERS,
+        filter=edited_after(iso_timestamp, inclusive=True),
+        properties=[], page_size=1, max_results=1
+    )
+    return bool(pages)
 
 
 def build_driver_map(drivers_db_id):
     """
     Erstellt ein Dict: Fahrerkürzel → {"driver_id": page_id, "team_name": str|None}
     team_name wird später gegen constructors_map aufgelöst um die korrekte
-    Constructors Championship 2026 Page-ID zu ermitteln.
+    Constructors Championship Page-ID zu ermitteln.
     """
-    print("📋 Lade Fahrer-Datenbank...")
-    pages = load_all_pages_from_db(drivers_db_id)
+    log.info("📋 Lade Fahrer-Datenbank...")
     driver_map = {}
-    for page in pages:
-        props = page.get("properties", {})
-
-        # Kürzel aus der "Abbreviation"-Property (Rich Text)
-        abbr_list = props.get("Code", {}).get("rich_text", [])
-        abbr = abbr_list[0]["text"]["content"].strip() if abbr_list else ""
-
-        # Name aus der Title-Property
-        name_list = props.get("Name", {}).get("title", [])
-        name = name_list[0]["text"]["content"].strip() if name_list else ""
+    for rec in iter_db_records(drivers_db_id, properties=["Code", "Name", "Team", "Number"]):
+        # Kürzel aus der "Code"-Property (Rich Text), Name aus der Title-Property
+        abbr = rec.get("Code") or ""
+        name = rec["title"]
 
         # Team-Relation zeigt auf die separate Teams-DB (nicht Constructors Championship).
         # Wir speichern die Teams-DB Page-ID hier NICHT – stattdessen wird der
         # Teamname über build_teams_name_map() aufgelöst und dann gegen
         # constructors_map gematcht. Die Teams-DB hat eine "Name"-Title-Property.
-        team_relations = props.get("Team", {}).get("relation", [])
-        teams_db_page_id = team_relations[0]["id"] if team_relations else None
+        team_relations = rec.get("Team") or []
+        teams_db_page_id = team_relations[0] if team_relations else None
 
         # Startnummer (für Sortierung no-time-Fahrer im Qualifying)
-        car_number_raw = props.get("Number", {}).get("number", None)
+        car_number_raw = rec.get("Number")
         car_number = int(car_number_raw) if car_number_raw is not None else 99
 
         if abbr:
             driver_map[abbr] = {
-                "driver_id":      page["id"],
+                "driver_id":      rec["id"],
                 "teams_db_id":    teams_db_page_id,
                 "number":         car_number,
             }
-            print(f"   ✔ {abbr} → {name} (#{car_number})")
+            log.debug(f"   ✔ {abbr} → {name} (#{car_number})")
 
-    print(f"✅ {len(driver_map)} Fahrer geladen")
+    log.info(f"✅ {len(driver_map)} Fahrer geladen")
     return driver_map
 
 
-def build_teams_name_map(teams_db_page_ids):
+def _page_title(page, prop="Name"):
+    name_list = page.get("properties", {}).get(prop, {}).get("title", [])
+    return name_list[0]["text"]["content"].strip() if name_list else ""
+
+
+def _fetch_team_name(page_id):
+    """Lädt eine einzelne Team-Seite. Gibt (page_id, name|None) zurück."""
+    try:
+        # Title-Property der Teams-DB heißt "Name"
+        return page_id, _page_title(notion_get(f"https://api.notion.com/v1/pages/{page_id}"))
+    except Exception as e:
+        log.warning(f"   ⚠️ Konnte Team-Namen für {page_id} nicht laden: {e}")
+        return page_id, None
+
+
+def _teams_name_map_from_pages(page_ids):
+    """Einzelabruf pro Team-Seite, parallel mit begrenztem Pool."""
+    workers = max(1, min(TEAM_FETCH_WORKERS, len(page_ids)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return {pid: name for pid, name in pool.map(_fetch_team_name, page_ids) if name}
+
+
+def _teams_name_map_from_db(page_ids, teams_db_id):
+    """Eine paginierte Abfrage der Teams-DB, Zuordnung der IDs lokal."""
+    teams_name_map = {}
+    if not teams_db_id:
+        # DB-ID über die erste Team-Seite ermitteln (liefert gleich deren Namen mit)
+        page = notion_get(f"https://api.notion.com/v1/pages/{page_ids[0]}")
+        teams_db_id = page.get("parent", {}).get("database_id")
+        if not teams_db_id:
+            raise ValueError("Team-Seite liegt nicht in einer Datenbank")
+        teams_name_map[page["id"]] = _page_title(page)
+
+    wanted = set(page_ids)
+    for rec in iter_db_records(teams_db_id, properties=["Name"]):
+        if rec["id"] in wanted and rec["title"]:
+            teams_name_map[rec["id"]] = rec["title"]
+
+    # IDs, die nicht in dieser DB liegen, einzeln nachladen
+    missing = [pid for pid in page_ids if pid not in teams_name_map]
+    if missing:
+        teams_name_map.update(_teams_name_map_from_pages(missing))
+    return {pid: name for pid, name in teams_name_map.items() if name}
+
+
+def build_teams_name_map(teams_db_page_ids, teams_db_id=TEAMS_DB_ID):
     """
     Lädt Teamnamen aus der Teams-DB für eine Liste von Page-IDs.
     Gibt Dict zurück: teams_db_page_id → team_name (z.B. "McLaren")
+
+    Duplikate (zwei Fahrer pro Team) werden vorab entfernt. Danach wird der
+    günstigere Weg gewählt: ein Query der Teams-DB (1 Request, +1 falls
+    TEAMS_DB_ID unbekannt) oder parallele Einzelabrufe (1 Request pro Team).
     """
-    teams_name_map = {}
-    for page_id in teams_db_page_ids:
-        if not page_id:
-            continue
+    page_ids = list(dict.fromkeys(pid for pid in teams_db_page_ids if pid))
+    if not page_ids:
+        return {}
+
+    db_query_cost = 1 if teams_db_id else 2
+    if len(page_ids) > db_query_cost:
         try:
-            r = requests.get(
-                f"https://api.notion.com/v1/pages/{page_id}",
-                headers=HEADERS
-            )
-            r.raise_for_status()
-            page = r.json()
-            props = page.get("properties", {})
-            # Title-Property der Teams-DB heißt "Name"
-            name_list = props.get("Name", {}).get("title", [])
-            name = name_list[0]["text"]["content"].strip() if name_list else ""
-            if name:
-                teams_name_map[page_id] = name
+            return _teams_name_map_from_db(page_ids, teams_db_id)
         except Exception as e:
-            print(f"   ⚠️ Konnte Team-Namen für {page_id} nicht laden: {e}")
-    return teams_name_map
+            log.warning(f"   ⚠️ Teams-DB-Abfrage fehlgeschlagen: {e} → Einzelabrufe")
+
+    return _teams_name_map_from_pages(page_ids)
+
+
+def resolve_teams_db_id(snapshot, page_ids):
+    """TEAMS_DB_ID, sonst die DB aus dem letzten Snapshot, sonst Parent der ersten Team-Seite."""
+    if TEAMS_DB_ID:
+        return TEAMS_DB_ID
+    known = snapshot.get("entries", {}).get("teams", {}).get("db_id")
+    if known:
+        return known
+    try:
+        page = notion_get(f"https://api.notion.com/v1/pages/{page_ids[0]}")
+    except Exception as e:
+        log.warning(f"   ⚠️ Teams-DB nicht ermittelbar: {e}")
+        return None
+    return page.get("parent", {}).get("database_id")
+
+
+def load_teams_name_map(snapshot, driver_map):
+    """
+    Teamnamen der Team-Relationen – als eigener Snapshot-Eintrag, dessen
+    Freshness gegen die Teams-DB geprüft wird (Umbenennungen dort ändern die
+    Drivers-DB nicht). Neue Team-Seiten in den Relationen erzwingen einen Reload.
+    """
+    page_ids = list(dict.fromkeys(v["teams_db_id"] for v in driver_map.values() if v.get("teams_db_id")))
+    if not page_ids:
+        return {}
+    teams_db_id = resolve_teams_db_id(snapshot, page_ids)
+    if not teams_db_id:
+        # Team-Seiten außerhalb einer DB → kein Freshness-Check möglich, nicht cachen
+        return build_teams_name_map(page_ids)
+
+    cached  = snapshot.get("entries", {}).get("teams", {}).get("data") or {}
+    missing = any(pid not in cached for pid in page_ids)
+    return cached_map(snapshot, "teams", teams_db_id,
+                      lambda: build_teams_name_map(page_ids, teams_db_id), db_changed_since,
+                      force=FORCE_REFRESH or missing)
 
 
 def build_constructors_map(constructors_db_id):
     """
     Erstellt ein Dict: Konstrukteurs-Name → Notion Page ID
-    aus der Constructors Championship 2026 Datenbank.
+    aus der Constructors Championship Datenbank der Saison.
     Die Title-Property heißt dort "Constructor".
     """
-    print("📋 Lade Constructors Championship 2026 Datenbank...")
-    pages = load_all_pages_from_db(constructors_db_id)
+    log.info(f"📋 Lade Constructors Championship {YEAR} Datenbank...")
     constructors_map = {}
-    for page in pages:
-        props = page.get("properties", {})
-        name_list = props.get("Constructor", {}).get("title", [])
-        name = name_list[0]["text"]["content"].strip() if name_list else ""
+    for rec in iter_db_records(constructors_db_id, properties=["Constructor"]):
+        name = rec["title"]
         if name:
-            constructors_map[name] = page["id"]
-            print(f"   ✔ {name} ({page['id']})")
-    print(f"✅ {len(constructors_map)} Konstrukteure geladen")
+            constructors_map[name] = rec["id"]
+            log.debug(f"   ✔ {name} ({rec['id']})")
+    log.info(f"✅ {len(constructors_map)} Konstrukteure geladen")
     return constructors_map
 
 
@@ -314,17 +329,14 @@ def build_weekend_map(weekends_db_id):
     """
     Erstellt ein Dict: GP-Name (z.B. 'Australian Grand Prix') → Notion Page ID
     """
-    print("📋 Lade Weekends-Datenbank...")
-    pages = load_all_pages_from_db(weekends_db_id)
+    log.info("📋 Lade Weekends-Datenbank...")
     weekend_map = {}
-    for page in pages:
-        props = page.get("properties", {})
-        name_list = props.get("Name", {}).get("title", [])
-        name = name_list[0]["text"]["content"].strip() if name_list else ""
+    for rec in iter_db_records(weekends_db_id, properties=["Name"]):
+        name = rec["title"]
         if name:
-            weekend_map[name] = page["id"]
-            print(f"   ✔ {name} ({page['id']})")
-    print(f"✅ {len(weekend_map)} Wochenenden geladen")
+            weekend_map[name] = rec["id"]
+            log.debug(f"   ✔ {name} ({rec['id']})")
+    log.info(f"✅ {len(weekend_map)} Wochenenden geladen")
     return weekend_map
 
 
@@ -334,36 +346,17 @@ def load_existing_entries_for_weekend(results_db_id, weekend_page_id):
     paginierten Abfrage. Gibt Dict zurück: eintrag_title → page_id.
     Ersetzt die alte find_existing_entry()-Einzelabfrage pro Fahrer.
     """
-    print("   📋 Lade existierende Einträge für dieses Weekend (Cache)...")
-    payload = {
-        "filter": {
-            "property": "Weekend",
-            "relation": {"contains": weekend_page_id}
-        },
-        "page_size": 100
-    }
-    pages = []
-    cursor = None
-    while True:
-        if cursor:
-            payload["start_cursor"] = cursor
-        result = notion_post(
-            f"https://api.notion.com/v1/databases/{results_db_id}/query", payload
-        )
-        pages.extend(result.get("results", []))
-        if not result.get("has_more"):
-            break
-        cursor = result.get("next_cursor")
-        payload.pop("start_cursor", None)
-
+    log.info("   📋 Lade existierende Einträge für dieses Weekend (Cache)...")
     cache = {}
-    for page in pages:
-        title_list = page.get("properties", {}).get("Entry", {}).get("title", [])
-        title = title_list[0]["text"]["content"] if title_list else ""
-        if title:
-            cache[title] = page["id"]
-
-    print(f"   ✅ {len(cache)} existierende Einträge gecacht")
+    for rec in iter_db_records(
+        results_db_id,
+        properties=["Entry"],
+        filter=relation_contains("Weekend", weekend_page_id)
+    ):
+        if rec["title"]:
+            cache[rec["title"]] = rec["id"]
+
+    log.info(f"   ✅ {len(cache)} existierende Einträge gecacht")
     return cache
 
 
@@ -376,9 +369,11 @@ def get_qualifying_positions(year, gp_name):
     Gibt ein Dict zurück: Fahrerkürzel → Grid-Position (aus dem Qualifying).
     Wird verwendet um Grid Position beim Race-Eintrag zu setzen.
     """
-    print("   📡 Lade Qualifying-Positionen für Grid Position...")
+    import pandas as pd
+
+    log.info("   📡 Lade Qualifying-Positionen für Grid Position...")
     try:
-        session = fastf1.get_session(year, gp_name, "Q")
+        session = load_fastf1().get_session(year, gp_name, "Q")
         session.load(telemetry=False, weather=False, messages=False)
         quali_map = {}
         for _, row in session.results.iterrows():
@@ -386,10 +381,10 @@ def get_qualifying_positions(year, gp_name):
             pos  = row.get("Position", None)
             if abbr and pos and not pd.isna(pos):
                 quali_map[abbr] = int(pos)
-        print(f"   ✅ {len(quali_map)} Qualifying-Positionen geladen")
+        log.info(f"   ✅ {len(quali_map)} Qualifying-Positionen geladen")
         return quali_map
     except Exception as e:
-        print(f"   ⚠️ Qualifying-Positionen konnten nicht geladen werden: {e}")
+        log.warning(f"   ⚠️ Qualifying-Positionen konnten nicht geladen werden: {e}")
         return {}
 
 
@@ -399,14 +394,14 @@ def get_sprint_qualifying_positions(year, gp_name):
     Verwendet dieselbe Laps-basierte Logik wie FastF1 intern für Qualifying-Sessions:
     split_qualifying_sessions() → schnellste Zeit pro Segment → Sortierung SQ3→SQ2→SQ1.
     """
-    print("   📡 Lade Sprint-Qualifying-Positionen für Grid Position...")
+    log.info("   📡 Lade Sprint-Qualifying-Positionen für Grid Position...")
     try:
-        session = fastf1.get_session(year, gp_name, "SQ")
+        session = load_fastf1().get_session(year, gp_name, "SQ")
         session.load(telemetry=False, weather=False, messages=False)
 
         laps = session.laps
         if laps.empty:
-            print("   ⚠️ Sprint Qualifying: keine Lap-Daten")
+            log.warning("   ⚠️ Sprint Qualifying: keine Lap-Daten")
             return {}
 
         segments = laps.pick_accurate().split_qualifying_sessions()
@@ -445,15 +440,52 @@ def get_sprint_qualifying_positions(year, gp_name):
         ordered = [a for a, _ in sq3 + sq2 + sq1] + no_time
         sq_map = {abbr: pos for pos, abbr in enumerate(ordered, 1)}
 
-        print(f"   ✅ {len(sq_map)} Sprint-Qualifying-Positionen abgeleitet "
-              f"(SQ3: {len(sq3)}, SQ2: {len(sq2)}, SQ1: {len(sq1)}, ohne Zeit: {len(no_time)})")
+        log.info(f"   ✅ {len(sq_map)} Sprint-Qualifying-Positionen abgeleitet "
+                 f"(SQ3: {len(sq3)}, SQ2: {len(sq2)}, SQ1: {len(sq1)}, ohne Zeit: {len(no_time)})")
         return sq_map
 
     except Exception as e:
-        print(f"   ⚠️ Sprint-Qualifying-Positionen konnten nicht geladen werden: {e}")
+        log.warning(f"   ⚠️ Sprint-Qualifying-Positionen konnten nicht geladen werden: {e}")
         return {}
 
 
+def store_session_laps(session, year, gp_name, ff1_id):
+    """Laps der Session in den Runden-Datensatz schreiben – Fehler blockieren den Sync nicht."""
+    weekend = GP_COUNTRY_CODE.get(gp_name, gp_name[:3].upper())
+    try:
+        from f1_laps import write_session_laps  # pyarrow erst hier (Kaltstart)
+        n = write_session_laps(session.laps, year, weekend, ff1_id)
+    except Exception as e:
+        log.warning(f"   ⚠️ Runden-Datensatz nicht geschrieben: {e}")
+        return
+    if n:
+        log.info(f"   🗂️  {n} Runden → Datensatz ({weekend}/{ff1_id})")
+
+
+def start_telemetry(year, gp_name, ff1_id):
+    """Telemetrie-Ingest im Hintergrund anstoßen (nur Q/SQ, nur mit Opt-in)."""
+    weekend = GP_COUNTRY_CODE.get(gp_name, gp_name[:3].upper())
+    try:
+        import f1_telemetry  # NumPy/Prozess-Pool erst bei Opt-in
+        if ff1_id not in f1_telemetry.TELEMETRY_SESSIONS:
+            return
+        _telemetry_jobs.append(f1_telemetry.submit(year, gp_name, weekend, ff1_id))
+    except Exception as e:
+        log.warning(f"   ⚠️ Telemetrie {weekend}/{ff1_id} nicht gestartet: {e}")
+        return
+    log.info(f"   📈 Telemetrie {weekend}/{ff1_id} läuft im Hintergrund")
+
+
+def finish_telemetry():
+    """Am Ende des Laufs auf die Hintergrund-Jobs warten."""
+    if not _telemetry_jobs:
+        return
+    import f1_telemetry
+    log.info("⏳ Warte auf Telemetrie-Ingest...")
+    f1_telemetry.collect(_telemetry_jobs)
+    _telemetry_jobs.clear()
+
+
 def get_session_results(year, gp_name, session_display_name):
     """
     Lädt FastF1-Daten für eine Session und gibt eine Liste von Dicts zurück.
@@ -470,21 +502,24 @@ def get_session_results(year, gp_name, session_display_name):
     """
     ff1_id = FASTF1_SESSION_ID.get(session_display_name)
     if not ff1_id:
-        print(f"   ⚠️ Unbekannter Session-Typ: {session_display_name}")
+        log.warning(f"   ⚠️ Unbekannter Session-Typ: {session_display_name}")
         return None
 
-    print(f"   📡 Lade FastF1: {gp_name} {year} – {session_display_name}...")
+    log.info(f"   📡 Lade FastF1: {gp_name} {year} – {session_display_name}...")
+
+    fastf1 = load_fastf1()
+    import pandas as pd
 
     try:
         session = fastf1.get_session(year, gp_name, ff1_id)
     except ValueError as e:
-        print(f"   ⚠️ Session existiert nicht: {e}")
+        log.warning(f"   ⚠️ Session existiert nicht: {e}")
         return None
 
     try:
         session.load(telemetry=False, weather=False, messages=False)
     except Exception as e:
-        print(f"   ⚠️ Konnte Session nicht laden: {e}")
+        log.warning(f"   ⚠️ Konnte Session nicht laden: {e}")
         return None
 
     # ── Prüfen ob Session bereits stattgefunden hat ────────────────────────
@@ -497,10 +532,10 @@ def get_session_results(year, gp_name, session_display_name):
             session_date_utc = session_date.tz_localize("UTC")
         now_utc = pd.Timestamp.now(tz="UTC")
         if session_date_utc > now_utc:
-            print(f"   ⏳ Session liegt in der Zukunft ({session_date.date()}) → übersprungen")
+            log.info(f"   ⏳ Session liegt in der Zukunft ({session_date.date()}) → übersprungen")
             return None
     except Exception as e:
-        print(f"   ⚠️ Konnte Session-Datum nicht prüfen: {e} – fahre fort")
+        log.warning(f"   ⚠️ Konnte Session-Datum nicht prüfen: {e} – fahre fort")
 
     # Prüfen ob echte Zeitdaten vorliegen
     if session_display_name == "Qualifying":
@@ -508,7 +543,7 @@ def get_session_results(year, gp_name, session_display_name):
         try:
             q1_col = session.results.get("Q1", None)
             if q1_col is not None and pd.isna(q1_col).all():
-                print(f"   ⏳ Qualifying hat noch keine Zeitdaten → übersprungen")
+                log.info(f"   ⏳ Qualifying hat noch keine Zeitdaten → übersprungen")
                 return None
         except Exception:
             pass
@@ -517,15 +552,20 @@ def get_session_results(year, gp_name, session_display_name):
         # Laps are die einzig verlässliche Datenquelle für SQ.
         try:
             if session.laps.empty:
-                print(f"   ⏳ Sprint Qualifying hat noch keine Lap-Daten → übersprungen")
+                log.info(f"   ⏳ Sprint Qualifying hat noch keine Lap-Daten → übersprungen")
                 return None
         except Exception:
             pass
 
+    # Runden einmal in den Parquet-Datensatz (f1_laps.py) – auch für Sessions ohne Klassifikation
+    store_session_laps(session, year, gp_name, ff1_id)
+    if TELEMETRY_ENABLED:
+        start_telemetry(year, gp_name, ff1_id)
+
     results_df = session.results.copy()
 
     if results_df is None or results_df.empty:
-        print("   ⚠️ Keine Ergebnis-Daten vorhanden")
+        log.warning("   ⚠️ Keine Ergebnis-Daten vorhanden")
         return None
 
     is_race_type = session_display_name in ("Race", "Sprint")
@@ -604,7 +644,7 @@ def get_session_results(year, gp_name, session_display_name):
         if session_display_name in ("Practice 1", "Practice 2", "Practice 3"):
             laps = session.laps
             if laps.empty:
-                print("   ⚠️ Keine Runden-Daten")
+                log.warning("   ⚠️ Keine Runden-Daten")
                 return driver_results  # leere Liste → process_session ergänzt alle aus driver_map
             fastest = (
                 laps.groupby("Driver")["LapTime"]
@@ -634,13 +674,13 @@ def get_session_results(year, gp_name, session_display_name):
             # jeder Gruppe nach schnellster Zeit aufsteigend.
             laps = session.laps
             if laps.empty:
-                print("   ⚠️ Keine Lap-Daten für Sprint Qualifying")
+                log.warning("   ⚠️ Keine Lap-Daten für Sprint Qualifying")
                 return driver_results
 
             try:
                 segments = laps.pick_accurate().split_qualifying_sessions()
             except Exception as e:
-                print(f"   ⚠️ split_qualifying_sessions fehlgeschlagen: {e}")
+                log.warning(f"   ⚠️ split_qualifying_sessions fehlgeschlagen: {e}")
                 return driver_results
 
             seg_best = {}  # abbr → {seg_idx: timedelta}
@@ -688,8 +728,8 @@ def get_session_results(year, gp_name, session_display_name):
                     "grid_pos":     None,
                 })
 
-            print(f"   📊 SQ: {len(sq3)} in SQ3, {len(sq2)} nur SQ2, {len(sq1)} nur SQ1, "
-                  f"{len(no_time)} ohne Zeit")
+            log.info(f"   📊 SQ: {len(sq3)} in SQ3, {len(sq2)} nur SQ2, {len(sq1)} nur SQ1, "
+                     f"{len(no_time)} ohne Zeit")
 
         else:
             # ── Qualifying ────────────────────────────────────────────────────
@@ -740,9 +780,9 @@ def get_session_results(year, gp_name, session_display_name):
                 d["position"] = last_timed_pos + i
 
             driver_results = timed_drivers + no_time_drivers
-            print(f"   📊 {len(timed_drivers)} mit Zeit, {len(no_time_drivers)} ohne Zeit (hinten eingereiht)")
+            log.info(f"   📊 {len(timed_drivers)} mit Zeit, {len(no_time_drivers)} ohne Zeit (hinten eingereiht)")
 
-    print(f"   ✅ {len(driver_results)} Fahrer-Ergebnisse geladen")
+    log.info(f"   ✅ {len(driver_results)} Fahrer-Ergebnisse geladen")
     return driver_results
 
 
@@ -767,7 +807,8 @@ def upsert_entry(results_db_id, driver_map, weekend_page_id,
 
     driver_entry = driver_map.get(abbr)
     if not driver_entry:
-        print(f"      ⚠️ Fahrer '{abbr}' nicht in Drivers-DB gefunden → Eintrag übersprungen")
+        log.warning(f"      ⚠️ Fahrer '{abbr}' nicht in Drivers-DB gefunden → Eintrag übersprungen")
+        log.count(session_display_name, "unknown_driver")
         return False
 
     driver_page_id = driver_entry["driver_id"]
@@ -806,7 +847,8 @@ def upsert_entry(results_db_id, driver_map, weekend_page_id,
     if team_page_id:
         properties["Team"] = {"relation": [{"id": team_page_id}]}
     else:
-        print(f"      ⚠️ Kein Team für Fahrer '{abbr}' in Drivers-DB hinterlegt")
+        log.debug(f"      ⚠️ Kein Team für Fahrer '{abbr}' in Drivers-DB hinterlegt")
+        log.count(session_display_name, "no_team")
 
     if driver_data.get("grid_pos") is not None:
         properties["Grid Position"] = {"number": driver_data["grid_pos"]}
@@ -819,7 +861,8 @@ def upsert_entry(results_db_id, driver_map, weekend_page_id,
                 f"https://api.notion.com/v1/pages/{existing_id}",
                 {"properties": properties}
             )
-            print(f"      🔄 Aktualisiert: {eintrag_title}")
+            log.debug(f"      🔄 Aktualisiert: {eintrag_title}")
+            log.count(session_display_name, "updated")
         else:
             new_page = notion_post(
                 "https://api.notion.com/v1/pages",
@@ -831,10 +874,12 @@ def upsert_entry(results_db_id, driver_map, weekend_page_id,
                 f"https://api.notion.com/v1/pages/{new_page['id']}",
                 {"properties": {"Weekend": {"relation": [{"id": weekend_page_id}]}}}
             )
-            print(f"      ✅ Erstellt:     {eintrag_title}")
+            log.debug(f"      ✅ Erstellt:     {eintrag_title}")
+            log.count(session_display_name, "created")
         return True
     except requests.HTTPError as e:
-        print(f"      ❌ API-Fehler für {eintrag_title}: {e.response.status_code} – {e.response.text}")
+        log.error(f"      ❌ API-Fehler für {eintrag_title}: {e.response.status_code} – {e.response.text}")
+        log.count(session_display_name, "failed")
         return False
 
 
@@ -848,14 +893,14 @@ def process_session(year, gp_name, session_display_name,
     if existing_cache is None: existing_cache = {}
     if sprint_qualifying_positions is None: sprint_qualifying_positions = {}
     """Verarbeitet eine komplette Session und schreibt alle Fahrer in Notion."""
-    print(f"\n   ── {session_display_name} ──")
+    log.info(f"\n   ── {session_display_name} ──")
 
     driver_results = get_session_results(year, gp_name, session_display_name)
 
     # FP: Fahrer die keine Runde gefahren sind aus driver_map ergänzen (nach Startnummer)
     if session_display_name in ("Practice 1", "Practice 2", "Practice 3"):
         if driver_results is None:
-            print(f"   ⏭️  Keine Daten verfügbar, Session übersprungen")
+            log.info(f"   ⏭️  Keine Daten verfügbar, Session übersprungen")
             return 0
         timed_abbrs = {d["abbreviation"] for d in driver_results}
         no_lap = sorted(
@@ -873,9 +918,9 @@ def process_session(year, gp_name, session_display_name,
                 "grid_pos":     None,
             })
         if no_lap:
-            print(f"   📋 {len(no_lap)} Fahrer ohne Runde hinten: {[a for a, _ in no_lap]}")
+            log.info(f"   📋 {len(no_lap)} Fahrer ohne Runde hinten: {[a for a, _ in no_lap]}")
     elif not driver_results:
-        print(f"   ⏭️  Keine Daten verfügbar, Session übersprungen")
+        log.info(f"   ⏭️  Keine Daten verfügbar, Session übersprungen")
         return 0
 
     # Grid Position für Race aus Qualifying setzen
@@ -900,30 +945,32 @@ def process_session(year, gp_name, session_display_name,
         if ok:
             success += 1
 
-    print(f"   📊 {session_display_name} fertig: {success}/{len(driver_results)} Einträge")
+    # Eine Zeile pro Session statt einer pro Fahrer (Einzelzeilen: --verbose)
+    log.summary(session_display_name, f"   📊 {session_display_name} fertig: {success}/{len(driver_results)} Einträge")
     return success
 
 
 def process_race_weekend(year, gp_name, is_sprint_weekend,
                          results_db_id, driver_map, weekend_map,
-                         constructors_map=None, teams_name_map=None):
+                         constructors_map=None, teams_name_map=None,
+                         only_sessions=None):
     if constructors_map is None: constructors_map = {}
     if teams_name_map is None: teams_name_map = {}
-    """Verarbeitet alle Sessions eines Rennwochenendes."""
+    """
+    Verarbeitet die Sessions eines Rennwochenendes.
+    only_sessions: nur diese Sessions (z.B. vom Scheduler), None → alle.
+    """
 
-    print(f"\n{'='*60}")
-    print(f"🏁 {gp_name} {year}")
-    print(f"   Sprint-Format: {'Ja' if is_sprint_weekend else 'Nein'}")
-    print(f"{'='*60}")
+    log.banner(f"🏁 {gp_name} {year}\n   Sprint-Format: {'Ja' if is_sprint_weekend else 'Nein'}")
 
     # Weekend-Seite in Notion suchen
     # Weekends-DB nutzt Ländernamen (z.B. "Australia"), nicht FastF1-Namen ("Australian Grand Prix")
     weekend_db_name = GP_WEEKEND_NAME.get(gp_name, gp_name)
     weekend_page_id = weekend_map.get(weekend_db_name)
     if not weekend_page_id:
-        print(f"❌ '{weekend_db_name}' nicht in Weekends-DB gefunden!")
-        print(f"   FastF1-Name: '{gp_name}'")
-        print(f"   Verfügbare Wochenenden: {list(weekend_map.keys())}")
+        log.error(f"❌ '{weekend_db_name}' nicht in Weekends-DB gefunden!")
+        log.info(f"   FastF1-Name: '{gp_name}'")
+        log.info(f"   Verfügbare Wochenenden: {list(weekend_map.keys())}")
         return False
 
     # Qualifying-Positionen vorab laden (für Grid Position beim Race)
@@ -937,6 +984,9 @@ def process_race_weekend(year, gp_name, is_sprint_weekend,
 
     # Sessions des Wochenendes
     sessions = SPRINT_SESSIONS if is_sprint_weekend else NORMAL_SESSIONS
+    if only_sessions:
+        sessions = [s for s in sessions if s in only_sessions]
+        log.info(f"   Sessions: {', '.join(sessions) or '–'}")
     total_success = 0
 
     for session_display_name in sessions:
@@ -952,14 +1002,10 @@ def process_race_weekend(year, gp_name, is_sprint_weekend,
             )
             total_success += n
         except Exception as e:
-            print(f"   ❌ Unerwarteter Fehler bei {session_display_name}:")
-            traceback.print_exc()
+            log.exception(f"   ❌ Unerwarteter Fehler bei {session_display_name}:")
 
     expected = len(sessions) * 22  # 22 Fahrer pro Session
-    print(f"\n{'='*60}")
-    print(f"✅ {gp_name} abgeschlossen")
-    print(f"   {total_success} Einträge geschrieben (erwartet ~{expected})")
-    print(f"{'='*60}\n")
+    log.banner(f"✅ {gp_name} abgeschlossen\n   {total_success} Einträge geschrieben (erwartet ~{expected})")
     return total_success > 0
 
 
@@ -967,19 +1013,39 @@ def process_race_weekend(year, gp_name, is_sprint_weekend,
 # RENNWOCHENENDE AUTOMATISCH ERKENNEN
 # =============================================================================
 
-def get_current_race_weekend():
+def load_calendar_index():
+    """Session-Index aus dem FastF1 Event-Schedule – None, wenn der Schedule nicht ladbar ist."""
+    try:
+        return build_calendar_index(season_sessions(YEAR))
+    except Exception as e:
+        log.warning(f"⚠️  FastF1 Event-Schedule nicht verfügbar ({e}) → Datumsfenster aus dem Kalender")
+        return None
+
+
+def get_current_race_weekend(calendar_index=None):
     """
-    Erkennt automatisch das aktuelle/letzte Rennwochenende anhand des Datums.
-    Sucht im Fenster von -7 bis +3 Tagen um das Renndatum.
+    Erkennt automatisch das aktuelle/letzte Rennwochenende.
+    Mit Kalender-Index: laufendes, gerade beendetes oder nächstes Wochenende per Binärsuche.
+    Ohne Index: Fenster von -7 bis +3 Tagen um das Renndatum im Saison-Kalender.
     """
-    print("🔍 Suche aktuelles Rennwochenende...")
+    log.info("🔍 Suche aktuelles Rennwochenende...")
+
+    if calendar_index is not None:
+        weekend, status = current_weekend(calendar_index)
+        if weekend:
+            log.info(f"🏁 Erkannt: {weekend['event']} ({status})")
+            return YEAR, weekend["event"], weekend["sprint"]
+        log.error("❌ Kein Rennwochenende im aktuellen Zeitfenster gefunden")
+        log.info("   Tipp: RACE_NAME manuell als Umgebungsvariable setzen")
+        return None, None, False
+
     current_date = datetime.now().date()
-    print(f"📅 Heute: {current_date}")
+    log.info(f"📅 Heute: {current_date}")
 
     best_event = None
     best_diff  = float('inf')
 
-    for event in F1_2026_CALENDAR:
+    for event in F1_CALENDAR:
         race_date = datetime.strptime(event["date"], "%Y-%m-%d").date()
         diff = (current_date - race_date).days
         if -7 <= diff <= 3:
@@ -988,11 +1054,11 @@ def get_current_race_weekend():
                 best_diff  = diff
 
     if best_event:
-        print(f"🏁 Erkannt: {best_event['name']} (Diff: {best_diff:+d} Tage)")
-        return 2026, best_event["name"], best_event["sprint"]
+        log.info(f"🏁 Erkannt: {best_event['name']} (Diff: {best_diff:+d} Tage)")
+        return YEAR, best_event["name"], best_event["sprint"]
 
-    print("❌ Kein Rennwochenende im aktuellen Zeitfenster gefunden")
-    print("   Tipp: RACE_NAME manuell als Umgebungsvariable setzen")
+    log.error("❌ Kein Rennwochenende im aktuellen Zeitfenster gefunden")
+    log.info("   Tipp: RACE_NAME manuell als Umgebungsvariable setzen")
     return None, None, False
 
 
@@ -1001,18 +1067,15 @@ def get_current_race_weekend():
 # =============================================================================
 
 def main():
-    print("🚀 Starte F1 Session Results Update (2026 – Long Format)")
-    print(f"   Timestamp: {datetime.now().isoformat()}\n")
-
-    # ── Fahrer- und Weekend-Maps einmal laden ──────────────────────────────
-    driver_map  = build_driver_map(DRIVERS_DB_ID)
-    weekend_map = build_weekend_map(WEEKENDS_DB_ID)
-
-    if not driver_map:
-        print("❌ Keine Fahrer in Drivers-DB gefunden. Abbruch.")
-        exit(1)
-    if not weekend_map:
-        print("❌ Keine Wochenenden in Weekends-DB gefunden. Abbruch.")
+    log.setup(sys.argv[1:])
+    log.info(f"🚀 Starte F1 Session Results Update ({YEAR} – Long Format)")
+    log.info(f"   Timestamp: {datetime.now().isoformat()}\n")
+
+    missing = [k for k, v in (("results_db", RESULTS_DB_ID), ("drivers_db", DRIVERS_DB_ID),
+                              ("weekends_db", WEEKENDS_DB_ID), ("constructors_db", CONSTRUCTORS_DB_ID))
+               if not v]
+    if missing:
+        log.error(f"❌ seasons/{YEAR}.json enthält keine Notion-IDs für: {', '.join(missing)}. Abbruch.")
         exit(1)
 
     # ── Manuelles Override über Env-Variablen (optional) ──────────────────
@@ -1020,45 +1083,85 @@ def main():
     # Rennen zu erzwingen, unabhängig vom aktuellen Datum.
     override_name = os.getenv("RACE_NAME", "").strip()
 
+    # SESSION_NAMES z.B. "Sprint,Qualifying" (vom Scheduler) → nur diese Sessions
+    only_sessions = [s.strip() for s in os.getenv("SESSION_NAMES", "").split(",") if s.strip()] or None
+
+    # Schnelle Vorprüfung über den Saison-Kalender – an rennfreien Tagen endet der
+    # Lauf hier, bevor FastF1/pandas importiert oder Notion abgefragt werden
+    if not override_name and not only_sessions and weekend_in_window(SEASON) is None:
+        log.info("💤 Kein Rennwochenende im Kalenderfenster – nichts zu tun.")
+        exit(0)
+
+    # Kalender-Index einmal aufbauen (FastF1 Event-Schedule, gecacht)
+    calendar_index = load_calendar_index()
+
     if override_name:
-        print(f"⚙️  Manuelles Override: RACE_NAME='{override_name}'")
-        match = next((e for e in F1_2026_CALENDAR if e["name"] == override_name), None)
+        log.info(f"⚙️  Manuelles Override: RACE_NAME='{override_name}'")
+        match = next((e for e in F1_CALENDAR if e["name"] == override_name), None)
         if not match:
-            print(f"❌ '{override_name}' nicht im Kalender gefunden. Abbruch.")
+            log.error(f"❌ '{override_name}' nicht im Kalender gefunden. Abbruch.")
             exit(1)
-        year, gp_name, is_sprint = 2026, match["name"], match["sprint"]
+        year, gp_name, is_sprint = YEAR, match["name"], match["sprint"]
     else:
-        year, gp_name, is_sprint = get_current_race_weekend()
+        year, gp_name, is_sprint = get_current_race_weekend(calendar_index)
 
     if not gp_name:
-        print("❌ Kein Rennwochenende ermittelt. Abbruch.")
+        log.error("❌ Kein Rennwochenende ermittelt. Abbruch.")
         exit(0)  # FIX: exit(0) statt exit(1), da an rennfreien Tagen/Wochenenden völlig normal
 
+    # Nur Sessions verarbeiten, die laut Zeitplan schon beendet sind
+    if calendar_index is not None and not only_sessions:
+        only_sessions = [s["session"] for s in completed_sessions(calendar_index, gp_name)]
+        if not only_sessions:
+            log.info(f"⏭️  {gp_name}: noch keine Session beendet. Nichts zu tun.")
+            exit(0)
+
+    # ── Fahrer- und Weekend-Maps einmal laden (lokaler Snapshot mit TTL) ──
+    reference_snapshot = load_snapshot()
+
+    driver_map  = cached_map(reference_snapshot, "drivers", DRIVERS_DB_ID,
+                             lambda: build_driver_map(DRIVERS_DB_ID), db_changed_since)
+    weekend_map = cached_map(reference_snapshot, "weekends", WEEKENDS_DB_ID,
+                             lambda: build_weekend_map(WEEKENDS_DB_ID), db_changed_since)
+
+    if not driver_map:
+        log.error("❌ Keine Fahrer in Drivers-DB gefunden. Abbruch.")
+        exit(1)
+    if not weekend_map:
+        log.error("❌ Keine Wochenenden in Weekends-DB gefunden. Abbruch.")
+        exit(1)
+    save_snapshot(reference_snapshot)
+
     # ── Constructors Championship Map laden ───────────────────────────────
-    constructors_map = build_constructors_map(CONSTRUCTORS_DB_ID)
+    constructors_map = cached_map(reference_snapshot, "constructors", CONSTRUCTORS_DB_ID,
+                                  lambda: build_constructors_map(CONSTRUCTORS_DB_ID),
+                                  db_changed_since)
     if not constructors_map:
-        print("⚠️  Constructors Championship 2026 ist leer – Team-Relation wird nicht gesetzt.")
+        log.warning(f"⚠️  Constructors Championship {YEAR} ist leer – Team-Relation wird nicht gesetzt.")
+    save_snapshot(reference_snapshot)
 
-    # Teams-Namen aus der Teams-DB auflösen (einmalig für alle Fahrer) ──────
-    all_teams_db_ids = [v["teams_db_id"] for v in driver_map.values() if v.get("teams_db_id")]
-    teams_name_map = build_teams_name_map(all_teams_db_ids)
-    print(f"✅ {len(teams_name_map)} Team-Namen aufgelöst")
+    # Teams-Namen aus der Teams-DB (eigener Snapshot-Eintrag) ────────────────
+    teams_name_map = load_teams_name_map(reference_snapshot, driver_map)
+    save_snapshot(reference_snapshot)
+    log.info(f"✅ {len(teams_name_map)} Team-Namen aufgelöst")
     for tid, tname in teams_name_map.items():
         constructor_id = constructors_map.get(tname, "❌ NICHT in Constructors Championship")
-        print(f"   {tname} → {constructor_id}")
+        log.debug(f"   {tname} → {constructor_id}")
 
     # ── Verarbeitung ───────────────────────────────────────────────────────
     success = process_race_weekend(
         year, gp_name, is_sprint,
         RESULTS_DB_ID, driver_map, weekend_map,
         constructors_map=constructors_map,
-        teams_name_map=teams_name_map
+        teams_name_map=teams_name_map,
+        only_sessions=only_sessions
     )
+    finish_telemetry()
 
     if success:
-        print("✅ Update erfolgreich abgeschlossen!")
+        log.info("✅ Update erfolgreich abgeschlossen!")
     else:
-        print("❌ Update fehlgeschlagen oder keine Daten verfügbar!")
+        log.error("❌ Update fehlgeschlagen oder keine Daten verfügbar!")
         exit(0)  # FIX: exit(0) statt exit(1), damit GitHub Actions bei fehlenden Session-Daten (z.B. vor dem Qualifying) nicht fehlschlägt
 
 
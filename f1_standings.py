@@ -0,0 +1,177 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import f1_log as log
+from f1_circuits import circuit_index, report
+from f1_entities import entity_index
+from f1_notion_query import iter_records, any_of, select_equals, TITLE
+from f1_season_store import open_synced_store
+
+# =============================================================================
+# Gemeinsame Datenbasis für Championship-Tabellen und Charts: ein Long-Format
+# DataFrame (Spalte, Fahrer-idx, Team-idx, Punkte, Platz, Sprint) pro
+# Race/Sprint-Ergebnis, aggregiert per pandas groupby.
+#
+# Quelle über STANDINGS_SOURCE:
+#   jolpica – lokaler Season Store (Jolpica-Runden, siehe f1_season_store.py)
+#   notion  – eine gefilterte Abfrage der Session Results DB (Session Type
+#             Race/Sprint), die f1_session_results.py ohnehin befüllt
+# =============================================================================
+
+STANDINGS_SOURCE = os.getenv("STANDINGS_SOURCE", "jolpica").strip().lower() or "jolpica"
+
+STANDINGS_SESSION_TYPES = ("Race", "Sprint")
+
+FRAME_COLUMNS = ["col", "driver", "constructor", "points", "position", "sprint"]
+
+# Countback bei Punktgleichheit: Siege, dann 2. Plätze, ... bis zu diesem Platz
+COUNTBACK_PLACES = 20
+
+
+def frame_from_store(season, registry, offline=False):
+    """Race/Sprint-Zeilen aus dem Season Store → Long-Format DataFrame."""
+    index = circuit_index(season, offline=offline)
+    report(season, index)
+    conn = open_synced_store(offline=offline)
+    df = pd.read_sql_query(
+        "SELECT driver_id, driver_name, constructor_id, constructor_name, round, session, points, position "
+        "FROM results WHERE season=?", conn, params=(season["year"],)
+    )
+    if df.empty:
+        return pd.DataFrame(columns=FRAME_COLUMNS)
+
+    # Unbekannte IDs einmal pro Entity registrieren, dann vektorisiert mappen
+    drivers = df.drop_duplicates("driver_id")
+    teams   = df.drop_duplicates("constructor_id")
+    driver_idx = {d: entity_index(registry, "driver", d, n)
+                  for d, n in zip(drivers["driver_id"], drivers["driver_name"])}
+    team_idx   = {c: entity_index(registry, "constructor", c, n)
+                  for c, n in zip(teams["constructor_id"], teams["constructor_name"])}
+
+    frame = pd.DataFrame({
+        "col":         df["round"].map(index["by_round"]),
+        "driver":      df["driver_id"].map(driver_idx),
+        "constructor": df["constructor_id"].map(team_idx),
+        "points":      df["points"],
+        "position":    df["position"],
+        "sprint":      df["session"] == "sprint",
+    })
+    return frame.dropna(subset=["col"]).astype({"col": int})
+
+
+def frame_from_notion(season, registry, headers):
+    """
+    Race/Sprint-Einträge der Session Results DB → Long-Format DataFrame.
+    Eine Abfrage, nur Titel, Points und Classification. Der Titel "AUS Race – NOR"
+    liefert Wochenende (Länderkürzel), Session und Fahrer (FastF1-Kürzel); das
+    Team kommt aus der Entity-Registry.
+    """
+    results_db = season["notion"].get("results_db")
+    if not results_db:
+        raise ValueError(f"seasons/{season['year']}.json enthält keine results_db")
+
+    records = iter_records(
+        results_db, headers,
+        filter=any_of(*(select_equals("Session Type", t) for t in STANDINGS_SESSION_TYPES)),
+        properties=[TITLE, "Points", "Classification"]
+    )
+
+    col_by_code = {e["code"]: col for col, e in enumerate(season["calendar"])}
+    rows, skipped = [], 0
+    for rec in records:
+        points = rec.get("Points") or 0
+        code, _, rest = rec["title"].partition(" ")
+        sprint = rest.startswith("Sprint")
+        abbr   = rest.rpartition("– ")[2].strip()
+        col    = col_by_code.get(code)
+        driver = registry["driver_by_code"].get(abbr)
+        if col is None or driver is None:
+            skipped += 1
+            continue
+        team = registry["constructor_idx"].get(registry["drivers"][driver].get("constructor"))
+        rows.append((col, driver, team, points, rec.get("Classification"), sprint))
+
+    log.info(f"📥 Session Results DB: {len(rows) + skipped} Race/Sprint-Einträge"
+             + (f", {skipped} nicht zuordenbar übersprungen" if skipped else ""))
+    return pd.DataFrame(rows, columns=FRAME_COLUMNS)
+
+
+def notion_headers():
+    return {
+        "Authorization": f"Bearer {os.environ['NOTION_TOKEN']}",
+        "Content-Type": "application/json",
+        "Notion-Version": "2022-06-28"
+    }
+
+
+def load_results_frame(season, registry, offline=False, source=STANDINGS_SOURCE):
+    """Long-Format DataFrame aller Race/Sprint-Ergebnisse der Saison aus der gewählten Quelle."""
+    if source == "notion":
+        log.info("📡 Quelle: Session Results DB (Notion)")
+        return frame_from_notion(season, registry, notion_headers())
+    if source != "jolpica":
+        raise ValueError(f"Unbekannte STANDINGS_SOURCE '{source}' (jolpica | notion)")
+    return frame_from_store(season, registry, offline=offline)
+
+
+def points_matrix(frame, registry, entity, num_cols):
+    """
+    groupby([entity, col]).sum() → Matrix [Entity-idx, Spalte] (int).
+    Rückgabe: (matrix, seen) – seen[i] True, wenn Entity i Ergebnisse hat.
+    """
+    n      = len(registry[f"{entity}s"])
+    matrix = np.zeros((n, num_cols), dtype=np.int32)
+    seen   = np.zeros(n, dtype=bool)
+    frame  = frame.dropna(subset=[entity])
+    if frame.empty:
+        return matrix, seen
+    sums = frame.groupby([entity, "col"], sort=False)["points"].sum()
+    rows = sums.index.get_level_values(0).to_numpy(dtype=np.intp)
+    cols = sums.index.get_level_values(1).to_numpy(dtype=np.intp)
+    matrix[rows, cols] = sums.to_numpy().astype(np.int32)
+    seen[rows] = True
+    return matrix, seen
+
+
+def completed_columns(frame, num_cols):
+    """[bool] pro Spalte – True, sobald Rennen oder Sprint Ergebnisse haben."""
+    done = [False] * num_cols
+    for col in frame["col"].unique():
+        done[int(col)] = True
+    return done
+
+
+def countback_matrix(frame, registry, entity, num_cols, places=COUNTBACK_PLACES):
+    """
+    Grand-Prix-Platzierungen (ohne Sprints) je Entity, Spalte und Platz 1..places:
+    Matrix [Entity-idx, Spalte, Platz] (int), kumuliert über die Spalten.
+    """
+    n      = len(registry[f"{entity}s"])
+    counts = np.zeros((n, num_cols, places), dtype=np.int32)
+    races  = frame[~frame["sprint"].astype(bool)].dropna(subset=[entity, "position"])
+    races  = races[(races["position"] >= 1) & (races["position"] <= places)]
+    if not races.empty:
+        np.add.at(counts, (races[entity].to_numpy(dtype=np.intp),
+                           races["col"].to_numpy(dtype=np.intp),
+                           races["position"].to_numpy(dtype=np.intp) - 1), 1)
+    return np.cumsum(counts, axis=1)
+
+
+def rank_progression(cumulative, countback):
+    """
+    WM-Position nach jeder Spalte für alle Entities in einem lexsort:
+    Punkte, dann Siege, 2. Plätze, ... (Countback), zuletzt Registry-Reihenfolge.
+    cumulative [Entity, Spalte], countback [Entity, Spalte, Platz] → ranks [Entity, Spalte] (1 = Führender)
+    """
+    n, num_cols = cumulative.shape
+    idx  = np.broadcast_to(np.arange(n)[:, None], (n, num_cols))
+    # lexsort: letzter Schlüssel ist der wichtigste → Plätze rückwärts, Punkte zuletzt
+    keys = [idx] + [-countback[:, :, p] for p in range(countback.shape[2] - 1, -1, -1)] + [-cumulative]
+    order = np.lexsort(np.stack(keys), axis=0)
+
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, n + 1)[:, None], axis=0)
+    return ranks
+
@@ -0,0 +1,324 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import requests
+
+import f1_log as log
+from f1_artifacts import write_json_artifact, status_label, json_number
+from f1_laps import read_laps
+from f1_notion_query import NOTION_API, iter_records, is_not_empty, find_or_create_database, TITLE
+from f1_seasons import load_season, output_path
+from f1_standings import notion_headers
+
+# =============================================================================
+# Stint-Analyse pro Wochenende aus dem Runden-Datensatz (f1_laps.py):
+#   Stints         – Reifenmischung, erste/letzte Runde, Anzahl Runden
+#   Pace           – Median der Clean-Air-Runden (grün, keine In-/Out-Lap,
+#                    mindestens CLEAN_AIR_GAP s hinter dem Vordermann)
+#   Degradation    – Steigung LapTime ~ TyreLife (kleinste Quadrate pro Stint,
+#                    s/Runde, ohne Spritkorrektur)
+#   Boxenstopps    – Anzahl Stints − 1
+#
+# Alles gruppiert über die ganze Saison auf einmal (Wochenende × Session ×
+# Fahrer × Stint) – ein Rennen dauert wenige Millisekunden.
+#
+#   python f1_stints.py              # f1_stints.json
+#   python f1_stints.py --notion     # zusätzlich fehlende Zeilen in der Stints-DB
+# =============================================================================
+
+SEASON = load_season()
+YEAR   = SEASON["year"]
+
+# Nur Sessions mit Renndistanz – in Training/Quali sind Stints keine Renn-Stints
+STINT_SESSIONS = ("R", "S")
+
+CLEAN_AIR_GAP = float(os.getenv("STINT_CLEAN_AIR_GAP", "2.0"))
+
+# Langsamer als 107 % des Session-Medians → VSC-Reste, Dreher, Verkehr
+SLOW_LAP_FACTOR = 1.07
+
+# Unter so vielen repräsentativen Runden keine Steigung
+MIN_SLOPE_LAPS = 4
+
+COLUMNS = ["weekend", "session", "Driver", "Team", "LapNumber", "Stint", "Compound",
+           "TyreLife", "LapTime", "Time", "PitIn", "PitOut", "TrackStatus", "IsAccurate"]
+
+GROUP_KEYS = ["weekend", "session", "Driver", "Stint"]
+
+COMPOUND_COLORS = {
+    "SOFT": "#da291c", "MEDIUM": "#ffd12e", "HARD": "#f0f0ec",
+    "INTERMEDIATE": "#43b02a", "WET": "#0067ad", "UNKNOWN": "#888888",
+}
+
+STINTS_DB_ID   = SEASON["notion"].get("stints_db")
+PARENT_PAGE_ID = SEASON["notion"].get("constructors_parent_page")
+DB_TITLE       = f"Stint Analysis {YEAR}"
+
+
+# ─────────────────────────────────────────────
+# Runden-Filter
+# ─────────────────────────────────────────────
+
+def representative_laps(laps):
+    """Maske: grüne, gezeitete Runden ohne Start-, In- und Out-Lap und ohne Ausreißer."""
+    mask = (
+        laps["LapTime"].notna()
+        & (laps["LapNumber"] > 1)
+        & (laps["TrackStatus"] == "1")
+        & ~laps["PitIn"].fillna(False).astype(bool)
+        & ~laps["PitOut"].fillna(False).astype(bool)
+        & laps["IsAccurate"].fillna(False).astype(bool)
+    )
+    median = laps["LapTime"].where(mask).groupby([laps["weekend"], laps["session"]],
+                                                 observed=True).transform("median")
+    return mask & (laps["LapTime"] < median * SLOW_LAP_FACTOR)
+
+
+def clean_air_laps(laps):
+    """Maske: Abstand zum Vordermann am Rundenende ≥ CLEAN_AIR_GAP (Führender immer)."""
+    order = laps.sort_values(["weekend", "session", "LapNumber", "Time"])
+    gap   = order.groupby(["weekend", "session", "LapNumber"], observed=True)["Time"].diff()
+    clean = gap.isna() | (gap >= CLEAN_AIR_GAP)
+    # Ohne Session-Zeit (ältere Partitionen) gilt jede Runde als frei
+    clean |= order["Time"].isna()
+    return clean.reindex(laps.index)
+
+
+# ─────────────────────────────────────────────
+# Kennzahlen
+# ─────────────────────────────────────────────
+
+def degradation_slopes(x, y, codes, n_groups):
+    """
+    Steigung der Regressionsgeraden y = a + b·x pro Gruppe, vektorisiert über
+    alle Gruppen: Summen per np.bincount, dann die Normalgleichung
+    b = (n·Σxy − Σx·Σy) / (n·Σx² − (Σx)²). NaN bei zu wenigen Punkten.
+    """
+    n   = np.bincount(codes, minlength=n_groups).astype(float)
+    sx  = np.bincount(codes, weights=x, minlength=n_groups)
+    sy  = np.bincount(codes, weights=y, minlength=n_groups)
+    sxx = np.bincount(codes, weights=x * x, minlength=n_groups)
+    sxy = np.bincount(codes, weights=x * y, minlength=n_groups)
+    denom = n * sxx - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (n * sxy - sx * sy) / denom
+    return np.where((n >= MIN_SLOPE_LAPS) & (denom > 0), slope, np.nan)
+
+
+def stint_summary(laps):
+    """Eine Zeile pro Wochenende × Session × Fahrer × Stint."""
+    laps = laps[laps["Stint"].notna()]
+    stints = laps.groupby(GROUP_KEYS, observed=True, sort=True).agg(
+        team=("Team", "first"),
+        compound=("Compound", "first"),
+        start_lap=("LapNumber", "min"),
+        end_lap=("LapNumber", "max"),
+        laps=("LapNumber", "size"),
+        tyre_age=("TyreLife", "min"),
+    )
+
+    rep = laps[representative_laps(laps)]
+    stints["pace"] = rep[clean_air_laps(rep)].groupby(GROUP_KEYS, observed=True)["LapTime"].median()
+
+    if rep.empty:
+        # Keine grüne Runde (nur SC/VSC, TrackStatus fehlt in alten Partitionen)
+        stints["degradation"] = np.nan
+    else:
+        # Gruppencodes in derselben Reihenfolge wie der Stint-Index
+        codes = pd.MultiIndex.from_frame(rep[GROUP_KEYS]).map(
+            pd.Series(np.arange(len(stints)), index=stints.index)
+        ).to_numpy(dtype=np.int64)
+        stints["degradation"] = degradation_slopes(
+            rep["TyreLife"].to_numpy(float), rep["LapTime"].to_numpy(float), codes, len(stints)
+        )
+    stints["tyre_age"] = stints["tyre_age"] - 1    # TyreLife der ersten Runde zählt diese mit
+    return stints.reset_index()
+
+
+def driver_summary(laps, stints):
+    """Eine Zeile pro Wochenende × Session × Fahrer: Pace, Stopps, Endposition."""
+    keys = ["weekend", "session", "Driver"]
+    rep  = laps[representative_laps(laps)]
+    drivers = stints.groupby(keys, observed=True).agg(
+        team=("team", "first"), laps=("laps", "sum"), stints=("Stint", "nunique")
+    )
+    drivers["pit_stops"] = drivers["stints"] - 1
+    drivers["pace"] = rep[clean_air_laps(rep)].groupby(keys, observed=True)["LapTime"].median()
+
+    # Reihenfolge: wer am weitesten kam, dann Position in seiner letzten Runde
+    last = laps.sort_values("LapNumber").groupby(keys, observed=True).last()
+    drivers["position"] = last["Position"] if "Position" in last else np.nan
+    return drivers.reset_index()
+
+
+def season_laps():
+    laps = read_laps(columns=COLUMNS + ["Position"], year=YEAR, session=list(STINT_SESSIONS))
+    for name in ("weekend", "session", "Driver", "Team", "Compound"):
+        laps[name] = laps[name].astype("string").astype("category")
+    return laps
+
+
+# ─────────────────────────────────────────────
+# Chart-JSON
+# ─────────────────────────────────────────────
+
+def build_weekends(stints, drivers):
+    """{code: {session: {"drivers": [...]}}} – pro Fahrer die Stints als Liste."""
+    by_driver = {key: group for key, group in stints.groupby(["weekend", "session", "Driver"], observed=True)}
+    weekends = {}
+    ordered = drivers.sort_values(["weekend", "session", "laps", "position"],
+                                  ascending=[True, True, False, True])
+    for row in ordered.itertuples(index=False):
+        group = by_driver[(row.weekend, row.session, row.Driver)]
+        entry = weekends.setdefault(row.weekend, {}).setdefault(row.session, {"drivers": []})
+        entry["drivers"].append({
+            "driver":    row.Driver,
+            "team":      row.team,
+            "laps":      int(row.laps),
+            "pit_stops": int(row.pit_stops),
+            "pace":      json_number(row.pace),
+            "stints": [
+                {
+                    "stint":       int(s.Stint),
+                    "compound":    s.compound if isinstance(s.compound, str) else "UNKNOWN",
+                    "start_lap":   int(s.start_lap),
+                    "end_lap":     int(s.end_lap),
+                    "laps":        int(s.laps),
+                    "tyre_age":    None if pd.isna(s.tyre_age) else int(s.tyre_age),
+                    "pace":        json_number(s.pace),
+                    "degradation": json_number(s.degradation, 4),
+                }
+                for s in group.itertuples(index=False)
+            ],
+        })
+    return weekends
+
+
+def load_previous(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(weekends):
+    """Neue Wochenenden ergänzen; ältere bleiben erhalten, auch ohne lokalen Datensatz."""
+    path = output_path(SEASON, "f1_stints.json")
+    previous = load_previous(path)
+    merged = {**previous.get("weekends", {}), **weekends}
+    order  = {e["code"]: i for i, e in enumerate(SEASON["calendar"])}
+    data = {
+        "season":   YEAR,
+        "weekends": {code: merged[code] for code in sorted(merged, key=lambda c: order.get(c, 99))},
+        "compoundColors":  COMPOUND_COLORS,
+        "backgroundColor": "#191919",
+    }
+    changed = write_json_artifact(path, data)
+    log.info(f"✅ f1_stints.json {status_label(changed)} – {len(data['weekends'])} Wochenenden")
+    return data
+
+
+# ─────────────────────────────────────────────
+# Notion: eine Zeile pro Stint
+# ─────────────────────────────────────────────
+
+def stint_title(weekend, session, driver, stint):
+    return f"{weekend} {session} · {driver} S{stint}"
+
+
+def stints_database(headers):
+    number = {"number": {}}
+    properties = {
+        "Stint": {"title": {}}, "Weekend": {"select": {}}, "Session": {"select": {}},
+        "Driver": {"select": {}}, "Team": {"select": {}}, "Compound": {"select": {}},
+        "Stint Nr": number, "Start Lap": number, "End Lap": number, "Laps": number,
+        "Tyre Age": number, "Pace (s)": number, "Degradation (s/Lap)": number, "Pit Stops": number,
+    }
+    return find_or_create_database(headers, STINTS_DB_ID, DB_TITLE, properties,
+                                   PARENT_PAGE_ID, config_key="stints_db")
+
+
+def stint_properties(weekend, session, driver, stint):
+    def select(value):
+        return {"select": {"name": value}} if value else {"select": None}
+
+    return {
+        "Stint":    {"title": [{"text": {"content": stint_title(weekend, session, driver["driver"],
+                                                                stint["stint"])}}]},
+        "Weekend":  select(weekend),
+        "Session":  select(session),
+        "Driver":   select(driver["driver"]),
+        "Team":     select(driver["team"]),
+        "Compound": select(stint["compound"]),
+        "Stint Nr":  {"number": stint["stint"]},
+        "Start Lap": {"number": stint["start_lap"]},
+        "End Lap":   {"number": stint["end_lap"]},
+        "Laps":      {"number": stint["laps"]},
+        "Tyre Age":  {"number": stint["tyre_age"]},
+        "Pace (s)":  {"number": stint["pace"]},
+        "Degradation (s/Lap)": {"number": stint["degradation"]},
+        "Pit Stops": {"number": driver["pit_stops"]},
+    }
+
+
+def sync_notion(weekends):
+    """
+    Legt fehlende Stint-Zeilen an. Runden ändern sich nach der Session nicht –
+    vorhandene Zeilen bleiben unangetastet, jeder Lauf schreibt nur Neues.
+    """
+    headers = notion_headers()
+    db_id = stints_database(headers)
+    if not db_id:
+        return False
+
+    existing = {rec["title"] for rec in iter_records(db_id, headers, filter=is_not_empty(TITLE, "title"),
+                                                      properties=[TITLE])}
+    log.info(f"📋 Bestehende Stints in DB: {len(existing)}")
+
+    for weekend, sessions in weekends.items():
+        for session, entry in sessions.items():
+            for driver in entry["drivers"]:
+                for stint in driver["stints"]:
+                    if stint_title(weekend, session, driver["driver"], stint["stint"]) in existing:
+                        log.count("stints", "skipped")
+                        continue
+                    r = requests.post(f"{NOTION_API}/pages", headers=headers, timeout=30, json={
+                        "parent": {"database_id": db_id},
+                        "properties": stint_properties(weekend, session, driver, stint),
+                    })
+                    if r.ok:
+                        log.count("stints", "created")
+                    else:
+                        log.count("stints", "failed")
+                        log.error(f"❌ Erstell-Fehler {driver['driver']} S{stint['stint']}: "
+                                  f"{r.status_code} – {r.text}")
+
+    counts = log.summary("stints", "📊 Stints → Notion")
+    return not counts.get("failed")
+
+
+def main(argv):
+    log.setup(argv)
+    log.info(f"🛞 Stint-Analyse {YEAR}...")
+    laps = season_laps()
+    if laps.empty:
+        log.info("💤 Keine Renn-Runden im Datensatz")
+        weekends = {}
+    else:
+        stints   = stint_summary(laps)
+        drivers  = driver_summary(laps, stints)
+        weekends = build_weekends(stints, drivers)
+        log.info(f"   {len(laps):,} Runden → {len(stints)} Stints, {len(drivers)} Fahrer-Sessions")
+
+    data = write_json(weekends)
+    if "--notion" not in argv:
+        return True
+    return sync_notion(data["weekends"])
+
+
+if __name__ == "__main__":
+    if not main(sys.argv[1:]):
+        exit(1)
@@ -0,0 +1,345 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from datetime import date
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from f1_entities import load_entities
+from f1_season_store import SCHEMA, STORE_PATH, open_store, sync_season
+from f1_seasons import available_seasons, load_season, output_path, season_year
+from f1_standings import (frame_from_store, points_matrix, completed_columns,
+                          countback_matrix, rank_progression)
+
+# =============================================================================
+# Streamlit-Dashboard auf Basis des lokalen Season Store (siehe
+# f1_season_store.py): Standings, kumulativer Verlauf, Session-Ergebnisse im
+# Long-Format und Prediction Accuracy – für alle Saisons in seasons/.
+#
+# Datenschicht:
+#   st.cache_resource – SQLite-Verbindung (+ Lock), geladene FastF1-Sessions
+#   st.cache_data     – DataFrames pro Saison, Schlüssel = (Jahr, Store-Version)
+# Die Store-Version (Zeilen, Runden, Punktsumme) wird bei jedem Rerun mit
+# einer Index-Abfrage gelesen – neue/korrigierte Runden ergeben einen neuen
+# Cache-Schlüssel, unveränderte Daten kommen direkt aus dem Cache.
+# FastF1 wird erst importiert und geladen, wenn im FastF1-Tab eine Session
+# angefordert wird.
+#
+#   streamlit run f1_streamlit_integration.py
+# =============================================================================
+
+FASTF1_CACHE_DIR = "./fastf1_cache/"
+
+FASTF1_SESSIONS = {
+    "Practice 1":        "FP1",
+    "Practice 2":        "FP2",
+    "Practice 3":        "FP3",
+    "Qualifying":        "Q",
+    "Sprint Qualifying": "SQ",
+    "Sprint":            "S",
+    "Race":              "R",
+}
+NORMAL_SESSIONS = ["Practice 1", "Practice 2", "Practice 3", "Qualifying", "Race"]
+SPRINT_SESSIONS = ["Practice 1", "Sprint Qualifying", "Sprint", "Qualifying", "Race"]
+
+# Alte Saison-Versionen fallen nach so vielen Einträgen aus dem Cache
+CACHE_ENTRIES = 32
+
+
+# ─────────────────────────────────────────────
+# Datenschicht
+# ─────────────────────────────────────────────
+
+@st.cache_resource
+def store_connection():
+    """
+    Eine Leseverbindung für alle Sessions/Threads des Servers. sqlite3-Objekte
+    sind nicht threadsicher – Zugriffe nur über store_reader() (serialisiert).
+    """
+    os.makedirs(os.path.dirname(STORE_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(STORE_PATH, check_same_thread=False)
+    conn.executescript(SCHEMA)
+    return conn, threading.Lock()
+
+
+@contextmanager
+def store_reader():
+    conn, lock = store_connection()
+    with lock:
+        yield conn
+
+
+def store_version(year):
+    """
+    Cache-Schlüssel einer Saison: ändert sich, sobald Runden angehängt oder
+    bestehende Ergebnisse korrigiert werden (append_round ersetzt die Zeilen).
+    """
+    with store_reader() as conn:
+        rounds = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(final), 0) FROM rounds WHERE season=?", (year,)
+        ).fetchone()
+        results = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(points), 0), COALESCE(SUM(position), 0) FROM results WHERE season=?",
+            (year,)
+        ).fetchone()
+    return rounds + results
+
+
+@st.cache_data(show_spinner=False)
+def season_meta(year):
+    season = load_season(year)
+    return {
+        "labels":   season["race_locations"],
+        "calendar": season["calendar"],
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def season_results(year, version):
+    """Alle Race/Sprint-Zeilen der Saison im Long-Format (eine Zeile pro Fahrer und Session)."""
+    with store_reader() as conn:
+        df = pd.read_sql_query(
+            "SELECT r.round, r.session, d.race_name, r.position, r.grid, r.driver_code, "
+            "r.driver_name, r.constructor_name, r.points, r.status "
+            "FROM results r LEFT JOIN rounds d USING (season, round, session) "
+            "WHERE r.season=? ORDER BY r.round, r.session, r.position IS NULL, r.position",
+            conn, params=(year,)
+        )
+    # Wiederholte Strings als Kategorien → kleinere Cache-Einträge, schnelleres Filtern
+    for col in ("session", "race_name", "driver_code", "driver_name", "constructor_name", "status"):
+        df[col] = df[col].astype("category")
+    return df
+
+
+def _standings_table(entities, ranks, countback, cumulative, last, with_team=None):
+    order = np.argsort(ranks[:, last], kind="stable")
+    rows = []
+    for i in order:
+        row = {
+            "Pos":    int(ranks[i, last]),
+            "Name":   entities[i]["name"],
+            "Punkte": int(cumulative[i, last]),
+            "Siege":  int(countback[i, last, 0]),
+            "Podien": int(countback[i, last, :3].sum()),
+        }
+        if with_team is not None:
+            row["Team"] = with_team(entities[i])
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+@st.cache_data(show_spinner="Berechne Standings …", max_entries=CACHE_ENTRIES)
+def season_standings(year, version):
+    """
+    Standings und kumulativer Verlauf für Fahrer und Konstrukteure – dieselbe
+    Aggregation wie die Charts (f1_standings.py), nur aus dem lokalen Store.
+    Rückgabe: {"driver"|"constructor": {"table", "progress"}, "played"}
+    """
+    season   = load_season(year)
+    registry = load_entities(season)
+    frame    = frame_from_store(season, registry, offline=True)
+    labels   = season["race_locations"]
+    played   = completed_columns(frame, len(labels))
+    last     = max((col for col, p in enumerate(played) if p), default=None)
+
+    teams = {c["id"]: c["name"] for c in registry["constructors"]}
+    data  = {"played": sum(played)}
+    for entity in ("driver", "constructor"):
+        entities = registry[f"{entity}s"]
+        matrix, _  = points_matrix(frame, registry, entity, len(labels))
+        cumulative = np.cumsum(matrix, axis=1)
+        countback  = countback_matrix(frame, registry, entity, len(labels))
+        ranks      = rank_progression(cumulative, countback)
+
+        if last is None:
+            data[entity] = {"table": pd.DataFrame(), "progress": pd.DataFrame()}
+            continue
+
+        with_team = (lambda e: teams.get(e.get("constructor"), "")) if entity == "driver" else None
+        table = _standings_table(entities, ranks, countback, cumulative, last, with_team)
+
+        # Long-Format für Altair: nur gefahrene Spalten
+        cols = [col for col, p in enumerate(played) if p]
+        progress = pd.DataFrame({
+            "Runde":  np.tile(np.array(labels)[cols], len(entities)),
+            "Spalte": np.tile(cols, len(entities)),
+            "Name":   np.repeat([e["name"] for e in entities], len(cols)),
+            "Punkte": cumulative[:, cols].ravel(),
+            "Pos":    ranks[:, cols].ravel(),
+        })
+        data[entity] = {
+            "table":    table,
+            "progress": progress,
+            "colors":   {e["name"]: e["color"] for e in entities},
+        }
+    return data
+
+
+@st.cache_data(show_spinner=False)
+def prediction_accuracy(path, mtime):
+    """f1_prediction_chart.json – mtime als Schlüssel, neu gelesen nur nach Änderung."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@st.cache_resource(show_spinner="Lade FastF1-Session …", max_entries=8)
+def fastf1_session(year, gp_name, session_id):
+    """FastF1 erst hier importieren – die übrigen Tabs bleiben davon unberührt."""
+    import fastf1
+
+    os.makedirs(FASTF1_CACHE_DIR, exist_ok=True)
+    fastf1.Cache.enable_cache(FASTF1_CACHE_DIR)
+    session = fastf1.get_session(year, gp_name, session_id)
+    session.load(telemetry=False, weather=False, messages=False)
+    return session
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def session_laps(year, gp_name, session_id):
+    """Rundenzeiten einer FastF1-Session als schlanker DataFrame (Sekunden)."""
+    laps = fastf1_session(year, gp_name, session_id).laps
+    df = pd.DataFrame({
+        "Fahrer":   laps["Driver"].astype(str),
+        "Runde":    laps["LapNumber"].astype("Int64"),
+        "Zeit (s)": laps["LapTime"].dt.total_seconds(),
+        "Reifen":   laps["Compound"].astype(str),
+    })
+    return df.dropna(subset=["Zeit (s)"])
+
+
+# ─────────────────────────────────────────────
+# Ansichten
+# ─────────────────────────────────────────────
+
+def progress_chart(progress, colors, labels, field):
+    names = list(colors)
+    chart = alt.Chart(progress).mark_line(point=True).encode(
+        x=alt.X("Runde:N", sort=labels, title=None),
+        y=alt.Y(f"{field}:Q", scale=alt.Scale(reverse=field == "Pos"), title=field),
+        color=alt.Color("Name:N", scale=alt.Scale(domain=names, range=[colors[n] for n in names]),
+                        legend=alt.Legend(title=None)),
+        tooltip=["Name", "Runde", "Punkte", "Pos"],
+    )
+    return chart.properties(height=480)
+
+
+def show_standings(data, entity, labels):
+    standings = data[entity]
+    if standings["table"].empty:
+        st.info("Noch keine Ergebnisse im Season Store.")
+        return
+    st.dataframe(standings["table"], hide_index=True, use_container_width=True)
+    field = st.radio("Verlauf", ["Punkte", "Pos"], horizontal=True, key=f"{entity}_field")
+    st.altair_chart(progress_chart(standings["progress"], standings["colors"], labels, field),
+                    use_container_width=True)
+
+
+def show_sessions(results):
+    if results.empty:
+        st.info("Noch keine Ergebnisse im Season Store.")
+        return
+    races   = list(dict.fromkeys(results["race_name"].dropna()))  # Rundenreihenfolge
+    race    = st.selectbox("Rennen", ["Alle"] + races)
+    session = st.segmented_control("Session", ["race", "sprint"], selection_mode="multi",
+                                   default=["race", "sprint"])
+    view = results
+    if race != "Alle":
+        view = view[view["race_name"] == race]
+    if session:
+        view = view[view["session"].isin(session)]
+    st.dataframe(view, hide_index=True, use_container_width=True)
+
+
+def show_predictions(year):
+    path = output_path(load_season(year), "f1_prediction_chart.json")
+    if not os.path.exists(path):
+        st.info("Keine f1_prediction_chart.json für diese Saison.")
+        return
+    data = prediction_accuracy(path, os.stat(path).st_mtime_ns)
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Accuracy", f"{data['accuracy']}%")
+    c2.metric("Richtig", data["correct"])
+    c3.metric("Falsch", data["incorrect"])
+
+
+def show_fastf1(year, calendar):
+    today = date.today().isoformat()
+    events = [e for e in calendar if e["date"] <= today]
+    if not events:
+        st.info("Noch kein Rennwochenende gefahren.")
+        return
+
+    c1, c2 = st.columns(2)
+    event = c1.selectbox("Grand Prix", events, index=len(events) - 1, format_func=lambda e: e["name"])
+    name  = c2.selectbox("Session", SPRINT_SESSIONS if event.get("sprint") else NORMAL_SESSIONS,
+                         index=4)
+    # Erst auf Anforderung laden – FastF1 braucht beim ersten Mal mehrere Sekunden
+    if not st.toggle("FastF1-Daten laden", key=f"ff1_{year}"):
+        return
+
+    try:
+        laps = session_laps(year, event["name"], FASTF1_SESSIONS[name])
+    except Exception as e:
+        st.error(f"FastF1-Session nicht ladbar: {e}")
+        return
+    if laps.empty:
+        st.info("Keine Rundenzeiten vorhanden.")
+        return
+
+    fastest = laps.loc[laps.groupby("Fahrer")["Zeit (s)"].idxmin()].sort_values("Zeit (s)")
+    st.dataframe(fastest, hide_index=True, use_container_width=True)
+    chart = alt.Chart(laps).mark_line().encode(
+        x="Runde:Q", y=alt.Y("Zeit (s):Q", scale=alt.Scale(zero=False)), color="Fahrer:N",
+        tooltip=["Fahrer", "Runde", "Zeit (s)", "Reifen"],
+    )
+    st.altair_chart(chart.properties(height=420), use_container_width=True)
+
+
+def sidebar():
+    seasons = sorted(available_seasons(), reverse=True)
+    default = season_year()
+    year = st.sidebar.selectbox("Saison", seasons, index=seasons.index(default) if default in seasons else 0)
+    version = store_version(year)
+    st.sidebar.caption(f"Store: {version[0]} Sessions, {version[2]} Ergebniszeilen")
+
+    if st.sidebar.button("🔄 Neue Runden von Jolpica holen"):
+        with st.spinner("Synchronisiere Season Store …"):
+            with closing(open_store()) as conn:
+                written = sync_season(conn, load_season(year))
+        st.sidebar.success(f"{written} Zeilen neu/aktualisiert")
+        # Neue Store-Version → neue Cache-Schlüssel; alte Einträge verdrängt max_entries
+        version = store_version(year)
+    return year, version
+
+
+def main():
+    st.set_page_config(page_title="F1 Dashboard", page_icon="🏁", layout="wide")
+    year, version = sidebar()
+    meta = season_meta(year)
+
+    st.title(f"🏁 F1 {year}")
+    data = season_standings(year, version)
+    st.caption(f"{data['played']}/{len(meta['labels'])} Runden gefahren")
+
+    drivers, constructors, sessions, predictions, fastf1_tab = st.tabs(
+        ["🏎️ Fahrer", "🏗️ Konstrukteure", "📋 Sessions", "🎯 Predictions", "⏱️ FastF1"]
+    )
+    with drivers:
+        show_standings(data, "driver", meta["labels"])
+    with constructors:
+        show_standings(data, "constructor", meta["labels"])
+    with sessions:
+        show_sessions(season_results(year, version))
+    with predictions:
+        show_predictions(year)
+    with fastf1_tab:
+        show_fastf1(year, meta["calendar"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+import json
+import math
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import f1_log as log
+from f1_seasons import load_season
+
+# =============================================================================
+# Opt-in Telemetrie der schnellsten Qualifying-Runden: Car Data einmal pro
+# Session laden, pro Fahrer die schnellste Runde auf feste Distanz-Bins
+# (BIN_METERS) mitteln und als Memory-Mapped NumPy-Datei ablegen
+# (data/telemetry/year=2026/weekend=AUS/session=Q/traces.npy, Form
+# Fahrer × Kanal × Bin, dazu index.json). Charts lesen die Traces per
+# np.load(mmap_mode="r"), ohne FastF1 erneut zu laden.
+#
+# f1_session_results.py startet den Ingest mit --telemetry bzw.
+# F1_TELEMETRY=1 in einem Hintergrundprozess (submit()/collect()) – der
+# Ergebnis-Sync wartet nicht auf den Telemetrie-Download.
+#
+#   python f1_telemetry.py ingest AUS Q          # synchron, z.B. nachträglich
+#   python f1_telemetry.py chart AUS Q VER NOR   # Speed-Trace-Vergleich neu rendern
+#   python f1_telemetry.py info
+# =============================================================================
+
+SEASON = load_season()
+YEAR   = SEASON["year"]
+
+TELEMETRY_DIR = os.getenv("TELEMETRY_DIR", "./data/telemetry")
+
+# FastF1-Session-IDs mit Telemetrie-Ingest
+TELEMETRY_SESSIONS = ("Q", "SQ")
+
+BIN_METERS = 10
+
+# Kanäle in traces.npy (Brake als Anteil gebremster Samples pro Bin)
+CHANNELS = ("Speed", "Throttle", "Brake", "nGear", "RPM")
+
+# Ohne Fahrerauswahl: die schnellsten N im Vergleich
+COMPARE_DRIVERS = 3
+
+# Ein Download gleichzeitig reicht – FastF1 lädt ohnehin seriell
+TELEMETRY_WORKERS = 1
+
+_pool = None
+
+
+def telemetry_dir(year, weekend, session):
+    return os.path.join(TELEMETRY_DIR, f"year={year}", f"weekend={weekend}", f"session={session}")
+
+
+def has_traces(year, weekend, session):
+    directory = telemetry_dir(year, weekend, session)
+    return all(os.path.exists(os.path.join(directory, name)) for name in ("traces.npy", "index.json"))
+
+
+# ─────────────────────────────────────────────
+# Downsampling
+# ─────────────────────────────────────────────
+
+def distance_bins(distance, values, n_bins, bin_m=BIN_METERS):
+    """
+    Mittelt die Kanäle (values: Kanal × Sample) pro Distanz-Bin. Leere Bins
+    (Samples liegen bei hoher Geschwindigkeit >10 m auseinander) werden
+    linear zwischen den Nachbarn interpoliert.
+    """
+    idx    = np.minimum((distance // bin_m).astype(np.int64), n_bins - 1)
+    counts = np.bincount(idx, minlength=n_bins)
+    filled = counts > 0
+    centers = (np.arange(n_bins) + 0.5) * bin_m
+    out = np.empty((len(values), n_bins), dtype=np.float32)
+    for c, v in enumerate(values):
+        sums = np.bincount(idx, weights=v, minlength=n_bins)
+        out[c] = np.interp(centers, centers[filled], sums[filled] / counts[filled])
+    return out
+
+
+def lap_channels(car):
+    """FastF1 Car Data (mit Distance) → (Distanz, Kanal × Sample)."""
+    values = np.vstack([car[name].to_numpy(dtype=float) for name in CHANNELS])
+    return car["Distance"].to_numpy(dtype=float), values
+
+
+def fastest_laps(session):
+    """[(Fahrer, Rundenzeit in s, Car Data)] der schnellsten Runde je Fahrer, sortiert."""
+    laps = session.laps
+    result = []
+    for driver in laps["Driver"].dropna().unique():
+        lap = laps.pick_drivers(driver).pick_fastest()
+        if lap is None or lap.empty or lap["LapTime"] != lap["LapTime"]:  # NaT
+            continue
+        car = lap.get_car_data().add_distance()
+        if len(car) > 1:
+            result.append((driver, lap["LapTime"].total_seconds(), car))
+    return sorted(result, key=lambda item: item[1])
+
+
+# ─────────────────────────────────────────────
+# Speicher (Memory-Mapped .npy)
+# ─────────────────────────────────────────────
+
+def write_traces(year, weekend, session, laps, meta):
+    """
+    Schreibt alle Fahrer direkt in eine gemappte .npy-Datei (atomar über temp +
+    rename). Die Distanz jeder Runde wird auf die Median-Rundenlänge skaliert,
+    damit alle Fahrer dieselben Bins teilen.
+    """
+    ends = np.array([lap_channels(car)[0][-1] for _, _, car in laps])
+    track_length = float(np.median(ends))
+    n_bins = math.ceil(track_length / BIN_METERS)
+
+    directory = telemetry_dir(year, weekend, session)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "traces.npy")
+    tmp  = os.path.join(directory, "traces.tmp.npy")
+
+    traces = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32,
+                                       shape=(len(laps), len(CHANNELS), n_bins))
+    for i, (_, _, car) in enumerate(laps):
+        distance, values = lap_channels(car)
+        traces[i] = distance_bins(distance / distance[-1] * track_length, values, n_bins)
+    traces.flush()
+    del traces
+    os.replace(tmp, path)
+
+    meta = {**meta, "channels": list(CHANNELS), "bin_m": BIN_METERS,
+            "track_length": round(track_length, 1)}
+    with open(os.path.join(directory, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return n_bins
+
+
+def load_traces(year, weekend, session):
+    """→ (traces als read-only memmap, index.json)."""
+    directory = telemetry_dir(year, weekend, session)
+    with open(os.path.join(directory, "index.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    return np.load(os.path.join(directory, "traces.npy"), mmap_mode="r"), meta
+
+
+# ─────────────────────────────────────────────
+# Ingest (läuft im Hintergrundprozess)
+# ─────────────────────────────────────────────
+
+def ingest_session(year, gp_name, weekend, session_id, overwrite=False):
+    """Lädt die Session einmal mit Telemetrie, speichert die Traces und rendert den Vergleich."""
+    if not overwrite and has_traces(year, weekend, session_id):
+        # Traces kommen aus dem Actions-Cache, die Charts nicht – fehlende nachrendern
+        # (render_all überspringt vorhandene, unveränderte Charts)
+        charts = render_speed_trace(year, weekend, session_id)
+        return {"weekend": weekend, "session": session_id, "skipped": True, "charts": charts}
+
+    from f1_schedule import load_fastf1
+    session = load_fastf1().get_session(year, gp_name, session_id)
+    session.load(laps=True, telemetry=True, weather=False, messages=False)
+
+    laps = fastest_laps(session)
+    if not laps:
+        return {"weekend": weekend, "session": session_id, "drivers": 0}
+
+    results = session.results.set_index("Abbreviation")
+    drivers = [driver for driver, _, _ in laps]
+    meta = {
+        "drivers":   drivers,
+        "teams":     [str(results["TeamName"].get(d, "")) for d in drivers],
+        "colors":    [team_color(results["TeamColor"].get(d)) for d in drivers],
+        "lap_times": [round(t, 3) for _, t, _ in laps],
+    }
+    n_bins = write_traces(year, weekend, session_id, laps, meta)
+    charts = render_speed_trace(year, weekend, session_id)
+    return {"weekend": weekend, "session": session_id, "drivers": len(drivers),
+            "bins": n_bins, "charts": charts}
+
+
+def team_color(value):
+    """TeamColor aus FastF1 (ohne #) – fehlt bei Ersatzfahrern teils (NaN)."""
+    import pandas as pd  # nur im Ingest-Prozess, dort ohnehin durch FastF1 geladen
+    return f"#{value}" if pd.notna(value) and str(value).strip() else "#888888"
+
+
+def submit(year, gp_name, weekend, session_id):
+    """Startet den Ingest im Hintergrund-Pool → Future (Ergebnis über collect())."""
+    global _pool
+    if _pool is None:
+        # spawn statt fork: der Elternprozess hat bereits Threads (Notion-Pool)
+        _pool = ProcessPoolExecutor(max_workers=TELEMETRY_WORKERS,
+                                    mp_context=multiprocessing.get_context("spawn"))
+    return _pool.submit(ingest_session, year, gp_name, weekend, session_id)
+
+
+def collect(futures):
+    """Wartet auf alle Ingest-Jobs – Fehler werden gemeldet, brechen aber nichts ab."""
+    global _pool
+    for future in futures:
+        try:
+            result = future.result()
+        except Exception as e:
+            log.warning(f"   ⚠️ Telemetrie fehlgeschlagen: {e}")
+            continue
+        label = f"{result['weekend']}/{result['session']}"
+        if result.get("skipped"):
+            rendered = ", ".join(result.get("charts", []))
+            log.info(f"   💾 Telemetrie {label}: bereits vorhanden" + (f", Charts: {rendered}" if rendered else ""))
+        else:
+            log.info(f"   📈 Telemetrie {label}: {result['drivers']} Fahrer, "
+                     f"{result.get('bins', 0)} Bins, Charts: {', '.join(result.get('charts', [])) or '–'}")
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+# ─────────────────────────────────────────────
+# Speed-Trace-Vergleich
+# ─────────────────────────────────────────────
+
+def unknown_drivers(meta, drivers):
+    return [d for d in drivers if d not in meta["drivers"]]
+
+
+def speed_trace_payload(traces, meta, title, drivers=None):
+    """
+    Speed über Distanz plus Zeitabstand zum ersten Fahrer der Auswahl – der
+    Abstand wird aus der Geschwindigkeit pro Bin integriert (Δt = Bin / v).
+    Unbekannte Fahrer → ValueError (siehe unknown_drivers()).
+    """
+    if drivers:
+        missing = unknown_drivers(meta, drivers)
+        if missing:
+            raise ValueError(f"Keine Telemetrie für {', '.join(missing)}")
+        rows = [meta["drivers"].index(d) for d in drivers]
+    else:
+        rows = list(range(min(COMPARE_DRIVERS, len(meta["drivers"]))))
+    speed = np.asarray(traces[rows, CHANNELS.index("Speed")], dtype=float)
+    bin_m = meta["bin_m"]
+    elapsed = np.cumsum(bin_m / np.maximum(speed / 3.6, 1.0), axis=1)
+    delta = elapsed - elapsed[0]
+    distance = (np.arange(speed.shape[1]) + 0.5) * bin_m
+    return {
+        "kind":     "speed_trace",
+        "title":    title,
+        "distance": [int(d) for d in distance],
+        "series": [
+            {"title": f"{meta['drivers'][r]}  {meta['lap_times'][r]:.3f}",
+             "color": meta["colors"][r],
+             "speed": [round(float(v), 1) for v in speed[i]],
+             "delta": [round(float(v), 3) for v in delta[i]]}
+            for i, r in enumerate(rows)
+        ],
+    }
+
+
+def render_speed_trace(year, weekend, session, drivers=None):
+    from f1_render import render_all  # matplotlib erst zum Rendern
+    traces, meta = load_traces(year, weekend, session)
+    name  = f"speed_trace_{weekend}_{session}"
+    title = f"{weekend} {session} {year} – Speed Trace"
+    return render_all({name: speed_trace_payload(traces, meta, title, drivers)})
+
+
+def main(argv):
+    log.setup(argv)
+    args = [a for a in argv if not a.startswith("--")]
+
+    if args[:1] == ["info"]:
+        if not os.path.isdir(TELEMETRY_DIR):
+            log.info(f"💤 Keine Telemetrie unter {TELEMETRY_DIR}")
+            return True
+        for root, _, files in sorted(os.walk(TELEMETRY_DIR)):
+            if "traces.npy" in files:
+                traces = np.load(os.path.join(root, "traces.npy"), mmap_mode="r")
+                log.info(f"   {os.path.relpath(root, TELEMETRY_DIR)}: {traces.shape[0]} Fahrer × "
+                         f"{traces.shape[2]} Bins")
+        return True
+
+    if args[:1] == ["ingest"] and len(args) >= 2:
+        code    = args[1]
+        session = args[2] if len(args) > 2 else "Q"
+        gp_name = next((e["name"] for e in SEASON["calendar"] if e["code"] == code), None)
+        if not gp_name:
+            log.error(f"❌ {code} nicht im Kalender {YEAR}")
+            return False
+        result = ingest_session(YEAR, gp_name, code, session, overwrite="--force" in argv)
+        if result.get("skipped"):
+            log.info(f"💾 Telemetrie {code}/{session} bereits vorhanden (--force überschreibt)")
+            return True
+        log.info(f"✅ Telemetrie {code}/{session}: {result['drivers']} Fahrer")
+        return result["drivers"] > 0
+
+    if args[:1] == ["chart"] and len(args) >= 3:
+        if not has_traces(YEAR, args[1], args[2]):
+            log.error(f"❌ Keine Telemetrie für {args[1]}/{args[2]} – zuerst ingest")
+            return False
+        drivers = [d.upper() for d in args[3:]]
+        _, meta = load_traces(YEAR, args[1], args[2])
+        missing = unknown_drivers(meta, drivers)
+        if missing:
+            log.error(f"❌ Keine Telemetrie für {', '.join(missing)} in {args[1]}/{args[2]} "
+                      f"(verfügbar: {', '.join(meta['drivers'])})")
+            return False
+        rendered = render_speed_trace(YEAR, args[1], args[2], drivers=drivers or None)
+        log.info(f"✅ {len(rendered)} Chart(s) neu gerendert")
+        return True
+
+    print("Verwendung: python f1_telemetry.py info | ingest <wochenende> [Q|SQ] [--force] | "
+          "chart <wochenende> <session> [fahrer ...]")
+    return False
+
+
+if __name__ == "__main__":
+    if not main(sys.argv[1:]):
+        exit(1)
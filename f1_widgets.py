@@ -0,0 +1,205 @@
+import gzip
+import json
+import os
+import re
+import sys
+
+import requests
+
+import f1_log as log
+from f1_artifacts import write_artifact, status_label
+from f1_seasons import load_season, output_path
+
+try:
+    import brotli
+except ImportError:  # optional – ohne brotli nur .gz
+    brotli = None
+
+# =============================================================================
+# Statischer Build aller Notion-Widgets: Daten und Chart.js werden in die
+# HTML-Datei eingebettet, Achsengrenzen vorberechnet, Markup minifiziert und
+# zusätzlich als .gz/.br abgelegt. Jedes Embed lädt so genau eine Datei.
+#
+# Quellen bleiben lesbar im Repo-Root (f1_*_chart.html, f1_countdown_<jahr>.html)
+# und funktionieren weiterhin ohne Build (laden dann die JSON-Dateien).
+#
+#   python f1_widgets.py              # alle Widgets → public/
+#   python f1_widgets.py --no-inline-lib   # Chart.js weiter vom CDN laden
+# =============================================================================
+
+SEASON = load_season()
+YEAR   = SEASON["year"]
+
+BUILD_DIR = output_path(SEASON, "public")
+
+# Gepinnte Chart.js-Version – einmal laden, dann aus dem Cache einbetten
+CHARTJS_URL   = "https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.min.js"
+CHARTJS_CACHE = "./widget_cache/chart.umd.min.js"
+
+# Platzhalter in den Quellen
+DATA_PLACEHOLDER = "/*@DATA@*/null"
+CHARTJS_TAG      = re.compile(r'<script src="https://cdn\.jsdelivr\.net/npm/chart\.js[^"]*"></script>')
+
+# Widget → Datenquelle (None: Daten stehen bereits in der Quelle, z.B. Countdown)
+WIDGETS = [
+    {"source": "f1_drivers_chart.html",      "data": "f1_drivers_chart.json",      "bounds": True},
+    {"source": "f1_constructors_chart.html", "data": "f1_constructors_chart.json", "bounds": True},
+    {"source": "f1_prediction_chart.html",   "data": "f1_prediction_chart.json"},
+    {"source": f"f1_countdown_{YEAR}.html",  "data": None},
+]
+
+
+# ─────────────────────────────────────────────
+# Daten
+# ─────────────────────────────────────────────
+
+def with_bounds(chart):
+    """Achsengrenzen einmal hier statt Math.min(...allPoints) im Browser."""
+    points = [p for s in chart["series"] for p in s["data"] if p is not None]
+    chart["bounds"] = {"min": min(points, default=0), "max": max(points, default=0)}
+    return chart
+
+
+def inline_json(data):
+    # "</" im JSON würde das <script>-Tag vorzeitig schließen
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+
+def load_chartjs():
+    """Chart.js aus dem Cache, sonst einmal vom CDN laden. None, wenn nicht erreichbar."""
+    if os.path.exists(CHARTJS_CACHE):
+        with open(CHARTJS_CACHE, encoding="utf-8") as f:
+            return f.read()
+    try:
+        r = requests.get(CHARTJS_URL, timeout=30)
+        r.raise_for_status()
+    except requests.RequestException as e:
+        log.warning(f"⚠️ Chart.js nicht ladbar ({e}) – Widgets nutzen weiter das CDN")
+        return None
+    os.makedirs(os.path.dirname(CHARTJS_CACHE), exist_ok=True)
+    with open(CHARTJS_CACHE, "w", encoding="utf-8") as f:
+        f.write(r.text)
+    return r.text
+
+
+# ─────────────────────────────────────────────
+# Minifizierung (konservativ: Zeilenumbrüche im JS bleiben wegen ASI erhalten)
+# ─────────────────────────────────────────────
+
+_BLOCK  = re.compile(r"(<(script|style)\b[^>]*>)(.*?)(</\2>)", re.DOTALL | re.IGNORECASE)
+_HTML_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_CSS_COMMENT  = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+
+def minify_css(css):
+    css = _CSS_COMMENT.sub("", css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_js(js):
+    """Einrückung, Leerzeilen und reine //-Kommentarzeilen entfernen."""
+    lines = (line.strip() for line in js.split("\n"))
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+def minify_html(html):
+    blocks = []
+
+    def stash(m):
+        inner = minify_css(m.group(3)) if m.group(2).lower() == "style" else minify_js(m.group(3))
+        blocks.append(m.group(1) + inner + m.group(4))
+        return f"\0{len(blocks) - 1}\0"
+
+    html = _BLOCK.sub(stash, html)
+    html = _HTML_COMMENT.sub("", html)
+    html = re.sub(r"(?<=[>\0])\s+(?=[<\0])", "", html)
+    html = re.sub(r"\s+", " ", html).strip()
+    return re.sub(r"\0(\d+)\0", lambda m: blocks[int(m.group(1))], html)
+
+
+# ─────────────────────────────────────────────
+# Build
+# ─────────────────────────────────────────────
+
+def render_widget(html, data=None, chartjs=None):
+    """Quelle → fertiges Widget: minifizieren, dann Daten und Chart.js einsetzen."""
+    html = minify_html(html)
+    if data is not None:
+        if DATA_PLACEHOLDER not in html:
+            raise ValueError("Daten-Platzhalter /*@DATA@*/ nicht gefunden")
+        html = html.replace(DATA_PLACEHOLDER, inline_json(data), 1)
+    if chartjs:
+        lib  = chartjs.replace("</script", "<\\/script")
+        html = CHARTJS_TAG.sub(lambda m: f"<script>{lib}</script>", html, count=1)
+    return html
+
+
+def write_compressed(path, content):
+    """
+    Schreibt path, path.gz und (mit brotli) path.br – nur bei geändertem Inhalt.
+    Rückgabe: (geändert, Größen in Bytes)
+    """
+    raw = content.encode("utf-8")
+    # Komprimate hängen nur vom Inhalt ab – unverändert → nichts neu komprimieren
+    siblings = [".gz", ".br"] if brotli else [".gz"]
+    if not write_artifact(path, raw) and all(os.path.exists(path + ext) for ext in siblings):
+        return False, {"raw": len(raw)}
+    sizes = {"raw": len(raw)}
+
+    # mtime=0 → identische Eingabe ergibt identische .gz (keine Git-Diffs)
+    gz = gzip.compress(raw, compresslevel=9, mtime=0)
+    write_artifact(path + ".gz", gz)
+    sizes["gz"] = len(gz)
+
+    if brotli:
+        br = brotli.compress(raw, quality=11, mode=brotli.MODE_TEXT)
+        write_artifact(path + ".br", br)
+        sizes["br"] = len(br)
+    return True, sizes
+
+
+def build_widget(widget, chartjs=None):
+    source = widget["source"]
+    if not os.path.exists(source):
+        log.warning(f"⚠️ {source} fehlt – übersprungen")
+        return False
+
+    data = None
+    if widget.get("data"):
+        data_path = output_path(SEASON, widget["data"])
+        if not os.path.exists(data_path):
+            log.warning(f"⚠️ {data_path} fehlt – {source} übersprungen")
+            return False
+        with open(data_path, encoding="utf-8") as f:
+            data = json.load(f)
+        if widget.get("bounds"):
+            data = with_bounds(data)
+
+    with open(source, encoding="utf-8") as f:
+        html = render_widget(f.read(), data, chartjs)
+
+    target = os.path.join(BUILD_DIR, os.path.basename(source))
+    changed, sizes = write_compressed(target, html)
+    log.info(f"   ✔ {target} {status_label(changed)}: {sizes['raw']:,} B"
+             + "".join(f" | {ext} {n:,} B" for ext, n in sizes.items() if ext != "raw"))
+    return True
+
+
+def main(argv):
+    log.setup(argv)
+    log.info(f"🏗️  Baue Widgets {YEAR} → {BUILD_DIR}")
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    if not brotli:
+        log.warning("⚠️ brotli nicht installiert – nur .gz")
+
+    chartjs = None if "--no-inline-lib" in argv else load_chartjs()
+    built   = [build_widget(w, chartjs) for w in WIDGETS]
+    log.info(f"✅ {sum(built)}/{len(WIDGETS)} Widgets gebaut")
+    return all(built)
+
+
+if __name__ == "__main__":
+    if not main(sys.argv[1:]):
+        exit(1)
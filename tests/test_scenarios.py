@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import f1_scenarios  # noqa: E402
+from f1_standings import FRAME_COLUMNS  # noqa: E402
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=FRAME_COLUMNS)
+
+
+def test_sprint_only_weekend_keeps_its_grand_prix_open():
+    calendar = f1_scenarios.SEASON["calendar"]
+    num_cols = len(calendar)
+    sprint_col = next(col for col, e in enumerate(calendar) if col > 0 and e.get("sprint"))
+    total_sprints = sum(1 for e in calendar if e.get("sprint"))
+
+    # Erstes Rennen gewertet, am Sprint-Wochenende bisher nur der Sprint
+    frame = _frame([
+        (0, 0, 0, 25, 1, False),
+        (sprint_col, 0, 0, 8, 1, True),
+    ])
+    races, sprints = f1_scenarios.remaining_sessions(frame, num_cols)
+
+    assert races == num_cols - 1
+    assert sprints == total_sprints - 1
+
+
+def test_empty_frame_leaves_everything_open():
+    calendar = f1_scenarios.SEASON["calendar"]
+    races, sprints = f1_scenarios.remaining_sessions(_frame([]), len(calendar))
+
+    assert races == len(calendar)
+    assert sprints == sum(1 for e in calendar if e.get("sprint"))